@@ -0,0 +1,116 @@
+"""Parse-cost benchmark for the HTML parsing layer.
+
+Runs each saved fixture page through every available tree builder, with and
+without the partial-parsing strainer the scraper uses, and reports median parse
+time, peak traced memory and how many target elements were found (the counts
+must agree across parsers, otherwise a strainer is dropping data).
+
+    cd backend && python -m benchmarks.bench_parsers [--runs 20] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from bs4 import SoupStrainer
+
+from scrapers.internshala import _DETAIL_ONLY, _LISTING_ONLY
+from scrapers.linkedin import _CARDS_ONLY
+from routes.gov_feeds import _META_ONLY
+from utils.html_parsing import _available, make_soup, tags_strainer
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# (fixture, strainer the scraper uses, how to count what the scraper extracts)
+CASES: List[Dict[str, Any]] = [
+    {"name": "internshala_listing", "file": "internshala_listing.html", "only": _LISTING_ONLY,
+     "count": lambda s: len(s.select("div[class*='individual_internship']"))},
+    {"name": "internshala_detail", "file": "internshala_detail.html", "only": _DETAIL_ONLY,
+     "count": lambda s: len(s.select("div.internship_details div.text-container, div.skills span, div.posted_by_container span"))},
+    {"name": "linkedin_search", "file": "linkedin_search.html", "only": _CARDS_ONLY,
+     "count": lambda s: len(s.select("div.base-card"))},
+    {"name": "bing_people", "file": "bing_people.html", "only": tags_strainer(["a"]),
+     "count": lambda s: sum(1 for a in s.select("a") if "linkedin.com/in/" in (a.get("href") or ""))},
+    {"name": "gov_page_meta", "file": "gov_portal.html", "only": _META_ONLY,
+     "count": lambda s: int(bool(s.title)) + len(s.find_all("meta", attrs={"name": "description"}))},
+    {"name": "workday_board", "file": "workday_board.html", "only": None,
+     "count": lambda s: len(s.select("a[href*='/job/']"))},
+]
+
+PARSERS = ["html.parser", "lxml", "html5lib"]
+
+
+def _measure(markup: bytes, parser: str, only: Optional[SoupStrainer], count: Callable, runs: int) -> Dict[str, Any]:
+    times = []
+    found = 0
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        soup = make_soup(markup, only, parser=parser)
+        found = count(soup)
+        times.append(time.perf_counter() - t0)
+        soup.decompose()
+    tracemalloc.start()
+    soup = make_soup(markup, only, parser=parser)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del soup
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 2),
+        "p90_ms": round(sorted(times)[int(0.9 * (len(times) - 1))] * 1000, 2),
+        "peak_kb": round(peak / 1024, 1),
+        "found": found,
+    }
+
+
+def run(runs: int = 20) -> List[Dict[str, Any]]:
+    rows = []
+    parsers = [p for p in PARSERS if _available(p)]
+    for case in CASES:
+        with open(os.path.join(FIXTURES, case["file"]), "rb") as f:
+            markup = f.read()
+        for parser in parsers:
+            modes = [("full", None)]
+            # html5lib ignores parse_only
+            if case["only"] is not None and parser != "html5lib":
+                modes.append(("strained", case["only"]))
+            for mode, only in modes:
+                r = _measure(markup, parser, only, case["count"], runs)
+                rows.append({"case": case["name"], "kb": len(markup) // 1024, "parser": parser, "mode": mode, **r})
+    return rows
+
+
+def _print_table(rows: List[Dict[str, Any]]) -> None:
+    hdr = f"{'case':<22}{'KB':>5}  {'parser':<12}{'mode':<10}{'median ms':>10}{'p90 ms':>9}{'peak KB':>10}{'found':>7}"
+    print(hdr)
+    print("-" * len(hdr))
+    baseline: Dict[str, float] = {}
+    for r in rows:
+        key = r["case"]
+        if r["parser"] == "html.parser" and r["mode"] == "full":
+            baseline[key] = r["median_ms"]
+        speedup = baseline.get(key, 0) / r["median_ms"] if r["median_ms"] else 0
+        print(
+            f"{r['case']:<22}{r['kb']:>5}  {r['parser']:<12}{r['mode']:<10}{r['median_ms']:>10}{r['p90_ms']:>9}"
+            f"{r['peak_kb']:>10}{r['found']:>7}   x{speedup:.1f}"
+        )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--json", action="store_true", help="emit raw rows as JSON")
+    args = ap.parse_args()
+    rows = run(args.runs)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        _print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Offline load benchmark for the /api/search pipeline.
+
+Starts the fixture replay server, routes every outbound scrape to it through
+the http_client URL rewriter, and drives main.search_internships from a thread
+pool at the requested concurrency. Reports end-to-end p50/p95/p99 latency,
+throughput, per-stage timings (query building, scrape dispatch, waiting on
+scrapers, ranking) and per-source scrape latency. Use --max-p95-ms as a
+regression gate: the exit status is 1 when p95 exceeds it.
+
+    cd backend && python -m benchmarks.bench_search --requests 60 --concurrency 8 --latency-ms 80
+
+The result cache is disabled unless --warm-cache is given, so every request
+pays for its scrapes; identical concurrent queries still share one flight.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.replay_server import ReplayServer
+
+DEFAULT_QUERIES = [
+    "python developer",
+    "web development",
+    "data science",
+    "machine learning",
+    "frontend react",
+    "backend java",
+]
+
+# ATS boards replayed from fixtures; replaces the curated careers list for the run
+BENCH_CAREERS = [
+    {"company": "Acme (Lever)", "url": "https://jobs.lever.co/acme", "roles": ["software"], "skills": [], "regions": ["global"]},
+    {"company": "Acme (Greenhouse)", "url": "https://boards.greenhouse.io/acme", "roles": ["software"], "skills": [], "regions": ["global"]},
+    {"company": "Acme (SmartRecruiters)", "url": "https://careers.smartrecruiters.com/Acme", "roles": ["data"], "skills": [], "regions": ["global"]},
+    {"company": "Acme (Workday)", "url": "https://acme.wd1.myworkdayjobs.com/en-US/External/", "roles": ["software"], "skills": [], "regions": ["global"]},
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0..100) of values; 0.0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _summary(values_s: List[float]) -> Dict[str, float]:
+    ms = [v * 1000 for v in values_s]
+    return {
+        "n": len(ms),
+        "p50_ms": round(percentile(ms, 50), 1),
+        "p95_ms": round(percentile(ms, 95), 1),
+        "p99_ms": round(percentile(ms, 99), 1),
+        "max_ms": round(max(ms), 1) if ms else 0.0,
+    }
+
+
+class StageTimer:
+    """Wraps pipeline functions in main to time each stage of every request."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.scrapes: Dict[str, List[float]] = defaultdict(list)
+
+    def begin(self) -> None:
+        self._local.stages = defaultdict(float)
+
+    def end(self) -> Dict[str, float]:
+        return dict(getattr(self._local, "stages", {}))
+
+    def sync(self, stage: str, fn: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stages = getattr(self._local, "stages", None)
+                if stages is not None:
+                    stages[stage] += time.perf_counter() - t0
+        return timed
+
+    def scraper(self, source: str, fn: Callable) -> Callable:
+        # Scraper coroutines run on the engine loop, so record them globally
+        async def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.scrapes[source].append(time.perf_counter() - t0)
+        return timed
+
+
+_PATCHED = (
+    "_CURATED_CAREERS_META", "_CURATED_CAREERS", "_search_context", "_build_search_queries",
+    "_start_scrapes", "_rank_jobs", "fetch_internships_async", "scrape_company_careers_async",
+    "_maybe_import_linkedin_async",
+)
+
+
+def _install(main: Any, timer: StageTimer) -> Callable[[], None]:
+    """Point main at the benchmark boards and timed stages; returns an undo callable."""
+    saved = {name: getattr(main, name) for name in _PATCHED}
+    main._CURATED_CAREERS_META = BENCH_CAREERS
+    main._CURATED_CAREERS = [c["url"] for c in BENCH_CAREERS]
+    main._search_context = timer.sync("context", main._search_context)
+    main._build_search_queries = timer.sync("queries", main._build_search_queries)
+    main._start_scrapes = timer.sync("dispatch", main._start_scrapes)
+    main._rank_jobs = timer.sync("rank", main._rank_jobs)
+    main.fetch_internships_async = timer.scraper("internshala", main.fetch_internships_async)
+    main.scrape_company_careers_async = timer.scraper("company", main.scrape_company_careers_async)
+    linkedin = main._maybe_import_linkedin_async
+    main._maybe_import_linkedin_async = lambda: timer.scraper("linkedin", linkedin())
+
+    def undo() -> None:
+        for name, value in saved.items():
+            setattr(main, name, value)
+
+    return undo
+
+
+def run(
+    requests: int = 30,
+    concurrency: int = 4,
+    queries: Optional[List[str]] = None,
+    latency_ms: float = 50.0,
+    jitter_ms: float = 20.0,
+    warmup: int = 2,
+    warm_cache: bool = False,
+) -> Dict[str, Any]:
+    # Defaults for the run (None = unset); the caller's environment is restored afterwards
+    env: Dict[str, Optional[str]] = {
+        "RESULT_CACHE_PATH": "off",
+        "ALLOW_SAMPLE_FALLBACK": "0",
+        "SEARCH_SWR": "0",
+        "OFFLINE_MODE": None,
+    }
+    if not warm_cache:
+        env["RESULT_CACHE_DISABLE"] = "1"
+    saved = {name: os.environ.get(name) for name in env}
+    for name, value in env.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ.setdefault(name, value)
+    try:
+        return _run(requests, concurrency, queries, latency_ms, jitter_ms, warmup, warm_cache)
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _run(
+    requests: int,
+    concurrency: int,
+    queries: Optional[List[str]],
+    latency_ms: float,
+    jitter_ms: float,
+    warmup: int,
+    warm_cache: bool,
+) -> Dict[str, Any]:
+    from starlette.requests import Request
+    from fastapi import Response
+
+    import main
+    from scrapers.engine import get_engine
+    from utils import http_client
+
+    queries = queries or DEFAULT_QUERIES
+    timer = StageTimer()
+
+    def one(i: int) -> Dict[str, Any]:
+        req = main.SearchRequest(query=queries[i % len(queries)])
+        request = Request({"type": "http", "method": "POST", "path": "/api/search", "headers": [], "query_string": b""})
+        timer.begin()
+        t0 = time.perf_counter()
+        jobs = main.search_internships(req, request, Response(), swr=False)
+        total = time.perf_counter() - t0
+        stages = timer.end()
+        stages["wait"] = max(0.0, total - sum(stages.values()))
+        return {"total": total, "stages": stages, "results": len(jobs), "sources": sorted({j.source for j in jobs})}
+
+    with ReplayServer(latency_ms=latency_ms, jitter_ms=jitter_ms) as server:
+        prev = http_client.set_url_rewriter(http_client.replay_rewriter(server.base_url))
+        undo = _install(main, timer)
+        try:
+            for i in range(warmup):
+                one(i)
+            timer.scrapes.clear()
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                rows = list(pool.map(one, range(requests)))
+            wall = time.perf_counter() - t0
+        finally:
+            undo()
+            http_client.set_url_rewriter(prev)
+        hits = dict(server.hits)
+
+    stage_names = sorted({s for r in rows for s in r["stages"]})
+    return {
+        "config": {
+            "requests": requests,
+            "concurrency": concurrency,
+            "latency_ms": latency_ms,
+            "jitter_ms": jitter_ms,
+            "warm_cache": warm_cache,
+            "time_budget_s": float(os.getenv("SEARCH_TIME_BUDGET", "14.0")),
+        },
+        "latency": _summary([r["total"] for r in rows]),
+        "throughput_rps": round(len(rows) / wall, 2) if wall else 0.0,
+        "stages": {s: _summary([r["stages"].get(s, 0.0) for r in rows]) for s in stage_names},
+        "scrapes": {src: _summary(v) for src, v in sorted(timer.scrapes.items())},
+        "results": {
+            "min": min(r["results"] for r in rows),
+            "max": max(r["results"] for r in rows),
+            "sources": sorted({s for r in rows for s in r["sources"]}),
+        },
+        "replay_hits": hits,
+        "engine": get_engine().stats(),
+    }
+
+
+def _print_report(rep: Dict[str, Any]) -> None:
+    cfg = rep["config"]
+    print(
+        f"requests={cfg['requests']} concurrency={cfg['concurrency']} latency={cfg['latency_ms']}±{cfg['jitter_ms']}ms "
+        f"warm_cache={cfg['warm_cache']}"
+    )
+    lat = rep["latency"]
+    print(
+        f"latency  p50={lat['p50_ms']}ms p95={lat['p95_ms']}ms p99={lat['p99_ms']}ms max={lat['max_ms']}ms  "
+        f"throughput={rep['throughput_rps']} req/s"
+    )
+    print(f"{'stage':<22}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'n':>6}")
+    for name, s in rep["stages"].items():
+        print(f"{name:<22}{s['p50_ms']:>9}{s['p95_ms']:>9}{s['p99_ms']:>9}{s['n']:>6}")
+    for name, s in rep["scrapes"].items():
+        print(f"{'scrape.' + name:<22}{s['p50_ms']:>9}{s['p95_ms']:>9}{s['p99_ms']:>9}{s['n']:>6}")
+    res = rep["results"]
+    print(f"results per request: {res['min']}..{res['max']} from {', '.join(res['sources']) or 'none'}")
+    print("replayed:", ", ".join(f"{k}={v}" for k, v in sorted(rep["replay_hits"].items())))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Offline /api/search load benchmark")
+    ap.add_argument("--requests", type=int, default=30)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--queries", help="comma-separated queries (rotated across requests)")
+    ap.add_argument("--latency-ms", type=float, default=50.0, help="simulated per-response latency")
+    ap.add_argument("--jitter-ms", type=float, default=20.0)
+    ap.add_argument("--warmup", type=int, default=2)
+    ap.add_argument("--warm-cache", action="store_true", help="keep the result cache on (memory-only)")
+    ap.add_argument("--max-p95-ms", type=float, help="exit 1 if end-to-end p95 exceeds this")
+    ap.add_argument("--json", action="store_true", help="emit the report as JSON")
+    args = ap.parse_args()
+
+    queries = [q.strip() for q in args.queries.split(",") if q.strip()] if args.queries else None
+    rep = run(args.requests, args.concurrency, queries, args.latency_ms, args.jitter_ms, args.warmup, args.warm_cache)
+    if args.json:
+        print(json.dumps(rep, indent=2))
+    else:
+        _print_report(rep)
+    if args.max_p95_ms is not None and rep["latency"]["p95_ms"] > args.max_p95_ms:
+        print(f"FAIL: p95 {rep['latency']['p95_ms']}ms > {args.max_p95_ms}ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
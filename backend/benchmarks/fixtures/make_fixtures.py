@@ -0,0 +1,218 @@
+"""Regenerate the saved HTML/JSON fixtures used by the benchmarks.
+
+The pages mirror the markup the scrapers select on (card containers, detail
+blocks, ATS JSON shapes) wrapped in the navigation, filter sidebars, inline
+scripts and footers real pages carry, so parse costs are representative.
+Output is deterministic; run from backend/:
+
+    python -m benchmarks.fixtures.make_fixtures
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+TITLES = [
+    "Python Developer", "Web Development", "Data Science", "Machine Learning", "Frontend Developer",
+    "Backend Developer", "Full Stack Development", "Android App Development", "UI/UX Design",
+    "Software Testing", "Cloud Engineering", "DevOps", "Business Development", "Content Writing",
+]
+COMPANIES = ["Acme Labs", "Bluefin Tech", "Cobalt AI", "Delta Systems", "Epsilon Soft", "Fintra", "Gridline", "Hexa Cloud"]
+CITIES = ["Bangalore", "Mumbai", "Delhi", "Pune", "Hyderabad", "Chennai", "Jaipur", "Work From Home"]
+SKILLS = ["Python", "Java", "JavaScript", "React", "Node.js", "SQL", "Docker", "AWS", "HTML", "CSS", "Git", "Linux"]
+LOREM = (
+    "You will work with our engineering team on production features, write clean and tested code, "
+    "review pull requests, and collaborate with designers and product managers. "
+)
+
+
+def _noise(rng: random.Random, links: int = 180, scripts: int = 6) -> tuple[str, str]:
+    nav = "".join(
+        f'<li class="nav-item"><a class="nav-link" href="/internships/{rng.choice(TITLES).lower().replace(" ", "-")}-internship-{i}">'
+        f"{rng.choice(TITLES)} Internship</a></li>"
+        for i in range(links)
+    )
+    script = "".join(
+        "<script>window.__STATE__ = " + json.dumps({"k": [rng.random() for _ in range(120)]}) + ";</script>"
+        for _ in range(scripts)
+    )
+    filters = "".join(
+        f'<label class="checkbox"><input type="checkbox" name="category" value="{t}"/> {t}</label>'
+        for t in TITLES * 4
+    ) + "<select name='city'>" + "".join(f"<option>{c}</option>" for c in CITIES * 20) + "</select>"
+    head = (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Internships</title>"
+        "<meta name='description' content='Find internships'>" + script + "</head><body>"
+        f"<header><nav><ul class='navbar'>{nav}</ul></nav></header>"
+        f"<aside id='filters' class='filters'>{filters}</aside><main id='content'>"
+    )
+    foot = (
+        "</main><footer>" + "".join(f"<p class='footer-link'><a href='/p/{i}'>Footer link {i}</a></p>" for i in range(links // 2))
+        + "</footer>" + script + "</body></html>"
+    )
+    return head, foot
+
+
+def internshala_listing(rng: random.Random, n: int = 40) -> str:
+    head, foot = _noise(rng)
+    cards = []
+    for i in range(n):
+        title = f"{rng.choice(TITLES)} Internship"
+        tags = "".join(f"<span>{rng.choice(['Part time', 'Job offer', 'Remote', 'Hybrid'])}</span>" for _ in range(2))
+        cards.append(
+            f'<div class="container-fluid individual_internship visibilityTrackerItem" internshipid="{1000 + i}">'
+            f'<div class="internship_meta"><h3 class="job-internship-name">'
+            f'<a class="job-title-href" href="/internship/detail/{title.lower().replace(" ", "-").replace("/", "-")}-{1000 + i}">{title}</a></h3>'
+            f'<div class="company_name"><a href="/company/{i}">{rng.choice(COMPANIES)}</a></div>'
+            f'<div class="locations"><span><a href="/internships/in-{i}">{rng.choice(CITIES)}</a></span></div>'
+            f'<div class="row-1-item"><span class="stipend">₹ {rng.randint(5, 40)},000 /month</span></div>'
+            f'<div class="other_detail_item_row">software developer role using {", ".join(rng.sample(SKILLS, 3))}. {LOREM}</div></div>'
+            f'<div class="tag_container"><div class="round_tabs">{tags}</div></div>'
+            "</div>"
+        )
+    return head + "<div id='internship_list_container'>" + "".join(cards) + "</div>" + foot
+
+
+def internshala_detail(rng: random.Random) -> str:
+    head, foot = _noise(rng, links=120, scripts=4)
+    skills = "".join(f"<span class='round_tabs'>{s}</span>" for s in rng.sample(SKILLS, 5))
+    return head + (
+        "<div class='detail_view'><div class='internship_details'>"
+        f"<h2>About the internship</h2><div class='text-container'>{LOREM * 8}</div></div>"
+        f"<div class='skills'><h3>Skill(s) required</h3>{skills}</div>"
+        "<div class='posted_by_container'><span>Posted 2 days ago</span></div>"
+        f"<div class='about_company'>{LOREM * 3}</div></div>"
+    ) + foot
+
+
+def linkedin_search(rng: random.Random, n: int = 25) -> str:
+    head, foot = _noise(rng, links=150)
+    cards = []
+    for i in range(n):
+        cards.append(
+            "<li><div class='base-card relative w-full base-search-card base-search-card--link job-search-card'>"
+            f"<a class='base-card__full-link' href='https://in.linkedin.com/jobs/view/software-intern-{3000 + i}'></a>"
+            "<div class='base-search-card__info'>"
+            f"<h3 class='base-search-card__title'>{rng.choice(TITLES)} Intern</h3>"
+            f"<h4 class='base-search-card__subtitle'><a href='#'>{rng.choice(COMPANIES)}</a></h4>"
+            "<div class='base-search-card__metadata'>"
+            f"<span class='job-search-card__location'>{rng.choice(CITIES)}, India</span>"
+            f"<span class='result-benefits__text'>{rng.choice(['Easy Apply', 'Actively Hiring', 'Promoted'])}</span>"
+            "<time class='job-search-card__listdate'>1 week ago</time></div></div></div></li>"
+        )
+    return head + "<ul class='jobs-search__results-list'>" + "".join(cards) + "</ul>" + foot
+
+
+def bing_people(rng: random.Random, n: int = 10) -> str:
+    head, foot = _noise(rng, links=80, scripts=3)
+    items = "".join(
+        f"<li class='b_algo'><h2><a href='https://in.linkedin.com/in/recruiter-{i}'>Recruiter {i} - {rng.choice(COMPANIES)} | LinkedIn</a></h2>"
+        f"<p>{LOREM}</p></li>"
+        for i in range(n)
+    )
+    return head + f"<ol id='b_results'>{items}</ol>" + foot
+
+
+def gov_portal(rng: random.Random) -> str:
+    head, foot = _noise(rng, links=250, scripts=8)
+    head = head.replace("<title>Internships</title>", "<title>AICTE Internship Portal</title>")
+    head = head.replace("content='Find internships'", "content='Government-backed internships for students across India.'")
+    body = "".join(f"<section class='notice'><h4>Notice {i}</h4><p>{LOREM}</p></section>" for i in range(60))
+    return head + body + foot
+
+
+def ats_board(rng: random.Random, host: str, n: int = 30) -> str:
+    head, foot = _noise(rng, links=100, scripts=3)
+    rows = "".join(
+        f"<div class='posting'><a class='posting-title' href='https://{host}/job/{i}'>{rng.choice(TITLES)} Intern</a>"
+        f"<div class='posting-categories'>Location: {rng.choice(CITIES)}</div><p>{LOREM}</p></div>"
+        for i in range(n)
+    )
+    return head + f"<section id='jobs'>{rows}</section>" + foot
+
+
+def _role(rng: random.Random, i: int) -> str:
+    # Most boards are mostly full-time roles; the scrapers keep only internships
+    kind = "Intern" if i % 3 else rng.choice(["Engineer", "Senior Engineer", "Manager"])
+    return f"{rng.choice(TITLES)} {kind}"
+
+
+def lever_postings(rng: random.Random, n: int = 60) -> list:
+    return [
+        {
+            "id": f"lv-{i}",
+            "text": _role(rng, i),
+            "hostedUrl": f"https://jobs.lever.co/acme/lv-{i}",
+            "categories": {"location": rng.choice(CITIES), "commitment": "Internship"},
+            "descriptionPlain": LOREM * 2,
+            "description": f"<div><p>{LOREM}</p><ul>" + "".join(f"<li>{s}</li>" for s in rng.sample(SKILLS, 4)) + "</ul></div>",
+        }
+        for i in range(n)
+    ]
+
+
+def greenhouse_jobs(rng: random.Random, n: int = 60) -> dict:
+    return {
+        "jobs": [
+            {
+                "id": 5000 + i,
+                "title": _role(rng, i),
+                "absolute_url": f"https://boards.greenhouse.io/acme/jobs/{5000 + i}",
+                "location": {"name": rng.choice(CITIES)},
+                "content": f"&lt;p&gt;{LOREM}&lt;/p&gt;",
+                "updated_at": "2024-05-01T10:00:00-04:00",
+            }
+            for i in range(n)
+        ],
+        "meta": {"total": n},
+    }
+
+
+def smartrecruiters_postings(rng: random.Random, n: int = 60) -> dict:
+    return {
+        "offset": 0,
+        "limit": n,
+        "totalFound": n,
+        "content": [
+            {
+                "id": f"sr-{i}",
+                "name": _role(rng, i),
+                "ref": f"https://api.smartrecruiters.com/v1/companies/Acme/postings/sr-{i}",
+                "location": {"city": rng.choice(CITIES), "country": "in"},
+                "releasedDate": "2024-05-01T10:00:00.000Z",
+            }
+            for i in range(n)
+        ],
+    }
+
+
+def main() -> None:
+    rng = random.Random(42)
+    pages = {
+        "internshala_listing.html": internshala_listing(rng),
+        "internshala_detail.html": internshala_detail(rng),
+        "linkedin_search.html": linkedin_search(rng),
+        "bing_people.html": bing_people(rng),
+        "gov_portal.html": gov_portal(rng),
+        "workday_board.html": ats_board(rng, "acme.wd1.myworkdayjobs.com"),
+    }
+    for name, html in pages.items():
+        with open(os.path.join(HERE, name), "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"wrote {name} ({len(html) // 1024} KB)")
+    docs = {
+        "lever_postings.json": lever_postings(rng),
+        "greenhouse_jobs.json": greenhouse_jobs(rng),
+        "smartrecruiters_postings.json": smartrecruiters_postings(rng),
+    }
+    for name, doc in docs.items():
+        with open(os.path.join(HERE, name), "w", encoding="utf-8") as f:
+            json.dump(doc, f)
+        print(f"wrote {name} ({os.path.getsize(os.path.join(HERE, name)) // 1024} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Local stand-in for the sites the scrapers hit, replaying saved fixtures.
+
+Requests arrive as /<original host>/<path> (see http_client.replay_rewriter)
+and are answered from benchmarks/fixtures by host and path pattern. Unknown
+hosts get a 404, like a careers page the scrapers cannot parse. An optional
+per-response latency (with jitter) stands in for real network round trips.
+
+Run standalone and point a dev server at it:
+
+    cd backend && python -m benchmarks.replay_server --port 8765 --latency-ms 80
+    SCRAPE_REPLAY_BASE=http://127.0.0.1:8765 python -m uvicorn main:app
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# (host suffix, path regex, fixture file); first match wins
+ROUTES: List[Tuple[str, str, str]] = [
+    ("internshala.com", r"^/internship/detail/", "internshala_detail.html"),
+    ("internshala.com", r"^/internships/", "internshala_listing.html"),
+    ("linkedin.com", r"^/jobs/", "linkedin_search.html"),
+    ("bing.com", r"^/search", "bing_people.html"),
+    ("api.lever.co", r"^/v0/postings/", "lever_postings.json"),
+    ("boards-api.greenhouse.io", r"^/v1/boards/[^/]+/jobs", "greenhouse_jobs.json"),
+    ("api.smartrecruiters.com", r"^/v1/companies/[^/]+/postings", "smartrecruiters_postings.json"),
+    ("myworkdayjobs.com", r"^/", "workday_board.html"),
+    ("gov.in", r"^/", "gov_portal.html"),
+]
+
+_CONTENT_TYPES = {".html": "text/html; charset=utf-8", ".json": "application/json"}
+
+
+def _load(name: str) -> bytes:
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+class ReplayServer:
+    """Threaded HTTP/1.1 server answering rewritten scrape URLs from fixtures."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0, jitter_ms: float = 0.0) -> None:
+        self.latency_s = latency_ms / 1000.0
+        self.jitter_s = jitter_ms / 1000.0
+        self.hits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._bodies = {name: _load(name) for _, _, name in ROUTES}
+        self._routes = [(host_sfx, re.compile(pat), name) for host_sfx, pat, name in ROUTES]
+        self._rng = random.Random(7)
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def match(self, host: str, path: str) -> Optional[str]:
+        for host_sfx, pat, name in self._routes:
+            if (host == host_sfx or host.endswith("." + host_sfx)) and pat.search(path):
+                return name
+        return None
+
+    def _delay(self) -> float:
+        if not self.jitter_s:
+            return self.latency_s
+        with self._lock:
+            return max(0.0, self.latency_s + self._rng.uniform(-self.jitter_s, self.jitter_s))
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                host, _, rest = self.path.lstrip("/").partition("/")
+                path = "/" + rest.split("?", 1)[0]
+                name = server.match(host.lower(), path)
+                with server._lock:
+                    server.hits[name or "404"] = server.hits.get(name or "404", 0) + 1
+                delay = server._delay()
+                if delay:
+                    time.sleep(delay)
+                if name is None:
+                    body, status, ctype = b"not found", 404, "text/plain"
+                else:
+                    body, status = server._bodies[name], 200
+                    ctype = _CONTENT_TYPES[os.path.splitext(name)[1]]
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", ctype)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except OSError:
+                    pass  # scraper gave up (time budget) mid-response
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Replay scraper fixtures on a local port")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    args = ap.parse_args()
+    srv = ReplayServer(args.host, args.port, args.latency_ms, args.jitter_ms)
+    print(f"replaying fixtures on {srv.base_url} (SCRAPE_REPLAY_BASE={srv.base_url})")
+    try:
+        srv._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,9 +9,11 @@ try:
     load_dotenv(env_path or None)
 except Exception:
     pass
-import io
 import csv
+import functools
 import re
+import hashlib
+import time
 # Optional PDF parsing dependency
 try:
     import fitz  # PyMuPDF
@@ -19,23 +21,29 @@ try:
 except Exception:
     fitz = None  # type: ignore
     _PDF_ENABLED = False
-import docx
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 from fastapi import FastAPI, File, UploadFile
 from fastapi import HTTPException
 from fastapi import Request
 from fastapi import Response
 from fastapi.middleware.cors import CORSMiddleware
-from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures import TimeoutError as FuturesTimeout
 from pydantic import BaseModel
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 
 # Safe import for scraper (never break app startup on EB)
 try:
-    from scrapers.internshala import fetch_internships  # type: ignore
+    from scrapers.internshala import fetch_internships, fetch_internships_async  # type: ignore
 except Exception:  # pragma: no cover - fallback path
     def fetch_internships(*args, **kwargs):  # type: ignore
         return []
+    async def fetch_internships_async(*args, **kwargs):  # type: ignore
+        return []
 # LinkedIn scraper (Selenium) is imported lazily only if enabled to avoid heavy startup + Chromium deps.
 def _maybe_import_linkedin():
     try:
@@ -44,11 +52,38 @@ def _maybe_import_linkedin():
     except Exception:
         return lambda *a, **k: []  # graceful no-op
 
+async def _linkedin_noop(*args, **kwargs):
+    return []
+
+def _maybe_import_linkedin_async():
+    try:
+        from scrapers.linkedin import fetch_linkedin_internships_async  # type: ignore
+        return fetch_linkedin_internships_async
+    except Exception:
+        return _linkedin_noop  # graceful no-op
+
 # Company careers scraper integration
 try:
-    from routes.company_scraper import scrape_company_careers  # type: ignore
+    from scrapers.company_pages import careers_request_host, scrape_company_careers_async  # type: ignore
 except Exception:
-    scrape_company_careers = None  # type: ignore
+    scrape_company_careers_async = None  # type: ignore
+
+# Shared scrape result cache (memory LRU + SQLite, shared across workers)
+from utils.result_cache import get_cache, make_key
+from utils.singleflight import SingleFlight, completed
+# Async scraping engine (one event loop + pooled HTTP client with per-host limits)
+from scrapers.engine import get_engine, with_request_hook
+from utils import http_client, metrics
+from utils.keyword_matcher import KeywordMatcher
+from utils.job_index import get_index, stipend_amount
+from utils.prewarm import HostBudget, Prewarmer, PrewarmTask, QueryPopularity, parse_seeds
+from utils.resume_cache import get_resume_cache, resume_hash
+from utils.resume_extract import document_kind, get_extractor as get_resume_extractor
+from utils.session_store import get_session_store
+from utils.ai_client import get_client as get_ai_client, prompt_key
+from utils.gemini_client import GeminiBusy, GeminiError, get_gemini_client
+from utils.llm_cache import get_llm_cache
+from utils.llm_stream import AiTextFormatter, format_ai_text, gemini_deltas, iter_sse_data
 
 # Small curated map of well-known companies -> careers roots (ATS-hosted where possible)
 _CURATED_CAREERS = [
@@ -159,7 +194,20 @@ DISABLE_LINKEDIN = os.getenv("DISABLE_LINKEDIN", "0") in {"1", "true", "yes", "o
 # -----------------------------
 # App Setup
 # -----------------------------
-app = FastAPI()
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    # Background workers defined further down; resolved at startup, not import
+    _start_prewarm()
+    _start_gov_refresh()
+    try:
+        yield
+    finally:
+        _PREWARMER.stop()
+        _stop_gov_refresh()
+        get_resume_extractor().shutdown()
+        get_gemini_client().close()
+
+app = FastAPI(lifespan=_lifespan)
 # Root welcome route so EB doesn't show default placeholder page
 @app.get("/")
 def root():
@@ -221,6 +269,7 @@ if _cors_env:
         allow_origins=allowed_origins,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Data-Age", "X-Data-Stale"],
         allow_credentials=False,
     )
 else:
@@ -230,9 +279,25 @@ else:
         allow_origins=["*"],
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Data-Age", "X-Data-Stale"],
         allow_credentials=False,
     )
 
+# Per-route latency histogram (only installed when METRICS_ENABLED=1)
+_HTTP_SECONDS = metrics.histogram("http_request_seconds", "HTTP request latency by route", ("method", "route", "status"))
+if metrics.enabled():
+    @app.middleware("http")
+    async def _time_requests(request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = getattr(request.scope.get("route"), "path", None) or "unmatched"
+            _HTTP_SECONDS.observe(time.perf_counter() - start, method=request.method, route=route, status=status)
+
 # Simple logging middleware (enabled when DEBUG_LOG=1)
 if os.getenv("DEBUG_LOG", "0") in {"1","true","yes"}:
     import time, logging
@@ -254,6 +319,13 @@ def health_check():
     """Fast health endpoint (no scraping, disk, or network) for EB / load balancers."""
     return {"status": "ok"}
 
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus scrape target; 404 unless METRICS_ENABLED=1."""
+    if not metrics.enabled():
+        raise HTTPException(status_code=404, detail="metrics disabled (set METRICS_ENABLED=1)")
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get("/version")
 def version_info():
     """Lightweight version & config surface for frontend debugging (no secrets)."""
@@ -273,7 +345,7 @@ def create_session(request: Request):
     """
     import uuid
     sid = uuid.uuid4().hex
-    _sessions.setdefault(sid, {"resume_text": "", "resume_profile": {"skills": set(), "roles": set(), "location": None}})
+    # Nothing is stored until a resume is uploaded: an empty session reads the same as an unknown one
     return {"session_id": sid}
 
 # Legacy globals (kept for backward-compat and local single-user dev)
@@ -281,8 +353,7 @@ resume_text = ""
 resume_profile = {"skills": set(), "roles": set(), "location": None}
 
 # Per-session store to prevent cross-user leakage. Keys are arbitrary session IDs provided by the client.
-# This avoids global sharing of resume context across users.
-_sessions: Dict[str, Dict] = {}
+# Bounded (LRU + TTL + memory budget) and optionally shared across workers; see utils/session_store.py.
 
 def _get_session_id(request: Request) -> Optional[str]:
     # Prefer explicit header; tolerate common variants
@@ -298,7 +369,7 @@ def _get_session_profile(session_id: Optional[str]):
     """
     if not session_id:
         return "", {"skills": set(), "roles": set(), "location": None}
-    entry = _sessions.get(session_id)
+    entry = get_session_store().get(session_id)
     if not entry:
         return "", {"skills": set(), "roles": set(), "location": None}
     return entry.get("resume_text", ""), entry.get("resume_profile", {"skills": set(), "roles": set(), "location": None})
@@ -330,25 +401,19 @@ if os.path.exists(csv_path):
 def _normalize(text: str) -> str:
     return re.sub(r"\s+", " ", (text or "").strip())
 
+# Vocabulary matchers are compiled once; each lookup is a single pass over the text
+_SKILL_MATCHER = KeywordMatcher(sorted(buzzword_skills))
+_ROLE_MATCHER = KeywordMatcher(sorted(buzzword_roles) + [
+    "software engineer", "backend", "frontend",
+    "full stack", "data analyst", "data scientist"
+])
+
 def _extract_keywords(text: str, max_terms=8):
-    found = []
-    text_l = text.lower()
-    for bw in buzzword_skills:
-        if bw in text_l and bw not in found:
-            found.append(bw)
-        if len(found) >= max_terms:
-            break
-    return found
+    """Buzzword skills found in text, in order of first mention."""
+    return _SKILL_MATCHER.find(text, limit=max_terms)
 
 def _extract_roles(text: str):
-    roles = []
-    for role in list(buzzword_roles) + [
-        "software engineer", "backend", "frontend",
-        "full stack", "data analyst", "data scientist"
-    ]:
-        if role in text.lower() and role not in roles:
-            roles.append(role)
-    return roles
+    return _ROLE_MATCHER.find(text)
 
 def _extract_location(text: str):
     match = re.search(r"(?:location|based in)\s*[:\-]?\s*([A-Za-z ,]+)", text, re.I)
@@ -376,6 +441,23 @@ def _extract_name(text: str) -> Optional[str]:
     m = re.search(r"name\s*[:\-]\s*([A-Za-z ]{3,})", (text or ""), re.I)
     return _normalize(m.group(1)) if m else None
 
+def _resume_profile(text: str, tech: List[str]) -> Dict:
+    """Parsed resume record (as cached by content hash); tech = whitelisted tokens from the extractor."""
+    extracted_skills = set(_extract_keywords(text, max_terms=32))
+    for t in tech:
+        if len(extracted_skills) >= 64:
+            break
+        extracted_skills.add(t)
+    return {
+        "text": text,
+        "skills": sorted(extracted_skills),
+        "roles": sorted(set(_extract_roles(text))),
+        "location": _extract_location(text),
+        "name": _extract_name(text),
+        "email": _extract_email(text),
+        "phone": _extract_phone(text),
+    }
+
 def _tag_new(posted: Optional[str]) -> bool:
     if not posted:
         return False
@@ -448,11 +530,50 @@ def _score_job(job: Dict, profile: Dict) -> float:
         base += 3
     return max(5.0, min(100.0, base))
 
+# Scraper coroutines run on the shared scrape engine; identical concurrent calls
+# are coalesced onto one flight so N simultaneous searches cost one outbound
+# request per variant, and abandoned flights are cancelled mid-request.
+_SCRAPE_FLIGHTS = SingleFlight(get_engine(), name="scrapes")
+
+_SEARCH_STAGE_SECONDS = metrics.histogram("search_stage_seconds", "Time spent in each /api/search stage", ("stage",))
+_SCRAPE_SECONDS = metrics.histogram("scrape_seconds", "Scraper flight duration by source and target", ("source", "target"))
+_AI_SECONDS = metrics.histogram("ai_response_seconds", "LLM call latency per model attempt (OpenRouter, then Gemini fallback)", ("model",))
+_RESUME_SECONDS = metrics.histogram("resume_upload_seconds", "Resume upload stages", ("stage", "kind"))
+
+def _scrape_target(source: str, args) -> str:
+    # Careers URLs are a bounded set; free-text queries would explode label cardinality
+    first = args[0] if args else ""
+    return first if isinstance(first, str) and first.startswith("http") else source
+
+async def _fetch_and_store(source: str, key: str, fn, *args):
+    with _SCRAPE_SECONDS.time(source=source, target=_scrape_target(source, args)):
+        items = await fn(*args)
+    # Empty results are not cached so a blocked/offline scrape is retried next time
+    if items:
+        get_cache().set(source, key, items)
+        get_index().add(items)
+    return items
+
+def _scrape_future(source: str, fn, *args) -> Future:
+    """Resolve a scraper coroutine via the result cache, else join/start its single flight.
+
+    Cache keys are the normalized call arguments. Results of a shared flight are
+    shared objects: copy before mutating.
+    """
+    key = make_key(*args)
+    hit = get_cache().get(source, key)
+    if hit is not None:
+        return completed(hit)
+    return _SCRAPE_FLIGHTS.submit((source, key), _fetch_and_store, source, key, fn, *args)
+
+def _dedupe_key(job: Dict) -> str:
+    return (job.get("apply_url") or "").split("?")[0].lower()
+
 def _dedupe(jobs: List[Dict]) -> List[Dict]:
     seen = set()
     out = []
     for job in jobs:
-        key = (job.get("apply_url") or "").split("?")[0].lower()
+        key = _dedupe_key(job)
         if key in seen:
             continue
         seen.add(key)
@@ -465,17 +586,21 @@ def _dedupe(jobs: List[Dict]) -> List[Dict]:
 import json, requests as _requests
 # Track last AI error (for diagnostics)
 _LAST_AI_ERROR: Optional[str] = None
-def _ai_enhanced_response(
+def _ai_prompt(
     user_message: str,
     resume_text: str,
     profile: Dict,
     preferred_model: Optional[str] = None,
     referer_override: Optional[str] = None,
     site_name_override: Optional[str] = None,
-) -> str:
+) -> Optional[Dict]:
+    """Everything one chat turn sends upstream (OpenRouter request, Gemini fallback prompt, cache key).
+
+    None when AI is not configured or the message is empty.
+    """
     key, models, base, site_url, site_name = _openrouter_config()
     if not key or not user_message.strip():
-        return ""
+        return None
     # If client provided a model, try it first
     if preferred_model:
         pm = preferred_model.strip()
@@ -534,77 +659,81 @@ def _ai_enhanced_response(
     mode_hint = "MODE: rating-only (just 'X/10')." if wants_rating_only else (
         "MODE: short." if short_hint else ("MODE: long/detail." if long_hint else "MODE: default."))
 
-    for model in models:
-        payload = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"{mode_hint}\nUser message: {user_message}\nProfile: {json.dumps(profile_snippet)}\nResume excerpt: {resume_excerpt}"},
-            ],
-            "temperature": temp,
-            "max_tokens": max_toks,
-        }
-        headers = {
+    user_content = f"{mode_hint}\nUser message: {user_message}\nProfile: {json.dumps(profile_snippet)}\nResume excerpt: {resume_excerpt}"
+    return {
+        "base": base,
+        "models": models,
+        "headers": {
             "Authorization": f"Bearer {key}",
             "Content-Type": "application/json",
             "Accept": "application/json",
             "HTTP-Referer": site_url,
             "X-Title": site_name,
-        }
-        try:
-            resp = _requests.post(base, json=payload, headers=headers, timeout=40)
-            resp.raise_for_status()
-            data = resp.json()
-            choices = data.get("choices") or []
-            if choices:
-                content = choices[0].get("message", {}).get("content")
-                if content:
-                    # Ensure line breaks and emojis are preserved
-                    content = re.sub(r'([\n\r]+)', '\n', content)
-                    content = re.sub(r'\n{2,}', '\n', content)
-                    # Add extra spacing after emoji sections
-                    content = re.sub(r'(\n[🎯🕳️🔧👍👎⭐💡])', '\n\1', content)
-                    return content.strip()
-        except Exception as e:
-            if os.getenv("AI_DEBUG", "0") in {"1","true","yes"}:
-                import traceback, logging
-                logging.basicConfig(level=logging.INFO)
-                logging.error(f"OpenRouter call failed for model {model}: %s", e)
-                logging.error("Trace: %s", traceback.format_exc())
-            # Save a compact error for diagnostics
-            try:
-                import requests as __r
-                if isinstance(e, __r.exceptions.HTTPError) and getattr(e, 'response', None) is not None:
-                    body = e.response.text[:500]
-                    status = e.response.status_code
-                    _set_last_ai_error(f"HTTP {status}: {body}")
-                else:
-                    _set_last_ai_error(str(e)[:300])
-            except Exception:
-                _set_last_ai_error(str(e)[:300])
-            continue
+        },
+        "payload": {
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_content},
+            ],
+            "temperature": temp,
+            "max_tokens": max_toks,
+        },
+        # Identical prompt (message, resume/profile context, mode, model list) -> cached answer
+        "cache_key": prompt_key(user_message.strip(), profile_snippet, resume_excerpt, mode_hint, temp, max_toks, models),
+        # Gemini fallback: same mode and context in one prompt
+        "gemini_payload": {
+            "contents": [
+                {"role": "user", "parts": [{"text": f"{system_prompt}\n\n{user_content}"}]}
+            ],
+            "generationConfig": {
+                "temperature": temp,
+                "maxOutputTokens": max_toks
+            }
+        },
+    }
+
+def _record_ai_error(model: str, e: BaseException) -> None:
+    if os.getenv("AI_DEBUG", "0") in {"1","true","yes"}:
+        import logging
+        logging.basicConfig(level=logging.INFO)
+        logging.error(f"OpenRouter call failed for model {model}: %s", e, exc_info=e)
+    # Save a compact error for diagnostics
+    response = getattr(e, "response", None)
+    if isinstance(e, _requests.exceptions.HTTPError) and response is not None:
+        _set_last_ai_error(f"HTTP {response.status_code}: {response.text[:500]}")
+    else:
+        _set_last_ai_error(str(e)[:300])
+
+def _ai_enhanced_response(
+    user_message: str,
+    resume_text: str,
+    profile: Dict,
+    preferred_model: Optional[str] = None,
+    referer_override: Optional[str] = None,
+    site_name_override: Optional[str] = None,
+    use_cache: bool = True,
+) -> str:
+    prompt = _ai_prompt(user_message, resume_text, profile, preferred_model, referer_override, site_name_override)
+    if prompt is None:
+        return ""
+    client = get_ai_client()
+    if use_cache:
+        hit = client.cache.get(prompt["cache_key"])
+        if hit is not None:
+            return hit[0]
+    # Pooled connections; the top models are hedged under one deadline (utils/ai_client.py)
+    answer = client.complete(prompt["base"], prompt["headers"], prompt["payload"], prompt["models"], timer=_AI_SECONDS, on_error=_record_ai_error)
+    if answer is not None:
+        content = format_ai_text(answer[0])
+        client.cache.put(prompt["cache_key"], content, answer[1])
+        return content
     # If OpenRouter failed across all models, try Gemini as a transparent fallback (when configured)
     try:
         if GOOGLE_API_KEY:
-            # Build a compact prompt reusing the same mode and context
-            combined = (
-                f"{system_prompt}\n\n{mode_hint}\n"
-                f"User message: {user_message}\n"
-                f"Profile: {json.dumps(profile_snippet)}\n"
-                f"Resume excerpt: {resume_excerpt}"
-            )
-            payload = {
-                "contents": [
-                    {"role": "user", "parts": [{"text": combined}]}
-                ],
-                "generationConfig": {
-                    "temperature": temp,
-                    "maxOutputTokens": max_toks
-                }
-            }
             # Use fast, low-cost model
             g_model = os.getenv("GEMINI_FALLBACK_MODEL", "gemini-2.5-flash")
-            g_resp = _gemini_generate_content(g_model, payload)
+            with _AI_SECONDS.time(model=g_model):
+                g_resp = _gemini_generate_content(g_model, prompt["gemini_payload"])
             # Extract text
             text = None
             try:
@@ -617,6 +746,7 @@ def _ai_enhanced_response(
             except Exception:
                 text = None
             if text:
+                client.cache.put(prompt["cache_key"], text, g_model)
                 return text
     except Exception as _e:
         # Preserve last OpenRouter error; don't overwrite with Gemini specifics
@@ -626,6 +756,63 @@ def _ai_enhanced_response(
             logging.error("Gemini fallback failed: %s", _e)
     return ""
 
+def _ai_stream_frames(prompt: Optional[Dict], use_cache: bool = True):
+    """Chat turn as frames: {"event": "delta", "text"} pieces, then {"event": "done", "response", "model", "cached"}.
+
+    Deltas are already Markdown-formatted; joined they equal "response", which
+    is what /api/chat would have returned for the same turn.
+    """
+    client = get_ai_client()
+    if prompt is None:
+        yield {"event": "done", "response": "", "model": None, "cached": False}
+        return
+    hit = client.cache.get(prompt["cache_key"]) if use_cache else None
+    if hit is not None:
+        yield {"event": "delta", "text": hit[0]}
+        yield {"event": "done", "response": hit[0], "model": hit[1], "cached": True}
+        return
+    fmt = AiTextFormatter()
+    parts: List[str] = []
+    model = None
+    deltas = client.stream(prompt["base"], prompt["headers"], prompt["payload"], prompt["models"], timer=_AI_SECONDS, on_error=_record_ai_error)
+    if GOOGLE_API_KEY:
+        deltas = _with_gemini_stream_fallback(deltas, prompt["gemini_payload"])
+    for model, delta in deltas:
+        text = fmt.feed(delta)
+        if text:
+            parts.append(text)
+            yield {"event": "delta", "text": text}
+    parts.append(fmt.flush())
+    content = "".join(parts)
+    if content:
+        client.cache.put(prompt["cache_key"], content, model)
+    yield {"event": "done", "response": content, "model": model, "cached": False}
+
+def _with_gemini_stream_fallback(deltas, payload: Dict):
+    """Pass OpenRouter deltas through; when no model answered at all, stream Gemini instead."""
+    answered = False
+    for item in deltas:
+        answered = True
+        yield item
+    if answered:
+        return
+    g_model = os.getenv("GEMINI_FALLBACK_MODEL", "gemini-2.5-flash")
+    try:
+        lines = get_gemini_client().open_stream_sync(g_model, payload, key=GOOGLE_API_KEY)
+    except Exception as e:
+        if os.getenv("AI_DEBUG", "0") in {"1","true","yes"}:
+            import logging
+            logging.basicConfig(level=logging.INFO)
+            logging.error("Gemini fallback failed: %s", e)
+        return
+    try:
+        for text in gemini_deltas(iter_sse_data(lines)):
+            yield g_model, text
+    except Exception:
+        return
+    finally:
+        lines.close()
+
 def _set_last_ai_error(msg: Optional[str]):
     global _LAST_AI_ERROR
     _LAST_AI_ERROR = (msg or "").strip() or None
@@ -637,24 +824,24 @@ def _gemini_generate_content(model: str, payload: Dict) -> Dict:
     """Server-side call to Google Generative Language API using GOOGLE_API_KEY.
 
     This avoids exposing the key to the browser and allows frontend fallback when Vite env is missing.
-    Returns raw JSON from Google API.
+    Returns raw JSON from Google API. Goes through the shared rate-limited client (utils/gemini_client.py);
+    blocks the calling thread, so async handlers should await _gemini_generate_content_async instead.
     """
-    key = GOOGLE_API_KEY
-    if not key:
+    if not GOOGLE_API_KEY:
         raise HTTPException(status_code=400, detail="GOOGLE_API_KEY not set on backend")
-    model = (model or "gemini-2.5-flash").strip()
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={key}"
     try:
-        resp = _requests.post(url, json=payload, timeout=40)
-        if resp.status_code == 429:
-            # Light backoff retry once for rate limits
-            import time
-            time.sleep(1.0)
-            resp = _requests.post(url, json=payload, timeout=40)
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"Gemini proxy failed: {e}")
+        return get_gemini_client().generate_sync(model, payload, key=GOOGLE_API_KEY)
+    except GeminiError as e:
+        raise HTTPException(status_code=503 if isinstance(e, GeminiBusy) else 502, detail=f"Gemini proxy failed: {e}")
+
+async def _gemini_generate_content_async(model: str, payload: Dict) -> Dict:
+    """_gemini_generate_content for async handlers: waits for a Gemini slot without holding a worker thread."""
+    if not GOOGLE_API_KEY:
+        raise HTTPException(status_code=400, detail="GOOGLE_API_KEY not set on backend")
+    try:
+        return await get_gemini_client().generate(model, payload, key=GOOGLE_API_KEY)
+    except GeminiError as e:
+        raise HTTPException(status_code=503 if isinstance(e, GeminiBusy) else 502, detail=f"Gemini proxy failed: {e}")
 
 @app.post("/api/gemini/generate")
 async def gemini_generate(request: Request):
@@ -675,9 +862,39 @@ async def gemini_generate(request: Request):
     # Forward entire body except 'model' (Google expects model in path)
     forward_payload = data.copy()
     forward_payload.pop("model", None)
-    result = _gemini_generate_content(model, forward_payload)
+    result = await _gemini_generate_content_async(model, forward_payload)
     return result
 
+async def _proxy_sse(lines):
+    """Re-emit upstream SSE lines as they arrive; pulled by the client, so reads follow its pace."""
+    async for line in lines:
+        yield line + "\n"
+
+@app.post("/api/gemini/generate/stream")
+async def gemini_generate_stream(request: Request):
+    """Streaming variant of /api/gemini/generate (same body).
+
+    Proxies Gemini's streamGenerateContent?alt=sse: one `data: {GenerateContentResponse}` event per chunk.
+    Upstream errors before the first byte are returned as HTTP errors, like the buffered proxy.
+    """
+    data = await request.json()
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    model = data.get("model") or "gemini-2.5-flash"
+    forward_payload = data.copy()
+    forward_payload.pop("model", None)
+    if not GOOGLE_API_KEY:
+        raise HTTPException(status_code=400, detail="GOOGLE_API_KEY not set on backend")
+    try:
+        upstream = await get_gemini_client().aopen_stream(model, forward_payload, key=GOOGLE_API_KEY)
+    except GeminiError as e:
+        raise HTTPException(status_code=503 if isinstance(e, GeminiBusy) else 502, detail=f"Gemini proxy failed: {e}")
+    return StreamingResponse(
+        _proxy_sse(upstream),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.get("/api/ai-test")
 def ai_test(request: Request, safe: bool = False):
     """Quick diagnostic to verify OpenRouter connectivity (no resume context).
@@ -696,7 +913,7 @@ def ai_test(request: Request, safe: bool = False):
             }
         if not key:
             return {"ok": False, "reason": "OPENROUTER_API_KEY not set in environment"}
-        sample = _ai_enhanced_response("Return one word: ping", "", {})
+        sample = _ai_enhanced_response("Return one word: ping", "", {}, use_cache=False)
         return {"ok": bool(sample), "sample": sample or None, "model": models[:1], "last_error": _LAST_AI_ERROR}
     except Exception as e:
         return {"ok": False, "error": str(e)[:300], "last_error": _LAST_AI_ERROR}
@@ -706,6 +923,7 @@ def ai_test(request: Request, safe: bool = False):
 # -----------------------------
 class Filters(BaseModel):
     location: Optional[str] = None
+    min_stipend: Optional[int] = None  # monthly amount; drops unpaid/unknown stipends
 
 class SearchRequest(BaseModel):
     query: str = ""
@@ -781,6 +999,19 @@ def diagnostics():
         "user_log_events": len(_user_events),
         "sample_scrape_jobs": len(sample_jobs),
         "sample_scrape_titles": [j.get("title") for j in sample_jobs],
+        "result_cache": get_cache().stats(),
+        "scrape_flights": _SCRAPE_FLIGHTS.stats(),
+        "scrape_engine": get_engine().stats(),
+        "http": http_client.stats(),
+        "search_refresh_flights": _SWR_FLIGHTS.stats(),
+        "job_index": get_index().stats(),
+        "prewarm": _PREWARMER.stats(),
+        "resume_extract": get_resume_extractor().stats(),
+        "resume_cache": get_resume_cache().stats(),
+        "sessions": get_session_store().stats(),
+        "ai_client": get_ai_client().stats(),
+        "gemini_client": get_gemini_client().stats(),
+        "llm_cache": get_llm_cache().stats(),
         "fallback_hint": "If sample_scrape_jobs is 0 repeatedly, scraping may be blocked/network-offline.",
         "ai_hint": "Chat will augment replies only when openrouter_configured is true.",
     }
@@ -788,76 +1019,184 @@ def diagnostics():
 # -----------------------------
 # Search Endpoint
 # -----------------------------
-@app.post("/api/search", response_model=List[Internship])
-def search_internships(req: SearchRequest, request: Request):
-    global resume_text, resume_profile
+def _offline_mode() -> bool:
+    return os.getenv("OFFLINE_MODE", "0").lower() in {"1", "true", "yes", "on"}
+
+def _search_context(req: SearchRequest, request: Request) -> Tuple[str, str, Dict]:
+    """Resolve (query, location, profile) for a search from the body and the caller's session."""
     sid = _get_session_id(request)
     sess_text, sess_profile = _get_session_profile(sid)
-    active_text = sess_text or ("" if sid else resume_text)
     active_profile = sess_profile if sess_text or sid else resume_profile
-    # Offline mode short-circuit: return sample data without any network calls
-    if os.getenv("OFFLINE_MODE", "0").lower() in {"1", "true", "yes", "on"}:
-        user_q = (req.query or "").strip()
-        location = (req.filters.location if req.filters else None) or resume_profile.get("location") or "India"  # type: ignore
-        # Build a few representative queries for sample listings
-        queries = []
-        if user_q:
-            queries.append(user_q)
-        if resume_profile.get("roles"):
-            for role in list(resume_profile["roles"])[:2]:
-                queries.append(f"{role} internship")
-        if resume_profile.get("skills"):
-            queries.append(" ".join(list(resume_profile["skills"])[:3]) + " internship")
-        if not queries:
-            queries = ["software internship", "backend internship", "frontend internship"]
-
-        sample = []
-        for i, term in enumerate(queries[:3]):
-            sample.append({
-                "source": "sample",
-                "title": f"{term.title()} (Offline Sample)",
-                "company": "CompanyX",
-                "location": location,
-                "stipend": None,
-                "apply_url": f"https://example.com/apply/{i}",
-                "description": f"Offline mode enabled. Placeholder listing for '{term}'.",
-                "tags": ["sample", "offline-mode"],
-                "posted": "today",
-            })
-        # Score and return as Internship models
-        out_jobs = []
-        for job in sample:
-            s = _score_job(job, resume_profile)
-            job["score"] = s
-            job["is_new"] = _tag_new(job.get("posted"))
-            out_jobs.append(job)
-        return [
-            Internship(
-                source=j.get("source", ""),
-                title=j.get("title", ""),
-                company=j.get("company", ""),
-                location=j.get("location", ""),
-                stipend=j.get("stipend"),
-                apply_url=j.get("apply_url"),
-                description=j.get("description"),
-                tags=j.get("tags", []),
-                score=j.get("score"),
-                is_new=j.get("is_new"),
-            )
-            for j in out_jobs
-        ]
-    # Backward compatibility: allow legacy body with top-level 'location' key
-    body_extra_location = None
-    try:
-        from fastapi import Request as _FReq  # type: ignore
-    except Exception:
-        _FReq = None  # type: ignore
     user_q = (req.query or "").strip()
     loc_fallback = "India"
     loc_from_filters = req.filters.location if req.filters else None  # type: ignore
     location = loc_from_filters or active_profile.get("location") or loc_fallback
+    return user_q, location, active_profile
+
+def _offline_search_jobs(req: SearchRequest) -> List[Dict]:
+    """Scored sample listings used when OFFLINE_MODE is on (no network calls)."""
+    user_q = (req.query or "").strip()
+    location = (req.filters.location if req.filters else None) or resume_profile.get("location") or "India"  # type: ignore
+    # Build a few representative queries for sample listings
+    queries = []
+    if user_q:
+        queries.append(user_q)
+    if resume_profile.get("roles"):
+        for role in list(resume_profile["roles"])[:2]:
+            queries.append(f"{role} internship")
+    if resume_profile.get("skills"):
+        queries.append(" ".join(list(resume_profile["skills"])[:3]) + " internship")
+    if not queries:
+        queries = ["software internship", "backend internship", "frontend internship"]
+
+    sample = []
+    for i, term in enumerate(queries[:3]):
+        sample.append({
+            "source": "sample",
+            "title": f"{term.title()} (Offline Sample)",
+            "company": "CompanyX",
+            "location": location,
+            "stipend": None,
+            "apply_url": f"https://example.com/apply/{i}",
+            "description": f"Offline mode enabled. Placeholder listing for '{term}'.",
+            "tags": ["sample", "offline-mode"],
+            "posted": "today",
+        })
+    # Score for the Internship models
+    out_jobs = []
+    for job in sample:
+        s = _score_job(job, resume_profile)
+        job["score"] = s
+        job["is_new"] = _tag_new(job.get("posted"))
+        out_jobs.append(job)
+    return out_jobs
+
+@app.post("/api/search", response_model=List[Internship])
+def search_internships(req: SearchRequest, request: Request, response: Response, swr: Optional[bool] = None):
+    """Blend live scrapes into a ranked list.
+
+    With ?swr=1 (or SEARCH_SWR=1) the last good result set for the same
+    query/location/profile is returned immediately and refreshed in the background;
+    X-Data-Age / X-Data-Stale headers report how old the data is.
+
+    With SEARCH_LOCAL_FIRST=1 the in-process job index answers when it already
+    holds enough matching postings; live scrapes then only top it up.
+    """
+    user_q, location, active_profile = _search_context(req, request)
+    min_stipend = req.filters.min_stipend if req.filters else None  # type: ignore
+    if user_q:
+        _POPULAR.record(user_q, location)
+    # Offline mode short-circuit: return sample data without any network calls
+    if _offline_mode():
+        return _serialize_jobs(_offline_search_jobs(req), min_stipend)
+
+    if swr is None:
+        swr = os.getenv("SEARCH_SWR", "0").lower() in {"1", "true", "yes", "on"}
+    cache = get_cache()
+    cache_key = _search_cache_key(user_q, location, active_profile)
+    if swr:
+        entry = cache.get_with_age("search", cache_key)
+        if entry is not None:
+            jobs, age = entry
+            stale = age >= float(os.getenv("SEARCH_SWR_FRESH_S", "300"))
+            if stale:
+                _swr_refresh(cache_key, user_q, location, active_profile)
+            _set_freshness_headers(response, age, stale)
+            return _serialize_jobs(jobs, min_stipend)
+        # Cold key: join (or start) the coalesced refresh and wait for it
+        wait_s = float(os.getenv("SEARCH_TIME_BUDGET", "14.0")) + 10.0
+        try:
+            jobs = _swr_refresh(cache_key, user_q, location, active_profile).result(timeout=wait_s)
+        except Exception:
+            jobs = []
+        _set_freshness_headers(response, 0.0, False)
+        return _serialize_jobs(jobs, min_stipend)
+
+    jobs = _search_live(user_q, location, active_profile)
+    _store_search_result(cache_key, jobs)
+    _set_freshness_headers(response, 0.0, False)
+    return _serialize_jobs(jobs, min_stipend)
+
+def _serialize_jobs(jobs: List[Dict], min_stipend: Optional[int] = None) -> List[Internship]:
+    with _SEARCH_STAGE_SECONDS.time(stage="serialize"):
+        return [_to_internship(j) for j in _stipend_filter(jobs, min_stipend)]
+
+def _stipend_filter(jobs: List[Dict], min_stipend: Optional[int]) -> List[Dict]:
+    """Jobs paying at least min_stipend a month (unpaid/unknown stipends dropped); all jobs when unset."""
+    if not min_stipend:
+        return jobs
+    return [j for j in jobs if (stipend_amount(j.get("stipend")) or 0) >= min_stipend]
+
+def _search_live(user_q: str, location: str, active_profile: Dict) -> List[Dict]:
+    """Scrape all sources within the time budget, then dedupe, score and interleave."""
+    with _SEARCH_STAGE_SECONDS.time(stage="queries"):
+        queries = _build_search_queries(user_q, active_profile)
+
+    local_jobs: List[Dict] = []
+    if _local_first():
+        with _SEARCH_STAGE_SECONDS.time(stage="local"):
+            local_jobs = _search_local(user_q, location, active_profile)
+        if len(local_jobs) >= int(os.getenv("SEARCH_LOCAL_MIN", "25")):
+            # Enough already-seen postings: answer now, refresh the index in the background
+            _start_scrapes(queries, location, active_profile)
+            return _rank_jobs(local_jobs, active_profile)
+
+    # Run scrapers in parallel with a short time budget for responsiveness
+    all_jobs = []
+    debug_scrapers = os.getenv("DEBUG_SCRAPERS", "0") in {"1","true","yes"}
+    if debug_scrapers:
+        print(f"[scrape] starting queries={len(queries)} -> {list(queries)[:6]}")
+    # SEARCH_TIME_BUDGET: overall seconds to wait for results (default 14.0)
+    time_budget_s = float(os.getenv("SEARCH_TIME_BUDGET", "14.0"))
+    with _SEARCH_STAGE_SECONDS.time(stage="dispatch"):
+        futures = [f for _src, f in _start_scrapes(queries, location, active_profile)]
+    # Wait up to the time budget for any results
+    with _SEARCH_STAGE_SECONDS.time(stage="wait"):
+        done, pending = wait(futures, timeout=time_budget_s)
+    for f in done:
+        try:
+            jobs = f.result()
+            if jobs:
+                all_jobs.extend(_copy_jobs(jobs))
+                if debug_scrapers:
+                    print(f"[scrape] got {len(jobs)} jobs (total {len(all_jobs)})")
+            if len(all_jobs) >= 60:
+                break
+        except Exception:
+            if debug_scrapers:
+                import traceback
+                print("[scrape] worker failed:\n", traceback.format_exc())
+            continue
+    # Stop waiting on stragglers; flights nobody else needs are cancelled in flight
+    for f in pending:
+        _SCRAPE_FLIGHTS.release(f)
+    # Top up live results with indexed postings (dedupe keeps the live copy)
+    all_jobs.extend(local_jobs)
+
+    if not all_jobs and os.getenv("ALLOW_SAMPLE_FALLBACK", "1") in {"1","true","yes","on"}:
+        # Fallback: return synthetic sample results so UI still functions
+        if debug_scrapers:
+            print("[scrape] no real jobs fetched, returning fallback samples")
+        all_jobs = _sample_jobs(queries, location)
+
+    return _rank_jobs(all_jobs, active_profile)
+
+def _local_first() -> bool:
+    return os.getenv("SEARCH_LOCAL_FIRST", "0").lower() in {"1", "true", "yes", "on"}
 
-    # Blended queries: user + resume + buzzword roles + fallback + tech-enhanced queries
+# Country-wide searches: every source is India-focused, so no location constraint
+_ANY_LOCATION = {"", "india", "anywhere", "any"}
+
+def _search_local(user_q: str, location: str, active_profile: Dict) -> List[Dict]:
+    """BM25 hits from the in-process job index for the query (or the profile when empty)."""
+    query = user_q or " ".join(
+        list(active_profile.get("roles", []) or [])[:2] + list(active_profile.get("skills", []) or [])[:5]
+    ) or "internship"
+    loc = None if (location or "").strip().lower() in _ANY_LOCATION else location
+    return get_index().search(query, location=loc, limit=int(os.getenv("SEARCH_LOCAL_LIMIT", "120")))
+
+def _build_search_queries(user_q: str, active_profile: Dict) -> set:
+    """Blended queries: user + resume + buzzword roles + fallback + tech-enhanced queries."""
     queries = set()
     if user_q:
         queries.add(user_q)
@@ -893,158 +1232,383 @@ def search_internships(req: SearchRequest, request: Request):
         queries.add("web developer internship")
     
     queries.add("internship")  # fallback
+    return queries
 
-    # Run scrapers in parallel with a short time budget for responsiveness
-    all_jobs = []
-    debug_scrapers = os.getenv("DEBUG_SCRAPERS", "0") in {"1","true","yes"}
-    if debug_scrapers:
-        print(f"[scrape] starting queries={len(queries)} -> {list(queries)[:6]}")
+def _scrape_calls(queries, location: str, active_profile: Dict) -> List[Tuple[str, Any, tuple]]:
+    """Every scraper call a search for the queries makes, as (source, coroutine fn, args)."""
     # Keep responsiveness but allow tuning for more coverage via env vars
     # SEARCH_MAX_QUERIES: how many distinct query variants to dispatch (default 10)
-    # SEARCH_TIME_BUDGET: overall seconds to wait for results (default 14.0)
     max_queries = int(os.getenv("SEARCH_MAX_QUERIES", "10"))
-    time_budget_s = float(os.getenv("SEARCH_TIME_BUDGET", "14.0"))
-    import time
-    start_time = time.time()
     limited = list(queries)[:max_queries]
     per_query_limit = int(os.getenv("SEARCH_PER_QUERY_LIMIT", "20"))
-    # Scale concurrency based on number of queries to cover more ground when needed
-    max_workers = max(6, min(12, len(limited) * 2))
-    executor = ThreadPoolExecutor(max_workers=max_workers)
-    try:
-        futures = []
-        for idx, q in enumerate(limited):
-            futures.append(executor.submit(fetch_internships, q, location, per_query_limit))
-            # Run LinkedIn for the first 3 queries (configurable via DISABLE_LINKEDIN)
-            if not DISABLE_LINKEDIN and idx < 3:
-                try:
-                    linkedin_fetch = _maybe_import_linkedin()
-                    futures.append(executor.submit(linkedin_fetch, q, location))
-                except Exception:
-                    pass
-        # Also kick off curated company careers scrapes informed by resume roles/skills/location
-        if scrape_company_careers:
-            try:
-                selected_sites = _select_curated_careers(active_profile, location, max_sites=4)
-            except Exception:
-                selected_sites = _CURATED_CAREERS[:4]
-            for cu in selected_sites:
-                futures.append(executor.submit(scrape_company_careers, cu, 25))
-        # Wait up to the time budget for any results
-        done, pending = wait(futures, timeout=time_budget_s)
-        for f in done:
-            try:
-                jobs = f.result()
-                if jobs:
-                    all_jobs.extend(jobs)
-                    if debug_scrapers:
-                        print(f"[scrape] got {len(jobs)} jobs (total {len(all_jobs)})")
-                if len(all_jobs) >= 60:
-                    break
-            except Exception:
-                if debug_scrapers:
-                    import traceback
-                    print("[scrape] worker failed:\n", traceback.format_exc())
-                continue
-        # Try to cancel any still-pending tasks and shutdown quickly
-        for f in pending:
+    calls: List[Tuple[str, Any, tuple]] = []
+    for idx, q in enumerate(limited):
+        calls.append(("internshala", fetch_internships_async, (q, location, per_query_limit)))
+        # Run LinkedIn for the first 3 queries (configurable via DISABLE_LINKEDIN)
+        if not DISABLE_LINKEDIN and idx < 3:
             try:
-                f.cancel()
+                calls.append(("linkedin", _maybe_import_linkedin_async(), (q, location)))
             except Exception:
                 pass
-    finally:
-        # Do not wait for background scrapers; return immediately with partials
+    # Also kick off curated company careers scrapes informed by resume roles/skills/location
+    if scrape_company_careers_async:
         try:
-            executor.shutdown(wait=False, cancel_futures=True)
-        except TypeError:
-            # Python <3.9 fallback
-            executor.shutdown(wait=False)
-
-    if not all_jobs and os.getenv("ALLOW_SAMPLE_FALLBACK", "1") in {"1","true","yes","on"}:
-        # Fallback: return synthetic sample results so UI still functions
-        if debug_scrapers:
-            print("[scrape] no real jobs fetched, returning fallback samples")
-        sample = []
-        base_terms = list(queries)[:3] or ["internship"]
-        for i, term in enumerate(base_terms):
-            sample.append({
-                "source": "sample",
-                "title": f"{term.title()} Internship (Sample)",
-                "company": "CompanyX",
-                "location": location,
-                "stipend": None,
-                "apply_url": f"https://example.com/apply/{i}",
-                "description": f"Placeholder listing for '{term}'. Real scraping returned no results (likely blocked or offline).",
-                "tags": ["sample", "offline-mode"],
-                "posted": "today",
-            })
-        all_jobs = sample
-
+            selected_sites = _select_curated_careers(active_profile, location, max_sites=4)
+        except Exception:
+            selected_sites = _CURATED_CAREERS[:4]
+        for cu in selected_sites:
+            calls.append(("company", scrape_company_careers_async, (cu, 25)))
+    return calls
+
+def _start_scrapes(queries, location: str, active_profile: Dict) -> List[Tuple[str, Future]]:
+    """Dispatch (or join) every scraper flight for the queries; returns (source, future) pairs."""
+    return [(src, _scrape_future(src, fn, *args)) for src, fn, args in _scrape_calls(queries, location, active_profile)]
+
+def _copy_jobs(jobs: List[Dict]) -> List[Dict]:
+    # Flight results are shared with other requests; scoring mutates jobs
+    return [dict(j, tags=list(j.get("tags") or [])) for j in jobs]
+
+def _sample_jobs(queries, location: str) -> List[Dict]:
+    sample = []
+    base_terms = list(queries)[:3] or ["internship"]
+    for i, term in enumerate(base_terms):
+        sample.append({
+            "source": "sample",
+            "title": f"{term.title()} Internship (Sample)",
+            "company": "CompanyX",
+            "location": location,
+            "stipend": None,
+            "apply_url": f"https://example.com/apply/{i}",
+            "description": f"Placeholder listing for '{term}'. Real scraping returned no results (likely blocked or offline).",
+            "tags": ["sample", "offline-mode"],
+            "posted": "today",
+        })
+    return sample
+
+def _rank_jobs(all_jobs: List[Dict], active_profile: Dict) -> List[Dict]:
+    """Dedupe, score, normalize per source, interleave sources and diversify roles."""
+    stage = _SEARCH_STAGE_SECONDS.time
     # Deduplicate
-    all_jobs = _dedupe(all_jobs)
+    with stage(stage="dedupe"):
+        all_jobs = _dedupe(all_jobs)
 
     # Score
-    for job in all_jobs:
-        s = _score_job(job, active_profile)
-        job["score"] = s
-        if s >= 85:
-            job.setdefault("tags", []).append("🔥 hot")
-        job["is_new"] = _tag_new(job.get("posted"))
+    with stage(stage="score"):
+        for job in all_jobs:
+            s = _score_job(job, active_profile)
+            job["score"] = s
+            if s >= 85:
+                job.setdefault("tags", []).append("🔥 hot")
+            job["is_new"] = _tag_new(job.get("posted"))
 
-    # Group by source
-    from collections import defaultdict
-    by_source = defaultdict(list)
-    for job in all_jobs:
-        by_source[job.get("source", "other").lower()].append(job)
+    with stage(stage="normalize"):
+        # Group by source
+        from collections import defaultdict
+        by_source = defaultdict(list)
+        for job in all_jobs:
+            by_source[job.get("source", "other").lower()].append(job)
 
-    # Normalize scores per source
-    for src, jobs in by_source.items():
-        if not jobs:
-            continue
-        max_s = max(j["score"] for j in jobs) or 1
-        for j in jobs:
-            j["score"] = round((j["score"] / max_s) * 100, 2)
+        # Normalize scores per source
+        for src, jobs in by_source.items():
+            if not jobs:
+                continue
+            max_s = max(j["score"] for j in jobs) or 1
+            for j in jobs:
+                j["score"] = round((j["score"] / max_s) * 100, 2)
 
-    # Sort inside each source
-    for src in by_source:
-        by_source[src].sort(key=lambda x: x["score"], reverse=True)
+        # Sort inside each source
+        for src in by_source:
+            by_source[src].sort(key=lambda x: x["score"], reverse=True)
 
     # Balanced interleave: at least 40% from each if available. Cap total with env.
-    final_cap = int(os.getenv("SEARCH_MAX_RESULTS", "80"))
-    final_jobs = []
-    src_names = list(by_source.keys())
-    while any(by_source.values()) and len(final_jobs) < final_cap:
-        for src in src_names:
-            if by_source[src]:
-                final_jobs.append(by_source[src].pop(0))
+    with stage(stage="interleave"):
+        final_cap = int(os.getenv("SEARCH_MAX_RESULTS", "80"))
+        final_jobs = []
+        src_names = list(by_source.keys())
+        while any(by_source.values()) and len(final_jobs) < final_cap:
+            for src in src_names:
+                if by_source[src]:
+                    final_jobs.append(by_source[src].pop(0))
 
     # Limit duplicate roles in top results (gentle)
-    dup_threshold = int(os.getenv("DUPLICATE_ROLE_LIMIT_N", "30"))
-    seen_roles = set()
-    diverse_jobs = []
-    for job in final_jobs:
-        role_key = job["title"].split()[0].lower()
-        if role_key in seen_roles and len(diverse_jobs) < dup_threshold:
-            continue
-        seen_roles.add(role_key)
-        diverse_jobs.append(job)
+    with stage(stage="diversify"):
+        dup_threshold = int(os.getenv("DUPLICATE_ROLE_LIMIT_N", "30"))
+        seen_roles = set()
+        diverse_jobs = []
+        for job in final_jobs:
+            role_key = job["title"].split()[0].lower()
+            if role_key in seen_roles and len(diverse_jobs) < dup_threshold:
+                continue
+            seen_roles.add(role_key)
+            diverse_jobs.append(job)
+
+    return diverse_jobs
+
+def _to_internship(job: Dict) -> Internship:
+    return Internship(
+        source=job.get("source",""),
+        title=job.get("title",""),
+        company=job.get("company",""),
+        location=job.get("location",""),
+        stipend=job.get("stipend"),
+        apply_url=job.get("apply_url"),
+        description=job.get("description"),
+        tags=job.get("tags", []),
+        score=job.get("score"),
+        is_new=job.get("is_new"),
+    )
+
+# -----------------------------
+# Stale-while-revalidate support for /api/search
+# -----------------------------
+_SWR_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv("SEARCH_SWR_WORKERS", "4")), thread_name_prefix="swr")
+_SWR_FLIGHTS = SingleFlight(_SWR_EXECUTOR, name="search-refresh")
+
+def _search_cache_key(user_q: str, location: str, profile: Dict) -> str:
+    """Result sets depend on the query, location and the resume profile driving queries/scoring."""
+    fp = json.dumps({
+        "skills": sorted(str(x) for x in profile.get("skills", []) or []),
+        "roles": sorted(str(x) for x in profile.get("roles", []) or []),
+        "location": profile.get("location"),
+    }, sort_keys=True)
+    return make_key(user_q, location, hashlib.sha1(fp.encode("utf-8")).hexdigest()[:16])
+
+def _store_search_result(cache_key: str, jobs: List[Dict]) -> None:
+    # Never pin placeholder samples as the "last good" result set
+    if any(j.get("source") != "sample" for j in jobs):
+        get_cache().set("search", cache_key, jobs, ttl=float(os.getenv("SEARCH_SWR_MAX_AGE_S", "86400")))
+
+def _swr_refresh(cache_key: str, user_q: str, location: str, profile: Dict) -> Future:
+    """Start a background re-scrape for cache_key, or join the one already running."""
+    snapshot = {
+        "skills": set(profile.get("skills", []) or []),
+        "roles": set(profile.get("roles", []) or []),
+        "location": profile.get("location"),
+    }
+
+    def _run() -> List[Dict]:
+        jobs = _search_live(user_q, location, snapshot)
+        _store_search_result(cache_key, jobs)
+        return jobs
+
+    return _SWR_FLIGHTS.submit(cache_key, _run)
+
+# -----------------------------
+# Background pre-warming of popular searches
+# -----------------------------
+_POPULAR = QueryPopularity(half_life_s=float(os.getenv("PREWARM_HALF_LIFE_S", "21600")))
+# PREWARM_HOST_RPM is for the whole deployment; every worker runs its own scheduler
+_PREWARM_BUDGET = HostBudget(
+    per_minute=float(os.getenv("PREWARM_HOST_RPM", "6")) / max(1, int(os.getenv("WEB_CONCURRENCY", "1") or 1))
+)
+_SOURCE_HOSTS = {"internshala": "internshala.com", "linkedin": "www.linkedin.com"}
+
+def _prewarm_task(source: str, host: str, fn, *args) -> PrewarmTask:
+    """Keep one scraper call warm under the same cache key and flight /api/search uses.
+
+    Every HTTP request the scrape makes is charged to _PREWARM_BUDGET under
+    `host`, the same key the scheduler checks before dispatching it, even when
+    a fallback request goes to another host.
+    """
+    key = make_key(*args)
+
+    def fresh() -> bool:
+        cache = get_cache()
+        age = cache.age(source, key)
+        return age is not None and age < cache.ttl_for(source) * float(os.getenv("PREWARM_REFRESH_AT", "0.75"))
 
+    def run() -> Future:
+        charged = functools.partial(with_request_hook, lambda _fetched: _PREWARM_BUDGET.charge(host), fn)
+        return _SCRAPE_FLIGHTS.submit((source, key), _fetch_and_store, source, key, charged, *args)
+
+    return PrewarmTask(source, host, key, fresh, run)
+
+def _prewarm_plan(query: str, location: str) -> List[PrewarmTask]:
+    """The scrapes a search for (query, location) without a session profile dispatches.
+
+    Popularity is tracked per (query, location) only, so resume-driven variants
+    of a signed-in student's search are not pre-warmed.
+    """
+    queries = _build_search_queries(query, resume_profile)
     return [
-        Internship(
-            source=job.get("source",""),
-            title=job.get("title",""),
-            company=job.get("company",""),
-            location=job.get("location",""),
-            stipend=job.get("stipend"),
-            apply_url=job.get("apply_url"),
-            description=job.get("description"),
-            tags=job.get("tags", []),
-            score=job.get("score"),
-            is_new=job.get("is_new"),
-        )
-        for job in diverse_jobs
+        # Company scrapes are budgeted on the host they fetch (the ATS API), not the careers page
+        _prewarm_task(src, _SOURCE_HOSTS.get(src) or careers_request_host(args[0]) or src, fn, *args)
+        for src, fn, args in _scrape_calls(queries, location, resume_profile)
     ]
 
+def _save_popular(rows) -> None:
+    get_cache().set("prewarm", "popular", rows, ttl=7 * 86400)
+
+_PREWARMER = Prewarmer(
+    _POPULAR,
+    _prewarm_plan,
+    _PREWARM_BUDGET,
+    interval_s=float(os.getenv("PREWARM_INTERVAL_S", "120")),
+    top_n=int(os.getenv("PREWARM_TOP_N", "8")),
+    seeds=parse_seeds(os.getenv("PREWARM_SEED_QUERIES", "")),
+    save=_save_popular,
+)
+
+def _start_prewarm() -> None:
+    if os.getenv("PREWARM_ENABLED", "0").lower() not in {"1", "true", "yes", "on"} or _offline_mode():
+        return
+    try:
+        _POPULAR.load(get_cache().get("prewarm", "popular") or [])
+    except Exception:
+        pass
+    _PREWARMER.start()
+
+def _start_gov_refresh() -> None:
+    if os.getenv("GOV_REFRESH_ENABLED", "1").lower() not in {"1", "true", "yes", "on"} or _offline_mode():
+        return
+    try:
+        from routes.gov_feeds import start_background_refresh  # type: ignore
+        start_background_refresh()
+    except Exception:
+        pass
+
+def _stop_gov_refresh() -> None:
+    try:
+        from routes.gov_feeds import stop_background_refresh  # type: ignore
+        stop_background_refresh()
+    except Exception:
+        pass
+
+def _set_freshness_headers(response: Response, age_s: float, stale: bool) -> None:
+    response.headers["X-Data-Age"] = str(int(age_s))
+    response.headers["X-Data-Stale"] = "1" if stale else "0"
+
+# -----------------------------
+# Streaming search (NDJSON / Server-Sent Events)
+# -----------------------------
+@app.post("/api/search/stream")
+def search_internships_stream(req: SearchRequest, request: Request, format: Optional[str] = None):
+    """Stream search results as each source answers instead of after the whole time budget.
+
+    Frames (one JSON object per NDJSON line, or per SSE event with ?format=sse or
+    Accept: text/event-stream):
+      {"event": "start", "sources": n}
+      {"event": "results", "source": s, "jobs": [...], "elapsed_ms": t}  new, deduplicated, scored
+      {"event": "final", "jobs": [...], "complete": bool, "elapsed_ms": t}  re-ranked, same as /api/search
+    Partial scores are raw relevance; the final frame applies per-source normalization.
+    filters.min_stipend applies to every frame. With SEARCH_LOCAL_FIRST=1 indexed
+    postings come first as a "local" results frame, and when there are enough of
+    them the final frame follows at once while live scrapes refresh the index.
+    """
+    fmt = (format or "").lower()
+    if not fmt:
+        fmt = "sse" if "text/event-stream" in (request.headers.get("accept") or "") else "ndjson"
+    min_stipend = req.filters.min_stipend if req.filters else None  # type: ignore
+    if _offline_mode():
+        jobs = _stipend_filter(_offline_search_jobs(req), min_stipend)
+        frames = iter([{"event": "final", "jobs": [jsonable_encoder(_to_internship(j)) for j in jobs], "complete": True, "elapsed_ms": 0}])
+    else:
+        user_q, location, active_profile = _search_context(req, request)
+        if user_q:
+            _POPULAR.record(user_q, location)
+        frames = _search_stream_frames(user_q, location, active_profile, min_stipend)
+    media_type = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        _encode_frames(frames, fmt),
+        media_type=media_type,
+        # Proxies (nginx, EB) must not buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _encode_frames(frames, fmt: str):
+    for frame in frames:
+        data = json.dumps(frame, ensure_ascii=False)
+        if fmt == "sse":
+            yield f"event: {frame['event']}\ndata: {data}\n\n"
+        else:
+            yield data + "\n"
+
+def _search_stream_frames(user_q: str, location: str, active_profile: Dict, min_stipend: Optional[int] = None):
+    start = time.time()
+    elapsed_ms = lambda: int((time.time() - start) * 1000)
+    queries = _build_search_queries(user_q, active_profile)
+    sent = set()
+
+    def scored(jobs: List[Dict]) -> List[Dict]:
+        """Unsent jobs passing the stipend filter, scored, best first."""
+        batch = []
+        for job in _dedupe(_stipend_filter(jobs, min_stipend)):
+            key = _dedupe_key(job)
+            if key in sent:
+                continue
+            sent.add(key)
+            score = _score_job(job, active_profile)
+            tags = list(job.get("tags") or []) + (["🔥 hot"] if score >= 85 else [])
+            batch.append(dict(job, score=score, tags=tags, is_new=_tag_new(job.get("posted"))))
+        batch.sort(key=lambda j: j["score"], reverse=True)
+        return batch
+
+    def final_frame(jobs: List[Dict], complete: bool) -> Dict:
+        final = _rank_jobs(jobs, active_profile)
+        _store_search_result(_search_cache_key(user_q, location, active_profile), final)
+        return {
+            "event": "final",
+            "jobs": [jsonable_encoder(_to_internship(j)) for j in _stipend_filter(final, min_stipend)],
+            "complete": complete,
+            "elapsed_ms": elapsed_ms(),
+        }
+
+    local_jobs: List[Dict] = []
+    if _local_first():
+        with _SEARCH_STAGE_SECONDS.time(stage="local"):
+            local_jobs = _search_local(user_q, location, active_profile)
+        if len(local_jobs) >= int(os.getenv("SEARCH_LOCAL_MIN", "25")):
+            # Same as /api/search: answer from the index, refresh it in the background
+            _start_scrapes(queries, location, active_profile)
+            yield {"event": "start", "sources": 0}
+            yield final_frame(local_jobs, True)
+            return
+
+    started = _start_scrapes(queries, location, active_profile)
+    source_of = {f: src for src, f in started}
+    pending = set(source_of)
+    all_jobs: List[Dict] = []
+    yield {"event": "start", "sources": len(pending)}
+    batch = scored(_copy_jobs(local_jobs))
+    if batch:
+        yield {
+            "event": "results",
+            "source": "local",
+            "jobs": [jsonable_encoder(_to_internship(j)) for j in batch],
+            "elapsed_ms": elapsed_ms(),
+        }
+    try:
+        try:
+            for f in as_completed(list(pending), timeout=float(os.getenv("SEARCH_TIME_BUDGET", "14.0"))):
+                pending.discard(f)
+                try:
+                    jobs = _copy_jobs(f.result() or [])
+                except Exception:
+                    continue
+                all_jobs.extend(jobs)
+                batch = scored(jobs)
+                if batch:
+                    yield {
+                        "event": "results",
+                        "source": source_of.get(f, "other"),
+                        "jobs": [jsonable_encoder(_to_internship(j)) for j in batch],
+                        "elapsed_ms": elapsed_ms(),
+                    }
+                if len(all_jobs) >= 60:
+                    break
+        except FuturesTimeout:
+            pass
+    finally:
+        # Budget spent or client went away: drop our interest in the stragglers
+        for f in pending:
+            _SCRAPE_FLIGHTS.release(f)
+
+    # Top up live results with indexed postings (dedupe keeps the live copy)
+    all_jobs.extend(local_jobs)
+    if not all_jobs and os.getenv("ALLOW_SAMPLE_FALLBACK", "1") in {"1","true","yes","on"}:
+        all_jobs = _sample_jobs(queries, location)
+    yield final_frame(all_jobs, not pending)
+
 # -----------------------------
 # Chat Endpoint (resume-aware and fun)
 # -----------------------------
@@ -1092,6 +1656,50 @@ def chat_with_ai(req: ChatRequest, request: Request):
         # Never surface a 500 to the browser for chat; respond with a safe message
         return {"response": "I hit a snag processing that. Please try again."}
 
+@app.post("/api/chat/stream")
+def chat_with_ai_stream(req: ChatRequest, request: Request, format: Optional[str] = None):
+    """Streaming variant of /api/chat: the reply is sent token by token as the model writes it.
+
+    Frames (NDJSON lines, or SSE events with ?format=sse or Accept: text/event-stream):
+      {"event": "delta", "text": "..."}                                 formatted Markdown, in order
+      {"event": "done", "response": "...", "model": m, "cached": bool}  the full reply, as /api/chat returns it
+    """
+    fmt = (format or "").lower()
+    if not fmt:
+        fmt = "sse" if "text/event-stream" in (request.headers.get("accept") or "") else "ndjson"
+    msg = (req.message or "").strip()
+    ai_enabled = (os.getenv("OFFLINE_MODE", "0").lower() not in {"1","true","yes","on"}) and bool(_openrouter_config()[0])
+    if not msg:
+        frames = iter([{"event": "done", "response": "Please ask a question, e.g., ‘Rate my resume’.", "model": None, "cached": False}])
+    elif not ai_enabled:
+        frames = iter([{"event": "done", "response": "AI is not configured on the server. Add OPENROUTER_API_KEY to enable smart answers.", "model": None, "cached": False}])
+    else:
+        sid = req.session_id or _get_session_id(request)
+        sess_text, sess_profile = _get_session_profile(sid)
+        active_text = sess_text or ("" if sid else resume_text)
+        active_profile = sess_profile if sess_text or sid else resume_profile
+        referer = request.headers.get("origin") or request.headers.get("referer") or None
+        prompt = _ai_prompt(msg, active_text, active_profile, req.model, referer, os.getenv("OPENROUTER_SITE_NAME", None))
+        frames = _chat_stream_frames(prompt)
+    media_type = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        _encode_frames(frames, fmt),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _chat_stream_frames(prompt: Optional[Dict]):
+    """_ai_stream_frames() with /api/chat's apology when nothing came back."""
+    try:
+        for frame in _ai_stream_frames(prompt):
+            if frame["event"] == "done" and not frame["response"]:
+                hint = f" (diag: {_LAST_AI_ERROR})" if os.getenv("AI_DEBUG", "0") in {"1","true","yes"} and _LAST_AI_ERROR else ""
+                frame = dict(frame, response=f"I’m having trouble reaching the AI right now. Please try again in a moment.{hint}")
+            yield frame
+    except Exception:
+        # Never break the stream with a 500; close it with the same safe message /api/chat uses
+        yield {"event": "done", "response": "I hit a snag processing that. Please try again.", "model": None, "cached": False}
+
 @app.get("/api/chat")
 def chat_get_hint():
     # Helpful response for direct GETs in browser (avoid 405)
@@ -1109,58 +1717,34 @@ def chat_options():
 async def upload_resume(request: Request, file: UploadFile = File(...)):
     global resume_text, resume_profile
     sid = _get_session_id(request)
-    content = await file.read()
-    text = ""
-    fname = file.filename.lower()
-
-    if fname.endswith(".pdf"):
-        if not _PDF_ENABLED:
+    kind = document_kind(file.filename)
+    extractor = get_resume_extractor()
+    with _RESUME_SECONDS.time(stage="read", kind=kind):
+        # Read at most one byte past the limit; the extractor rejects oversize uploads unparsed
+        content = await file.read(extractor.max_bytes + 1)
+
+    # Same bytes, same parse: re-uploads are answered from the content-addressed cache
+    digest = resume_hash(content)
+    cache = get_resume_cache()
+    parsed = cache.get(digest) if len(content) <= extractor.max_bytes else None
+    if parsed is None:
+        if kind == "pdf" and not _PDF_ENABLED:
             return {"error": "PDF parsing requires PyMuPDF (install with: pip install PyMuPDF)."}
-        try:
-            with fitz.open(stream=content, filetype="pdf") as doc:  # type: ignore
-                for page in doc:
-                    text += page.get_text()
-        except Exception as e:
-            return {"error": f"Failed to parse PDF: {e}"}
-    elif fname.endswith(".docx"):
-        try:
-            document = docx.Document(io.BytesIO(content))
-            text = "\n".join(p.text for p in document.paragraphs)
-        except Exception as e:
-            return {"error": f"Failed to parse DOCX: {e}"}
-    elif any(fname.endswith(ext) for ext in (".txt", ".md")):
-        try:
-            text = content.decode("utf-8", errors="ignore")
-        except Exception as e:
-            return {"error": f"Failed to read text file: {e}"}
-    else:
-        # Generic attempt: treat as text
-        try:
-            text = content.decode("utf-8", errors="ignore")
-        except Exception:
-            return {"error": "Unsupported file type. Please upload PDF, DOCX or TXT."}
-
-    # Basic cleanup
-    text = re.sub(r"\s+", " ", text).strip()
-    if not text:
-        return {"error": "No readable text extracted from resume."}
+        with _RESUME_SECONDS.time(stage="extract", kind=kind):
+            # Text extraction + token scan run in the resume worker pool, never on the event loop
+            extracted = await extractor.extract(content, file.filename)
+        if "error" in extracted:
+            return {"error": extracted["error"]}
+        if not extracted["text"]:
+            return {"error": "No readable text extracted from resume."}
+        with _RESUME_SECONDS.time(stage="profile", kind=kind):
+            parsed = await run_in_threadpool(_resume_profile, extracted["text"], extracted["tech"])
+        cache.put(digest, parsed)
+    text = parsed["text"]
+    extracted_skills, extracted_roles, loc = set(parsed["skills"]), set(parsed["roles"]), parsed["location"]
 
     resume_text = text  # legacy global for backward-compat
 
-    # Extract profile info
-    extracted_skills = set(_extract_keywords(text, max_terms=32))
-
-    # Simple extra skill harvesting (common tech tokens)
-    tech_tokens = re.findall(r"\b([A-Za-z][A-Za-z0-9+#\.]{1,20})\b", text.lower())
-    tech_whitelist = {
-        "python","java","javascript","typescript","react","node","django","fastapi","sql","mysql","postgresql","mongodb","docker","kubernetes","aws","azure","gcp","pandas","numpy","scikit-learn","tensorflow","pytorch","html","css","tailwind","git","linux","excel","powerbi","power","bi","mlflow","keras","flask","redis","next.js","next","jira","c++","c","go"}
-    for t in tech_tokens:
-        if t in tech_whitelist and len(extracted_skills) < 64:
-            extracted_skills.add(t)
-
-    extracted_roles = _extract_roles(text)
-    loc = _extract_location(text)
-
     # Update legacy global profile (for old clients)
     resume_profile["skills"] = set(extracted_skills)
     resume_profile["roles"] = set(extracted_roles) or resume_profile.get("roles", set())
@@ -1169,15 +1753,20 @@ async def upload_resume(request: Request, file: UploadFile = File(...)):
 
     # Write to session-scoped store as the source of truth for multi-user safety
     if sid:
-        _sessions[sid] = {
+        get_session_store().set(sid, {
             "resume_text": text,
             "resume_profile": {
                 "skills": set(extracted_skills),
                 "roles": set(extracted_roles) or set(),
                 "location": loc or None,
+                "name": parsed.get("name"),
+                "email": parsed.get("email"),
+                "phone": parsed.get("phone"),
             },
+            # Content hash of the upload; key of the parsed resume in utils/resume_cache.py
+            "resume_hash": digest,
             "updated_at": datetime.utcnow().isoformat(),
-        }
+        })
 
     return {
         "success": True,
@@ -1185,7 +1774,8 @@ async def upload_resume(request: Request, file: UploadFile = File(...)):
     "skills_count": len(extracted_skills),
     "roles": sorted(list(extracted_roles))[:10],
     "location": loc,
-    "sample_text": text[:400]
+    "sample_text": text[:400],
+    "resume_hash": digest,
     }
 
 # -----------------------------
@@ -1229,7 +1819,7 @@ def system_check():
     key_present = bool(os.getenv("OPENROUTER_API_KEY", "").strip())
     ai_sample = None
     if key_present:
-        ai_sample = _ai_enhanced_response("Return one word: pong", resume_text[:2000], resume_profile)
+        ai_sample = _ai_enhanced_response("Return one word: pong", resume_text[:2000], resume_profile, use_cache=False)
         if not ai_sample:
             notes.append("OpenRouter key set but model returned empty response (possible network issue or rate limit).")
     else:
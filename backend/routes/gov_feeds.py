@@ -1,20 +1,28 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
-import json
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, NamedTuple, Optional, Sequence, Tuple
 import time
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
+from scrapers.engine import fetch, parse_cached, run_sync
+from utils import metrics
+from utils.singleflight import SingleFlight
+from utils.gov_store import SeedFeed, moderation_store
+from utils.html_parsing import make_soup, tags_strainer
+
 
 router = APIRouter(prefix="/api/gov", tags=["government-feeds"])
 
+_GOV_SECONDS = metrics.histogram("gov_feed_seconds", "Gov feed aggregation time per source / stage", ("source",))
+
 
 class GovFilter(BaseModel):
     state: Optional[str] = Field(None, description="State filter e.g. 'Rajasthan'")
@@ -22,15 +30,7 @@ class GovFilter(BaseModel):
     limit: int = Field(50, ge=1, le=200)
 
 
-def _load_feed() -> List[Dict[str, Any]]:
-    here = os.path.dirname(__file__)
-    data_path = os.path.normpath(os.path.join(here, "..", "data", "gov_feeds.json"))
-    try:
-        with open(data_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data if isinstance(data, list) else []
-    except Exception:
-        return []
+_FEED_FILE = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "data", "gov_feeds.json"))
 
 
 def _simple_score(item: Dict[str, Any]) -> float:
@@ -49,11 +49,42 @@ def _simple_score(item: Dict[str, Any]) -> float:
     return float(min(100.0, max(0.0, score)))
 
 
-# --- Live fetch + cache (simple) ---
-_CACHE: Dict[str, Any] = {"ts": 0.0, "items": []}
+# --- Live fetch + cache ---
+_CACHE: Dict[str, Any] = {"ts": 0.0, "items": [], "sources": {}, "complete": True, "expires_at": 0.0}
 _TTL_SECONDS = 60 * 60 * 24  # 24 hours
+# Sources are fetched concurrently: the round ends at GOV_DEADLINE_S no matter how slow a portal is,
+# and one portal gets at most GOV_SOURCE_TIMEOUT_S. Each source is cached on its own TTL (GovSource.ttl_s,
+# GOV_SOURCE_TTLS="isro=3600,ncs=7200" overrides); a timed-out/failed source only for GOV_PARTIAL_TTL_S,
+# so its page is retried soon instead of a day later. A background thread re-fetches each source once
+# it is GOV_REFRESH_AT of its TTL old, so requests normally never wait on the portals.
+_DEADLINE_S = float(os.getenv("GOV_DEADLINE_S", "8"))
+_SOURCE_TIMEOUT_S = float(os.getenv("GOV_SOURCE_TIMEOUT_S", "6"))
+_PARTIAL_TTL_S = float(os.getenv("GOV_PARTIAL_TTL_S", "600"))
+_REFRESH_AT = min(1.0, max(0.1, float(os.getenv("GOV_REFRESH_AT", "0.8"))))
+_REFRESH_MIN_GAP_S = 30.0
+
+
+def _parse_source_ttls(raw: str) -> Dict[str, float]:
+    """"isro=3600,ncs=0.5" -> {"isro": 3600.0, "ncs": 0.5}; malformed or non-positive entries are logged and skipped."""
+    out: Dict[str, float] = {}
+    for part in (raw or "").split(","):
+        if not part.strip():
+            continue
+        name, sep, ttl = part.partition("=")
+        name = name.strip().lower()
+        try:
+            value = float(ttl)
+        except ValueError:
+            value = float("nan")
+        if not sep or not name or not 0 < value < float("inf"):
+            logging.warning("GOV_SOURCE_TTLS: ignoring %r (expected name=<seconds > 0>)", part.strip())
+            continue
+        out[name] = value
+    return out
 
 
+_SOURCE_TTLS = _parse_source_ttls(os.getenv("GOV_SOURCE_TTLS", ""))
+
 def _is_verified_by_domain(url: Optional[str]) -> bool:
     if not url:
         return False
@@ -110,331 +141,179 @@ def _normalize(
     return item
 
 
-def _page_meta(url: str, timeout: float = 10.0) -> Tuple[str, str]:
+_META_ONLY = tags_strainer(["title", "meta"])
+
+
+async def _page_meta_async(url: str, timeout: float = 10.0) -> Tuple[str, str]:
     """Fetch page title + meta description. Best-effort; returns (title, desc)."""
     try:
-        r = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0 (compatible; StudentPilot/1.0)"})
+        r = await fetch(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0 (compatible; StudentPilot/1.0)"})
         if r.status_code != 200:
             return "", ""
-        soup = BeautifulSoup(r.text, "html.parser")
-        title = (soup.title.string if soup.title and soup.title.string else "").strip()
-        desc_tag = soup.find("meta", attrs={"name": "description"}) or soup.find("meta", attrs={"property": "og:description"})
-        desc = (desc_tag.get("content") if desc_tag else "") or ""
-        return title[:200], desc[:500]
+        # Revalidated (304) pages reuse the previous parse
+        return await parse_cached(r, "meta", _parse_meta)
     except Exception:
         return "", ""
 
 
-def _fetch_aicte() -> List[Dict[str, Any]]:
-    url = "https://internship.aicte-india.org/"
-    title, desc = _page_meta(url)
-    if not title and not desc:
-        # Fallback minimal item
-        desc = "AICTE Internship portal with government-backed internships."
-    return [
-        _normalize(
-            title="AICTE Internship Portal",
-            company="AICTE",
-            location="India / Remote",
-            state="All",
-            stipend=None,
-            apply_url=url,
-            description=desc or title,
-            tags=["aicte", "national"],
-            verified=True,
-        )
-    ]
-
-
-def _fetch_ncs() -> List[Dict[str, Any]]:
-    url = "https://www.ncs.gov.in/"
-    title, desc = _page_meta(url)
-    if not title and not desc:
-        desc = "National Career Service portal; search for internships in government programs."
-    return [
-        _normalize(
-            title="NCS Internship Listings",
-            company="National Career Service",
-            location="India",
-            state="All",
-            stipend=None,
-            apply_url=url,
-            description=desc or title,
-            tags=["ncs", "government"],
-            verified=True,
-        )
-    ]
-
-
-def _fetch_mygov() -> List[Dict[str, Any]]:
-    url = "https://innovateindia.mygov.in/internship/"
-    title, desc = _page_meta(url)
-    if not title and not desc:
-        desc = "MyGov Internship — opportunities on Digital India initiatives."
-    return [
-        _normalize(
-            title="MyGov Internship",
-            company="MyGov / MeitY",
-            location="New Delhi / Remote",
-            state="All",
-            stipend="Role-dependent",
-            apply_url=url,
-            description=desc or title,
-            tags=["mygov", "digital"],
-            verified=True,
-        )
-    ]
-
-
-def _fetch_drdo() -> List[Dict[str, Any]]:
-    url = "https://www.drdo.gov.in/internship"
-    title, desc = _page_meta(url)
-    if not title and not desc:
-        desc = "DRDO Internship Program — research and engineering opportunities across labs."
-    return [
-        _normalize(
-            title="DRDO Internship Program",
-            company="DRDO",
-            location="Across India",
-            state="All",
-            stipend="Role-dependent",
-            apply_url=url,
-            description=desc or title,
-            tags=["drdo", "defence", "research"],
-            verified=None,  # infer from domain
-        )
-    ]
-
-
-def _fetch_niti() -> List[Dict[str, Any]]:
-    url = "https://www.niti.gov.in/internship"
-    title, desc = _page_meta(url)
-    if not title and not desc:
-        desc = "NITI Aayog Internship — policy and research-focused internships."
-    return [
-        _normalize(
-            title="NITI Aayog Internship",
-            company="NITI Aayog",
-            location="New Delhi / Remote",
-            state="All",
-            stipend="Unpaid / As per policy",
-            apply_url=url,
-            description=desc or title,
-            tags=["niti", "policy", "research"],
-            verified=None,
-        )
-    ]
-
-
-def _fetch_mahaswayam() -> List[Dict[str, Any]]:
-    url = "https://mahaswayam.gov.in/"
-    title, desc = _page_meta(url)
-    if not title and not desc:
-        desc = "MahaSwayam — Maharashtra Government's unified portal for jobs and internships."
-    return [
-        _normalize(
-            title="MahaSwayam (Maharashtra)",
-            company="Govt. of Maharashtra",
-            location="Maharashtra, India",
-            state="Maharashtra",
-            stipend=None,
-            apply_url=url,
-            description=desc or title,
-            tags=["maharashtra", "state", "portal"],
-            verified=None,
-        )
-    ]
-
-
-# --- Additional Phase 2 sources (PSUs/State Portals) ---
-def _fetch_bis() -> List[Dict[str, Any]]:
-    url = "https://www.bis.gov.in/careers/"
-    title, desc = _page_meta(url)
-    if not title and not desc:
-        desc = "Bureau of Indian Standards (BIS) careers and internships."
-    return [
-        _normalize(
-            title="BIS Careers & Internships",
-            company="Bureau of Indian Standards",
-            location="India",
-            state="All",
-            stipend=None,
-            apply_url=url,
-            description=desc or title,
-            tags=["bis", "psu"],
-            verified=None,
-        )
-    ]
-
-
-def _fetch_isro() -> List[Dict[str, Any]]:
-    url = "https://www.isro.gov.in/Careers.html"
-    title, desc = _page_meta(url)
-    if not title and not desc:
-        desc = "ISRO Careers — research internships and opportunities."
-    return [
-        _normalize(
-            title="ISRO Careers & Internships",
-            company="ISRO",
-            location="India",
-            state="All",
-            stipend=None,
-            apply_url=url,
-            description=desc or title,
-            tags=["isro", "space", "research"],
-            verified=None,
-        )
-    ]
-
-
-def _fetch_iocl() -> List[Dict[str, Any]]:
-    url = "https://iocl.com/careers"
-    title, desc = _page_meta(url)
-    if not title and not desc:
-        desc = "Indian Oil (IOCL) — careers and internships."
-    return [
-        _normalize(
-            title="IOCL Careers",
-            company="Indian Oil Corporation",
-            location="India",
-            state="All",
-            stipend=None,
-            apply_url=url,
-            description=desc or title,
-            tags=["iocl", "psu"],
-            verified=None,
-        )
-    ]
-
-
-def _fetch_ongc() -> List[Dict[str, Any]]:
-    url = "https://ongcindia.com/"
-    title, desc = _page_meta(url)
-    if not title and not desc:
-        desc = "ONGC — careers and internships."
-    return [
-        _normalize(
-            title="ONGC Careers",
-            company="ONGC",
-            location="India",
-            state="All",
-            stipend=None,
-            apply_url=url,
-            description=desc or title,
-            tags=["ongc", "psu"],
-            verified=None,
-        )
-    ]
-
-
-def _fetch_barc() -> List[Dict[str, Any]]:
-    url = "https://www.barc.gov.in/careers/"
-    title, desc = _page_meta(url)
-    if not title and not desc:
-        desc = "BARC — internships and research opportunities."
-    return [
-        _normalize(
-            title="BARC Careers",
-            company="BARC",
-            location="India",
-            state="All",
-            stipend=None,
-            apply_url=url,
-            description=desc or title,
-            tags=["barc", "research", "psu"],
-            verified=None,
-        )
-    ]
-
-
-def _fetch_nats() -> List[Dict[str, Any]]:
-    url = "https://www.mhrdnats.gov.in/"
-    title, desc = _page_meta(url)
-    if not title and not desc:
-        desc = "NATS — National Apprenticeship Training Scheme portal."
-    return [
-        _normalize(
-            title="NATS (Apprenticeships)",
-            company="MHRD NATS",
-            location="India",
-            state="All",
-            stipend=None,
-            apply_url=url,
-            description=desc or title,
-            tags=["nats", "apprenticeship"],
-            verified=None,
-        )
-    ]
-
-
-def _fetch_sebi() -> List[Dict[str, Any]]:
-    url = "https://www.sebi.gov.in/"
-    title, desc = _page_meta(url)
-    if not title and not desc:
-        desc = "SEBI — careers, internships, and notices."
-    return [
-        _normalize(
-            title="SEBI Careers",
-            company="SEBI",
-            location="India",
-            state="All",
-            stipend=None,
-            apply_url=url,
-            description=desc or title,
-            tags=["sebi", "regulator"],
-            verified=None,
-        )
-    ]
-
-
-def _fetch_tn_naanmudhalvan() -> List[Dict[str, Any]]:
-    url = "https://www.naanmudhalvan.tn.gov.in/"
-    title, desc = _page_meta(url)
-    if not title and not desc:
-        desc = "Tamil Nadu — Naan Mudhalvan opportunities portal."
-    return [
-        _normalize(
-            title="Naan Mudhalvan (TN)",
-            company="Govt. of Tamil Nadu",
-            location="Tamil Nadu, India",
-            state="Tamil Nadu",
-            stipend=None,
-            apply_url=url,
-            description=desc or title,
-            tags=["tamil nadu", "state"],
-            verified=None,
-        )
-    ]
-
-
-# --- Trust scoring & Moderation ---
-_MOD_LOCK = threading.Lock()
-_MOD_FILE = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "data", "gov_moderation.json"))
-_MOD_DECISIONS: Dict[str, set] = {"approved": set(), "flagged": set()}
+def _parse_meta(content: bytes) -> Tuple[str, str]:
+    soup = make_soup(content, _META_ONLY)
+    title = (soup.title.string if soup.title and soup.title.string else "").strip()
+    desc_tag = soup.find("meta", attrs={"name": "description"}) or soup.find("meta", attrs={"property": "og:description"})
+    desc = (desc_tag.get("content") if desc_tag else "") or ""
+    return title[:200], desc[:500]
 
 
-def _load_mod():
+class GovSource(NamedTuple):
+    """One live portal: its page meta enriches a fixed listing; `fallback` is used when the page is unreachable."""
+    name: str
+    url: str
+    title: str
+    company: str
+    location: str
+    state: Optional[str]
+    stipend: Optional[str]
+    tags: List[str]
+    verified: Optional[bool]  # None: infer from domain
+    fallback: str
+    ttl_s: Optional[float] = None  # None: _TTL_SECONDS
+
+
+_SOURCES: Tuple[GovSource, ...] = (
+    GovSource("aicte", 'https://internship.aicte-india.org/', 'AICTE Internship Portal', 'AICTE', 'India / Remote', 'All',
+              None, ['aicte', 'national'], True,
+              'AICTE Internship portal with government-backed internships.'),
+    GovSource("ncs", 'https://www.ncs.gov.in/', 'NCS Internship Listings', 'National Career Service', 'India', 'All',
+              None, ['ncs', 'government'], True,
+              'National Career Service portal; search for internships in government programs.'),
+    GovSource("mygov", 'https://innovateindia.mygov.in/internship/', 'MyGov Internship', 'MyGov / MeitY', 'New Delhi / Remote', 'All',
+              'Role-dependent', ['mygov', 'digital'], True,
+              'MyGov Internship — opportunities on Digital India initiatives.'),
+    GovSource("drdo", 'https://www.drdo.gov.in/internship', 'DRDO Internship Program', 'DRDO', 'Across India', 'All',
+              'Role-dependent', ['drdo', 'defence', 'research'], None,
+              'DRDO Internship Program — research and engineering opportunities across labs.'),
+    GovSource("niti", 'https://www.niti.gov.in/internship', 'NITI Aayog Internship', 'NITI Aayog', 'New Delhi / Remote', 'All',
+              'Unpaid / As per policy', ['niti', 'policy', 'research'], None,
+              'NITI Aayog Internship — policy and research-focused internships.'),
+    GovSource("mahaswayam", 'https://mahaswayam.gov.in/', 'MahaSwayam (Maharashtra)', 'Govt. of Maharashtra', 'Maharashtra, India', 'Maharashtra',
+              None, ['maharashtra', 'state', 'portal'], None,
+              "MahaSwayam — Maharashtra Government's unified portal for jobs and internships."),
+    # Phase 2 sources (PSUs / state portals)
+    GovSource("bis", 'https://www.bis.gov.in/careers/', 'BIS Careers & Internships', 'Bureau of Indian Standards', 'India', 'All',
+              None, ['bis', 'psu'], None,
+              'Bureau of Indian Standards (BIS) careers and internships.'),
+    GovSource("isro", 'https://www.isro.gov.in/Careers.html', 'ISRO Careers & Internships', 'ISRO', 'India', 'All',
+              None, ['isro', 'space', 'research'], None,
+              'ISRO Careers — research internships and opportunities.'),
+    GovSource("iocl", 'https://iocl.com/careers', 'IOCL Careers', 'Indian Oil Corporation', 'India', 'All',
+              None, ['iocl', 'psu'], None,
+              'Indian Oil (IOCL) — careers and internships.'),
+    GovSource("ongc", 'https://ongcindia.com/', 'ONGC Careers', 'ONGC', 'India', 'All',
+              None, ['ongc', 'psu'], None,
+              'ONGC — careers and internships.'),
+    GovSource("barc", 'https://www.barc.gov.in/careers/', 'BARC Careers', 'BARC', 'India', 'All',
+              None, ['barc', 'research', 'psu'], None,
+              'BARC — internships and research opportunities.'),
+    GovSource("nats", 'https://www.mhrdnats.gov.in/', 'NATS (Apprenticeships)', 'MHRD NATS', 'India', 'All',
+              None, ['nats', 'apprenticeship'], None,
+              'NATS — National Apprenticeship Training Scheme portal.'),
+    GovSource("sebi", 'https://www.sebi.gov.in/', 'SEBI Careers', 'SEBI', 'India', 'All',
+              None, ['sebi', 'regulator'], None,
+              'SEBI — careers, internships, and notices.'),
+    GovSource("tn_naanmudhalvan", 'https://www.naanmudhalvan.tn.gov.in/', 'Naan Mudhalvan (TN)', 'Govt. of Tamil Nadu', 'Tamil Nadu, India', 'Tamil Nadu',
+              None, ['tamil nadu', 'state'], None,
+              'Tamil Nadu — Naan Mudhalvan opportunities portal.'),
+)
+
+
+def _source_item(src: GovSource, title: str = "", desc: str = "") -> Dict[str, Any]:
+    return _normalize(
+        title=src.title,
+        company=src.company,
+        location=src.location,
+        state=src.state,
+        stipend=src.stipend,
+        apply_url=src.url,
+        description=desc or title or src.fallback,
+        tags=list(src.tags),
+        verified=src.verified,
+    )
+
+
+async def _fetch_source(src: GovSource, timeout: float) -> Tuple[List[Dict[str, Any]], str, float]:
+    """(items, status, ms) for one portal; never raises.
+
+    status: "ok" (page meta used), "fallback" (page gave nothing), "timeout" or "error".
+    The static listing is returned in every case, so a dead portal still shows up.
+    """
+    started = time.perf_counter()
+    title = desc = ""
     try:
-        with open(_MOD_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            _MOD_DECISIONS["approved"] = set(data.get("approved", []))
-            _MOD_DECISIONS["flagged"] = set(data.get("flagged", []))
+        with _GOV_SECONDS.time(source=src.name):
+            title, desc = await asyncio.wait_for(_page_meta_async(src.url, timeout=timeout), timeout)
+        status = "ok" if title or desc else "fallback"
+    except asyncio.TimeoutError:
+        status = "timeout"
     except Exception:
-        _MOD_DECISIONS["approved"] = set()
-        _MOD_DECISIONS["flagged"] = set()
+        status = "error"
+    return [_source_item(src, title, desc)], status, round((time.perf_counter() - started) * 1000, 1)
+
+
+async def _fan_out(
+    sources: Sequence[GovSource], deadline_s: float, timeout_s: float
+) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Fetch all sources concurrently, bounded by one global deadline.
+
+    Sources still running at the deadline are cancelled and contribute their
+    static listing with status "timeout". Returns (items, {source: {"status", "ms"}}).
+    """
+    started = time.perf_counter()
+    tasks = {asyncio.ensure_future(_fetch_source(src, min(timeout_s, deadline_s))): src for src in sources}
+    done: set = set()
+    if tasks:
+        done, pending = await asyncio.wait(tasks, timeout=deadline_s)
+        for t in pending:
+            t.cancel()
+    cut_ms = round((time.perf_counter() - started) * 1000, 1)
+    items: List[Dict[str, Any]] = []
+    statuses: Dict[str, Dict[str, Any]] = {}
+    for task, src in tasks.items():
+        if task in done:
+            got, status, ms = task.result()
+        else:
+            got, status, ms = [_source_item(src)], "timeout", cut_ms
+        for it in got:
+            it["feed_source"] = src.name
+            it["source_status"] = status
+        items.extend(got)
+        statuses[src.name] = {"status": status, "ms": ms}
+    return items, statuses
+
+
+def _seed_item(it: Dict[str, Any]) -> Dict[str, Any]:
+    norm = _normalize(
+        title=it.get("title") or "Internship",
+        company=it.get("org") or it.get("department") or "Government",
+        location=it.get("location") or (it.get("state") or "India"),
+        state=it.get("state"),
+        stipend=it.get("stipend"),
+        apply_url=it.get("apply_url") or it.get("url"),
+        description=it.get("description") or "",
+        tags=(it.get("tags") or []),
+        verified=bool(it.get("verified", True)),
+    )
+    # keep is_new if present
+    norm["is_new"] = it.get("is_new", False)
+    return norm
+
+
+# Seed file, normalized once and re-read only when it changes on disk
+_SEED = SeedFeed(_FEED_FILE, _seed_item)
 
 
-def _save_mod():
-    try:
-        with _MOD_LOCK:
-            os.makedirs(os.path.dirname(_MOD_FILE), exist_ok=True)
-            with open(_MOD_FILE, "w", encoding="utf-8") as f:
-                json.dump({
-                    "approved": sorted(list(_MOD_DECISIONS["approved"])),
-                    "flagged": sorted(list(_MOD_DECISIONS["flagged"]))
-                }, f, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
+# --- Trust scoring & Moderation ---
+_MOD_FILE = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "data", "gov_moderation.json"))
+_MOD = moderation_store(_MOD_FILE)
 
 
 def _trust_score(url: Optional[str], title: Optional[str], desc: Optional[str]) -> float:
@@ -498,107 +377,149 @@ def _dedup(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return out
 
 
-def _aggregate_live() -> List[Dict[str, Any]]:
-    # Combine live fetchers with seed file
+# name -> {"items", "status", "ms", "fetched_at", "expires_at"}; only touched by the refresh worker
+_SOURCE_CACHE: Dict[str, Dict[str, Any]] = {}
+# One worker + one flight key: however many requests find the cache expired, one aggregation runs
+_REFRESH_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gov-refresh")
+_REFRESH_FLIGHTS = SingleFlight(_REFRESH_EXECUTOR, name="gov-refresh")
+_REFRESH_STATS: Dict[str, Any] = {"rounds": 0, "last_at": 0.0, "last_ms": 0.0, "last_fetched": []}
+_REFRESH_STOP = threading.Event()
+_REFRESH_THREAD: Optional[threading.Thread] = None
+
+
+def _source_ttl(src: GovSource, status: str) -> float:
+    ttl = _SOURCE_TTLS.get(src.name, src.ttl_s or _TTL_SECONDS)
+    return ttl if status in {"ok", "fallback"} else min(ttl, _PARTIAL_TTL_S)
+
+
+def _refresh_due_at(entry: Dict[str, Any]) -> float:
+    return entry["fetched_at"] + (entry["expires_at"] - entry["fetched_at"]) * _REFRESH_AT
+
+
+def _due_sources(now: float, force: bool = False) -> List[GovSource]:
+    if force:
+        return list(_SOURCES)
+    return [src for src in _SOURCES if src.name not in _SOURCE_CACHE or now >= _refresh_due_at(_SOURCE_CACHE[src.name])]
+
+
+def _aggregate_live(
+    force: bool = False, deadline_s: Optional[float] = None, timeout_s: Optional[float] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Combine live portals with the seed file; returns (items, per-source status).
+
+    Only sources that are due (or all, with force) are fetched, concurrently;
+    the others are served from their own cache entry.
+    """
+    now = time.time()
+    due = _due_sources(now, force)
+    if due:
+        fetched, fetch_status = run_sync(_fan_out(
+            due,
+            _DEADLINE_S if deadline_s is None else deadline_s,
+            _SOURCE_TIMEOUT_S if timeout_s is None else timeout_s,
+        ))
+        by_source: Dict[str, List[Dict[str, Any]]] = {}
+        for it in fetched:
+            by_source.setdefault(it.get("feed_source"), []).append(it)
+        for src in due:
+            st = fetch_status[src.name]
+            _SOURCE_CACHE[src.name] = {
+                "items": by_source.get(src.name, []),
+                "status": st["status"],
+                "ms": st["ms"],
+                "fetched_at": now,
+                "expires_at": now + _source_ttl(src, st["status"]),
+            }
     items: List[Dict[str, Any]] = []
-    try:
-        items.extend(_fetch_aicte())
-    except Exception:
-        pass
-    try:
-        items.extend(_fetch_ncs())
-    except Exception:
-        pass
-    try:
-        items.extend(_fetch_mygov())
-    except Exception:
-        pass
-    try:
-        items.extend(_fetch_drdo())
-    except Exception:
-        pass
-    try:
-        items.extend(_fetch_niti())
-    except Exception:
-        pass
-    try:
-        items.extend(_fetch_mahaswayam())
-    except Exception:
-        pass
-    # Phase 2 sources
-    for f in (_fetch_bis, _fetch_isro, _fetch_iocl, _fetch_ongc, _fetch_barc, _fetch_nats, _fetch_sebi, _fetch_tn_naanmudhalvan):
-        try:
-            items.extend(f())
-        except Exception:
-            pass
+    for src in _SOURCES:
+        items.extend(_SOURCE_CACHE.get(src.name, {}).get("items", []))
+    statuses = {name: {k: v for k, v in e.items() if k != "items"} for name, e in _SOURCE_CACHE.items()}
 
     # Bring in seeded examples as well (acts as fallback + examples)
-    try:
-        for it in _load_feed():
-            items.append(
-                _normalize(
-                    title=it.get("title") or "Internship",
-                    company=it.get("org") or it.get("department") or "Government",
-                    location=it.get("location") or (it.get("state") or "India"),
-                    state=it.get("state"),
-                    stipend=it.get("stipend"),
-                    apply_url=it.get("apply_url") or it.get("url"),
-                    description=it.get("description") or "",
-                    tags=(it.get("tags") or []),
-                    verified=bool(it.get("verified", True)),
-                )
-            )
-    except Exception:
-        pass
-
-    items = _dedup(items)
-    # Score already computed in _normalize; sort here
-    items.sort(key=lambda x: (x.get("score") or 0), reverse=True)
+    with _GOV_SECONDS.time(source="seed"):
+        items.extend(_SEED.items())
+
+    with _GOV_SECONDS.time(source="dedup"):
+        items = _dedup(items)
+        # Score already computed in _normalize; sort here
+        items.sort(key=lambda x: (x.get("score") or 0), reverse=True)
+    return items, statuses
+
+
+def _is_complete(statuses: Dict[str, Dict[str, Any]]) -> bool:
+    return all(s.get("status") in {"ok", "fallback"} for s in statuses.values())
+
+
+def _refresh(force: bool = False) -> List[Dict[str, Any]]:
+    """Re-aggregate and publish to _CACHE. Runs on the refresh worker only (see _REFRESH_FLIGHTS)."""
+    started = time.perf_counter()
+    due = [src.name for src in _due_sources(time.time(), force)]
+    items, statuses = _aggregate_live(force=force)
+    _CACHE.update(
+        items=items,
+        sources=statuses,
+        complete=_is_complete(statuses),
+        ts=time.time(),
+        expires_at=min((st["expires_at"] for st in statuses.values()), default=0.0),
+    )
+    _REFRESH_STATS.update(
+        rounds=_REFRESH_STATS["rounds"] + 1,
+        last_at=_CACHE["ts"],
+        last_ms=round((time.perf_counter() - started) * 1000, 1),
+        last_fetched=due,
+    )
     return items
 
 
 def _get_cached_items(force: bool = False) -> List[Dict[str, Any]]:
-    now = time.time()
-    if not force and _CACHE.get("items") and now - float(_CACHE.get("ts", 0.0)) < _TTL_SECONDS:
+    """Current items. An expired cache is served as-is while one background refresh runs;
+    only an empty cache or force waits, and concurrent waiters share that one aggregation."""
+    if not force and _CACHE.get("items"):
+        if time.time() >= float(_CACHE.get("expires_at", 0.0)):
+            _REFRESH_FLIGHTS.submit("gov", _refresh)
         return list(_CACHE["items"])  # shallow copy
-    items = _aggregate_live()
-    _CACHE["items"] = items
-    _CACHE["ts"] = now
-    return list(items)
+    # A forced refresh must not join a normal one already in flight (it may skip sources
+    # that are not yet due); its own key queues it behind that one on the single worker.
+    return list(_REFRESH_FLIGHTS.submit("gov:force" if force else "gov", _refresh, force).result())
+
+
+def _next_refresh_in(now: float) -> float:
+    if any(src.name not in _SOURCE_CACHE for src in _SOURCES):
+        return 0.0
+    return max(0.0, min(_refresh_due_at(e) for e in _SOURCE_CACHE.values()) - now)
+
+
+def _refresh_loop() -> None:
+    while not _REFRESH_STOP.is_set():
+        try:
+            _REFRESH_FLIGHTS.submit("gov", _refresh).result()
+        except Exception:
+            pass
+        _REFRESH_STOP.wait(min(max(_REFRESH_MIN_GAP_S, _next_refresh_in(time.time())), 3600.0))
+
+
+def start_background_refresh() -> None:
+    """Keep the live cache warm from a daemon thread (started from the app lifespan)."""
+    global _REFRESH_THREAD
+    if _REFRESH_THREAD is not None and _REFRESH_THREAD.is_alive():
+        return
+    _REFRESH_STOP.clear()
+    _REFRESH_THREAD = threading.Thread(target=_refresh_loop, name="gov-refresh-loop", daemon=True)
+    _REFRESH_THREAD.start()
+
+
+def stop_background_refresh(timeout: float = 5.0) -> None:
+    global _REFRESH_THREAD
+    _REFRESH_STOP.set()
+    if _REFRESH_THREAD is not None:
+        _REFRESH_THREAD.join(timeout)
+        _REFRESH_THREAD = None
 
 
 @router.post("/feeds")
 def get_gov_feeds(f: GovFilter) -> Dict[str, Any]:
-    # Default endpoint keeps previous seed behavior but uses normalized path for consistency
-    base_items: List[Dict[str, Any]] = []
-    for it in _load_feed():
-        norm = _normalize(
-            title=it.get("title") or "Internship",
-            company=it.get("org") or it.get("department") or "Government",
-            location=it.get("location") or (it.get("state") or "India"),
-            state=it.get("state"),
-            stipend=it.get("stipend"),
-            apply_url=it.get("apply_url") or it.get("url"),
-            description=it.get("description") or "",
-            tags=(it.get("tags") or []),
-            verified=bool(it.get("verified", True)),
-        )
-        # keep is_new if present
-        norm["is_new"] = it.get("is_new", False)
-        base_items.append(norm)
-
-    # Filtering
-    out: List[Dict[str, Any]] = []
-    for it in base_items:
-        if f.only_verified and not it.get("verified"):
-            continue
-        if f.state and f.state.strip() and f.state.lower() not in (it.get("location", "").lower() + " " + (it.get("description", "").lower())):
-            continue
-        out.append(it)
-
-    # Sort + limit
-    out.sort(key=lambda x: (x.get("score") or 0), reverse=True)
-    out = out[: f.limit]
+    # Default endpoint keeps previous seed behavior; items come pre-normalized and score-sorted
+    out = _SEED.items(state=f.state, only_verified=f.only_verified)[: f.limit]
     return {"results": out, "count": len(out)}
 
 
@@ -624,15 +545,35 @@ def get_gov_feeds_live(f: GovFilter, force: bool = Query(False, description="Byp
 
     out.sort(key=lambda x: (x.get("score") or 0), reverse=True)
     out = out[: f.limit]
-    return {"results": out, "count": len(out), "cached_at": _CACHE.get("ts", 0.0)}
+    return {
+        "results": out,
+        "count": len(out),
+        "cached_at": _CACHE.get("ts", 0.0),
+        "complete": _CACHE.get("complete", True),
+        "sources": _CACHE.get("sources", {}),
+    }
 
 
 @router.get("/feeds/cache-info")
 def get_cache_info() -> Dict[str, Any]:
+    now = time.time()
+    sources = {
+        name: dict(st, age_s=round(now - st["fetched_at"], 1), fresh=now < st["expires_at"])
+        for name, st in (_CACHE.get("sources") or {}).items()
+    }
     return {
         "cached_at": _CACHE.get("ts", 0.0),
         "ttl_seconds": _TTL_SECONDS,
+        "expires_at": _CACHE.get("expires_at", 0.0),
         "items": len(_CACHE.get("items", [])),
+        "complete": _CACHE.get("complete", True),
+        "refresh": {
+            "background": _REFRESH_THREAD is not None and _REFRESH_THREAD.is_alive(),
+            "inflight": _REFRESH_FLIGHTS.inflight(),
+            "next_in_s": round(_next_refresh_in(now), 1),
+            **_REFRESH_STATS,
+        },
+        "sources": sources,
     }
 
 
@@ -640,14 +581,13 @@ def get_cache_info() -> Dict[str, Any]:
 @router.get("/mod/pending")
 def list_pending_mod(threshold: float = 70.0) -> Dict[str, Any]:
     """Return low-trust items that are neither approved nor flagged."""
-    _load_mod()
     items = _get_cached_items(force=False)
     out = []
     for it in items:
         url = (it.get("apply_url") or it.get("url") or "").strip()
         if not url:
             continue
-        if url in _MOD_DECISIONS["approved"] or url in _MOD_DECISIONS["flagged"]:
+        if _MOD.decided(url):
             continue
         if float(it.get("trust_score", 0.0)) < threshold:
             out.append(it)
@@ -656,19 +596,13 @@ def list_pending_mod(threshold: float = 70.0) -> Dict[str, Any]:
 
 @router.post("/mod/approve")
 def mod_approve(act: ModAction) -> Dict[str, Any]:
-    _load_mod()
-    with _MOD_LOCK:
-        _MOD_DECISIONS["approved"].add(act.url)
-    _save_mod()
+    _MOD.approve(act.url)
     return {"ok": True}
 
 
 @router.post("/mod/flag")
 def mod_flag(act: ModAction) -> Dict[str, Any]:
-    _load_mod()
-    with _MOD_LOCK:
-        _MOD_DECISIONS["flagged"].add(act.url)
-    _save_mod()
+    _MOD.flag(act.url)
     return {"ok": True}
 
 
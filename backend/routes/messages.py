@@ -4,6 +4,8 @@ from typing import Dict, Any, Optional, List
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 
+from utils.llm_cache import get_llm_cache, llm_key
+
 router = APIRouter(prefix="/api/messages", tags=["messages"])
 
 
@@ -31,6 +33,7 @@ class MessageRequest(BaseModel):
   job: JobDesc
   mode: str = Field("cover_letter", description="'cover_letter' or 'linkedin' for connection message")
   model: Optional[str] = Field(None, description="Optional Gemini model override")
+  regenerate: bool = Field(False, description="Skip the cached message for this resume/job/mode and generate a fresh one")
 
 
 def _template_message(resume: Dict[str, Any], job: Dict[str, Any], mode: str) -> str:
@@ -57,15 +60,15 @@ def _template_message(resume: Dict[str, Any], job: Dict[str, Any], mode: str) ->
 
 
 @router.post("/cover-letter")
-def generate_message(req: MessageRequest, request: Request) -> Dict[str, Any]:
+async def generate_message(req: MessageRequest, request: Request) -> Dict[str, Any]:
   # Prefer Gemini when configured; otherwise use a clean template fallback
   try:
-    from main import _gemini_generate_content, GOOGLE_API_KEY  # type: ignore
+    from main import _gemini_generate_content_async, GOOGLE_API_KEY  # type: ignore
   except Exception:
     _gem = None
     _gkey = ""
   else:
-    _gem = _gemini_generate_content
+    _gem = _gemini_generate_content_async
     _gkey = GOOGLE_API_KEY
 
   if _gem and _gkey:
@@ -87,8 +90,14 @@ def generate_message(req: MessageRequest, request: Request) -> Dict[str, Any]:
         "Return plain text only.\n\n"
         f"Resume JSON:\n{resume}\n\nJob:\n{job}\n"
       )
+      # Same resume + job + mode + model as an earlier click: answer from the cache, no quota spent
+      cache = get_llm_cache()
+      key = llm_key("messages.cover_letter", model, resume=resume, job=job, mode=mode)
+      hit = cache.lookup(key, req.regenerate)
+      if hit:
+        return {"message": hit, "model": model, "mode": mode, "cached": True}
       payload = {"contents": [{"role": "user", "parts": [{"text": text}]}], "generationConfig": {"temperature": 0.5}}
-      raw = _gem(model, payload)
+      raw = await _gem(model, payload)
       # Extract first text block
       msg: Optional[str] = None
       try:
@@ -100,7 +109,8 @@ def generate_message(req: MessageRequest, request: Request) -> Dict[str, Any]:
       except Exception:
         msg = None
       if msg:
-        return {"message": msg, "model": model, "mode": mode}
+        cache.put(key, msg)
+        return {"message": msg, "model": model, "mode": mode, "cached": False}
     except Exception as e:
       # fall through to template fallback
       pass
@@ -5,12 +5,15 @@ from fastapi import APIRouter, Request
 from pydantic import BaseModel
 import json
 
+from utils.llm_cache import get_llm_cache, llm_key
+
 router = APIRouter(prefix="/api/mock-interview", tags=["mock-interview"])
 
 
 class StartRequest(BaseModel):
     focus: Optional[str] = None  # e.g., "software", "data"
     count: Optional[int] = 5
+    regenerate: bool = False  # skip cached questions for this resume and ask for a fresh set
 
 
 def _default_questions() -> List[str]:
@@ -23,9 +26,9 @@ def _default_questions() -> List[str]:
     ]
 
 
-def _gemini_questions(resume_text: str, roles: List[str], skills: List[str], count: int, focus: Optional[str]) -> Optional[List[str]]:
+async def _gemini_questions(resume_text: str, roles: List[str], skills: List[str], count: int, focus: Optional[str], regenerate: bool = False) -> Optional[List[str]]:
     try:
-        from main import _gemini_generate_content, GOOGLE_API_KEY  # type: ignore
+        from main import _gemini_generate_content_async, GOOGLE_API_KEY  # type: ignore
     except Exception:
         return None
     if not GOOGLE_API_KEY:
@@ -48,8 +51,13 @@ def _gemini_questions(resume_text: str, roles: List[str], skills: List[str], cou
         "contents": [{"role": "user", "parts": [{"text": prompt}]}],
         "generationConfig": {"temperature": 0.4, "maxOutputTokens": 600},
     }
+    cache = get_llm_cache()
+    key = llm_key("mock_interview.start", "gemini-2.5-flash", resume=r_text, roles=roles_l, skills=skills_l, count=count, focus=focus)
+    hit = cache.lookup(key, regenerate)
+    if hit:
+        return hit
     try:
-        raw = _gemini_generate_content("gemini-2.5-flash", payload)
+        raw = await _gemini_generate_content_async("gemini-2.5-flash", payload)
         text = None
         try:
             cands = (raw or {}).get("candidates") or []
@@ -78,6 +86,7 @@ def _gemini_questions(resume_text: str, roles: List[str], skills: List[str], cou
             for s in reversed(seed):
                 if not out or out[0].lower() != s.lower():
                     out.insert(0, s)
+            cache.put(key, out[:count])
             return out[:count]
         return None
     except Exception:
@@ -85,7 +94,7 @@ def _gemini_questions(resume_text: str, roles: List[str], skills: List[str], cou
 
 
 @router.post("/start")
-def start(req: StartRequest, request: Request):
+async def start(req: StartRequest, request: Request):
     # Pull resume from session
     resume_text = ""
     roles: List[str] = []
@@ -100,7 +109,7 @@ def start(req: StartRequest, request: Request):
     except Exception:
         pass
 
-    qs = _gemini_questions(resume_text, roles, skills, req.count or 5, req.focus)
+    qs = await _gemini_questions(resume_text, roles, skills, req.count or 5, req.focus, req.regenerate)
     if not qs:
         qs = _default_questions()[: (req.count or 5)]
 
@@ -114,10 +123,10 @@ class FollowupRequest(BaseModel):
 
 
 @router.post("/followup")
-def followup(req: FollowupRequest, request: Request):
+async def followup(req: FollowupRequest, request: Request):
     # Use Gemini to produce a short follow-up question and one-paragraph feedback
     try:
-        from main import _gemini_generate_content, GOOGLE_API_KEY  # type: ignore
+        from main import _gemini_generate_content_async, GOOGLE_API_KEY  # type: ignore
         if not GOOGLE_API_KEY:
             raise RuntimeError("no key")
     except Exception:
@@ -137,7 +146,7 @@ def followup(req: FollowupRequest, request: Request):
     )
     payload = {"contents": [{"role": "user", "parts": [{"text": prompt}]}], "generationConfig": {"temperature": 0.5, "maxOutputTokens": 500}}
     try:
-        raw = _gemini_generate_content("gemini-2.5-flash", payload)
+        raw = await _gemini_generate_content_async("gemini-2.5-flash", payload)
         text = None
         try:
             cands = (raw or {}).get("candidates") or []
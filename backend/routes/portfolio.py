@@ -6,8 +6,11 @@ from typing import Any, Dict, List, Optional
 import json
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 
+from utils.llm_cache import get_llm_cache, llm_key
+
 router = APIRouter(prefix="/api/portfolio", tags=["portfolio"])
 
 
@@ -31,6 +34,7 @@ class PortfolioRequest(BaseModel):
     ai: Optional[bool] = True  # when True and Gemini is configured, enrich content
     model: Optional[str] = None  # optional Gemini model override
     full_site_ai: Optional[bool] = False  # when True, ask Gemini to output complete site HTML/CSS
+    regenerate: bool = False  # skip the cached AI enrichment for this resume and generate it again
 
 
 def _html_escape(x: Optional[str]) -> str:
@@ -286,7 +290,7 @@ This is a simple static portfolio site generated from your resume.
     return buf.read()
 
 
-def _enrich_with_ai(resume: Dict[str, Any], model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+async def _enrich_with_ai(resume: Dict[str, Any], model: Optional[str] = None, regenerate: bool = False) -> Optional[Dict[str, Any]]:
     """Use backend Gemini proxy (if configured) to enrich resume into nicer portfolio sections.
 
     Returns a dict like:
@@ -299,7 +303,7 @@ def _enrich_with_ai(resume: Dict[str, Any], model: Optional[str] = None) -> Opti
     or None on failure.
     """
     try:
-        from main import _gemini_generate_content, GOOGLE_API_KEY  # type: ignore
+        from main import _gemini_generate_content_async, GOOGLE_API_KEY  # type: ignore
     except Exception:
         return None
     if not GOOGLE_API_KEY:
@@ -323,8 +327,14 @@ def _enrich_with_ai(resume: Dict[str, Any], model: Optional[str] = None) -> Opti
         "contents": [{"role": "user", "parts": [{"text": prompt}]}],
         "generationConfig": {"temperature": 0.5, "maxOutputTokens": 600}
     }
+    # Unchanged resume since the last generate: reuse its enrichment
+    cache = get_llm_cache()
+    key = llm_key("portfolio.enrich", model or "gemini-2.5-flash", resume=rj)
+    hit = cache.lookup(key, regenerate)
+    if hit:
+        return hit
     try:
-        raw = _gemini_generate_content(model or "gemini-2.5-flash", payload)
+        raw = await _gemini_generate_content_async(model or "gemini-2.5-flash", payload)
         # Extract first text candidate
         text = None
         try:
@@ -362,13 +372,14 @@ def _enrich_with_ai(resume: Dict[str, Any], model: Optional[str] = None) -> Opti
             for k in ("skills", "projects", "experience"):
                 if k in data and not isinstance(data[k], list):
                     data[k] = [data[k]] if data[k] else []
+            cache.put(key, data)
             return data
         return None
     except Exception:
         return None
 
 
-def _ai_generate_full_site(resume: Dict[str, Any], model: Optional[str] = None) -> Optional[Dict[str, str]]:
+async def _ai_generate_full_site(resume: Dict[str, Any], model: Optional[str] = None) -> Optional[Dict[str, str]]:
     """Ask Gemini (via backend proxy) to produce a minimal but complete portfolio site.
 
     Expected JSON response shape (strict):
@@ -376,7 +387,7 @@ def _ai_generate_full_site(resume: Dict[str, Any], model: Optional[str] = None)
     Returns None on failure.
     """
     try:
-        from main import _gemini_generate_content, GOOGLE_API_KEY  # type: ignore
+        from main import _gemini_generate_content_async, GOOGLE_API_KEY  # type: ignore
     except Exception:
         return None
     if not GOOGLE_API_KEY:
@@ -407,7 +418,7 @@ def _ai_generate_full_site(resume: Dict[str, Any], model: Optional[str] = None)
         "generationConfig": {"temperature": 0.4, "maxOutputTokens": 2500}
     }
     try:
-        raw = _gemini_generate_content(model or "gemini-2.5-pro-exp-02-05", payload)
+        raw = await _gemini_generate_content_async(model or "gemini-2.5-pro-exp-02-05", payload)
         text = None
         try:
             cands = (raw or {}).get("candidates") or []
@@ -449,7 +460,7 @@ def _ai_generate_full_site(resume: Dict[str, Any], model: Optional[str] = None)
 
 
 @router.post("/generate")
-def generate_portfolio(req: PortfolioRequest, request: Request):
+async def generate_portfolio(req: PortfolioRequest, request: Request):
     resume = req.resume.model_dump() if req.resume else None
     # Session fallback if resume payload missing
     if not resume:
@@ -483,7 +494,7 @@ def generate_portfolio(req: PortfolioRequest, request: Request):
     try:
         # Optional: full-site generation via Gemini
         if req.full_site_ai:
-            ai_site = _ai_generate_full_site(resume or {}, model=(req.model or None))
+            ai_site = await _ai_generate_full_site(resume or {}, model=(req.model or None))
             if ai_site and isinstance(ai_site.get("index_html"), str) and isinstance(ai_site.get("styles_css"), str):
                 buf = io.BytesIO()
                 with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED) as z:
@@ -499,12 +510,12 @@ def generate_portfolio(req: PortfolioRequest, request: Request):
                 data = buf.read()
             else:
                 # Fallback to templated builder
-                enriched = _enrich_with_ai(resume or {}, model=(req.model or None)) if req.ai else None
-                data = _build_site(resume or {}, include_vercel=req.include_vercel, enriched=enriched)
+                enriched = await _enrich_with_ai(resume or {}, model=(req.model or None), regenerate=req.regenerate) if req.ai else None
+                data = await run_in_threadpool(_build_site, resume or {}, include_vercel=req.include_vercel, enriched=enriched)
         else:
             # Legacy path: template with optional enrichment
-            enriched = _enrich_with_ai(resume or {}, model=(req.model or None)) if req.ai else None
-            data = _build_site(resume or {}, include_vercel=req.include_vercel, enriched=enriched)
+            enriched = await _enrich_with_ai(resume or {}, model=(req.model or None), regenerate=req.regenerate) if req.ai else None
+            data = await run_in_threadpool(_build_site, resume or {}, include_vercel=req.include_vercel, enriched=enriched)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate: {e}")
 
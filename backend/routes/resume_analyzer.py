@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
+from utils.llm_cache import get_llm_cache, llm_key
+
 try:
     from utils.resume_analyzer import analyze_resume_vs_jobs
 except Exception as e:  # pragma: no cover
@@ -32,10 +35,11 @@ class AnalyzeRequest(BaseModel):
     top_missing: int = 8
     use_ai: bool = Field(True, description="If true and Gemini is configured, include AI suggestions (weak points, grammar fixes)")
     ai_model: Optional[str] = Field(None, description="Override Gemini model used for AI suggestions (default: gemini-2.5-flash)")
+    regenerate: bool = Field(False, description="Skip cached AI suggestions for this resume/jobs and generate fresh ones")
 
 
 @router.post("/resume-vs-jobs")
-def analyze(req: AnalyzeRequest, request: Request) -> Dict[str, Any]:
+async def analyze(req: AnalyzeRequest, request: Request) -> Dict[str, Any]:
     if _IMPORT_ERR:
         raise HTTPException(status_code=500, detail=f"analyzer unavailable: {_IMPORT_ERR}")
 
@@ -59,18 +63,19 @@ def analyze(req: AnalyzeRequest, request: Request) -> Dict[str, Any]:
         raise HTTPException(status_code=400, detail="resume_text is empty and no session resume found")
 
     jobs = [j.dict() for j in req.jobs]
-    result = analyze_resume_vs_jobs(text, skills, jobs, top_job_keywords=req.top_job_keywords, top_missing=req.top_missing)  # type: ignore
+    # Keyword analysis is CPU work; keep it off the event loop
+    result = await run_in_threadpool(analyze_resume_vs_jobs, text, skills, jobs, top_job_keywords=req.top_job_keywords, top_missing=req.top_missing)  # type: ignore
 
     # Optionally enhance with AI suggestions via Gemini if configured
     if req.use_ai:
         try:
             # Lazy import to avoid circulars on app startup
-            from main import _gemini_generate_content, GOOGLE_API_KEY  # type: ignore
+            from main import _gemini_generate_content_async, GOOGLE_API_KEY  # type: ignore
         except Exception:
             _gem = None
             _gkey = ""
         else:
-            _gem = _gemini_generate_content
+            _gem = _gemini_generate_content_async
             _gkey = GOOGLE_API_KEY
 
         if _gem and _gkey:
@@ -101,8 +106,14 @@ def analyze(req: AnalyzeRequest, request: Request) -> Dict[str, Any]:
                 }
 
                 model = (req.ai_model or "gemini-2.5-flash").strip()
+                cache = get_llm_cache()
+                key = llm_key("analyze.resume_vs_jobs", model, resume=text[:6000], jobs=top_jobs)
+                hit = cache.lookup(key, req.regenerate)
+                if hit:
+                    result["ai"] = dict(hit, cached=True)
+                    return result
                 payload = {"contents": [prompt], "generationConfig": {"temperature": 0.3}}
-                raw = _gem(model, payload)  # raw Google response JSON
+                raw = await _gem(model, payload)  # raw Google response JSON
                 # Extract text parts and parse JSON
                 ai_text: Optional[str] = None
                 try:
@@ -136,6 +147,7 @@ def analyze(req: AnalyzeRequest, request: Request) -> Dict[str, Any]:
                         "weak_points": ai_json.get("weak_points") or [],
                         "grammar_fixes": ai_json.get("grammar_fixes") or [],
                     }
+                    cache.put(key, result["ai"])
                 else:
                     # Provide raw text when parsing fails for transparency
                     result["ai"] = {"model": model, "raw": ai_text or ""}
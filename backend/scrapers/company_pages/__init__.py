@@ -4,17 +4,22 @@ Company career pages scrapers (modular).
 Exports:
 - scrape_company_careers(url: str, limit: int = 50) -> List[Dict]
 - scrape_multiple(urls: List[str], limit_per_site: int = 50) -> Tuple[List[Dict], List[Dict]]
+- scrape_company_careers_async / scrape_multiple_async: coroutine variants for the scrape engine
+- careers_request_host(url) -> str: host the scrape of url fetches first (e.g. the ATS API host)
 
 Design:
-- BaseScraper interface with can_handle + scrape
+- BaseScraper interface with can_handle + scrape_async (scrape is a blocking wrapper)
 - Concrete handlers for common ATS providers (Lever, Greenhouse)
 - GenericHTMLScraper fallback for simple listings pages
 
 All scrapers must be resilient: short timeouts, retries where reasonable, and
 return an empty list rather than raising.
 """
+import asyncio
 from typing import List, Dict, Tuple
 
+from scrapers.engine import run_sync
+
 from .base import BaseScraper
 from .lever import LeverScraper
 from .greenhouse import GreenhouseScraper
@@ -46,8 +51,16 @@ def scrape_company_careers(url: str, limit: int = 50) -> List[Dict]:
 
     Returns a list of dictionaries with keys: title, location, apply_url, description, company?, source
     """
+    return run_sync(scrape_company_careers_async(url, limit=limit))
+
+
+async def scrape_company_careers_async(url: str, limit: int = 50) -> List[Dict]:
     scraper = _pick_scraper(url)
-    return scraper.scrape(url, limit=limit)
+    return await scraper.scrape_async(url, limit=limit)
+
+
+def careers_request_host(url: str) -> str:
+    return _pick_scraper(url).request_host(url)
 
 
 def scrape_multiple(urls: List[str], limit_per_site: int = 50) -> Tuple[List[Dict], List[Dict]]:
@@ -55,17 +68,26 @@ def scrape_multiple(urls: List[str], limit_per_site: int = 50) -> Tuple[List[Dic
 
     Returns (results, errors) where errors are dicts: {url, error}
     """
+    return run_sync(scrape_multiple_async(urls, limit_per_site=limit_per_site))
+
+
+async def scrape_multiple_async(urls: List[str], limit_per_site: int = 50) -> Tuple[List[Dict], List[Dict]]:
+    # Sites are fetched concurrently; results keep the input URL order
+    outcomes = await asyncio.gather(
+        *(scrape_company_careers_async(u, limit=limit_per_site) for u in urls),
+        return_exceptions=True,
+    )
     all_items: List[Dict] = []
     errors: List[Dict] = []
-    for u in urls:
-        try:
-            items = scrape_company_careers(u, limit=limit_per_site)
-            for it in items:
-                it.setdefault("source", "company-careers")
-                it.setdefault("apply_url", it.get("apply_url") or it.get("url"))
-                it.setdefault("location", it.get("location") or "")
-            all_items.extend(items)
-        except Exception as e:  # pragma: no cover - safety net
-            errors.append({"url": u, "error": str(e)})
+    for u, items in zip(urls, outcomes):
+        if isinstance(items, BaseException):  # pragma: no cover - safety net
+            if isinstance(items, asyncio.CancelledError):
+                raise items
+            errors.append({"url": u, "error": str(items)})
             continue
+        for it in items:
+            it.setdefault("source", "company-careers")
+            it.setdefault("apply_url", it.get("apply_url") or it.get("url"))
+            it.setdefault("location", it.get("location") or "")
+        all_items.extend(items)
     return all_items, errors
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from typing import List, Dict
 from abc import ABC, abstractmethod
+from urllib.parse import urlparse
+
+from scrapers.engine import run_sync
 
 
 class BaseScraper(ABC):
@@ -9,8 +12,12 @@ class BaseScraper(ABC):
 
     Contract:
     - can_handle(url) -> bool: True if this scraper can parse the URL/domain.
-    - scrape(url, limit=50) -> List[Dict]: return a list of jobs with keys:
+    - scrape_async(url, limit=50) -> List[Dict]: coroutine run on the scrape engine
+      returning a list of jobs with keys:
         title, location, apply_url, description, company(optional), posted(optional)
+    - scrape(url, limit=50): blocking wrapper around scrape_async.
+    - request_host(url) -> str: host scrape_async fetches first (its API host
+      when it has one); pre-warming meters its budget on it.
     """
 
     @abstractmethod
@@ -18,5 +25,11 @@ class BaseScraper(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def scrape(self, url: str, limit: int = 50) -> List[Dict]:
+    async def scrape_async(self, url: str, limit: int = 50) -> List[Dict]:
         raise NotImplementedError
+
+    def request_host(self, url: str) -> str:
+        return (urlparse(url).hostname or "").lower()
+
+    def scrape(self, url: str, limit: int = 50) -> List[Dict]:
+        return run_sync(self.scrape_async(url, limit=limit))
@@ -1,10 +1,12 @@
+import asyncio
 from typing import List, Dict
 import re
 
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse, urljoin
 
+from scrapers.engine import fetch
+from utils.html_parsing import make_soup
+
 from .base import BaseScraper
 
 
@@ -29,12 +31,12 @@ class GenericHTMLScraper(BaseScraper):
         # Always true as a fallback
         return True
 
-    def scrape(self, url: str, limit: int = 50) -> List[Dict]:
+    async def scrape_async(self, url: str, limit: int = 50) -> List[Dict]:
         items: List[Dict] = []
         try:
-            r = requests.get(url, headers=self._HEADERS, timeout=12)
+            r = await fetch(url, headers=self._HEADERS)
             r.raise_for_status()
-            soup = BeautifulSoup(r.content, "html.parser")
+            soup = await asyncio.to_thread(make_soup, r.content)
             anchors = soup.select("a[href]")
             for a in anchors:
                 text = a.get_text(" ", strip=True)
@@ -1,8 +1,10 @@
+import asyncio
+import json
 import re
 from typing import List, Dict
 
-import requests
-from bs4 import BeautifulSoup
+from scrapers.engine import fetch, parse_cached
+from utils.html_parsing import html_to_text, make_soup
 
 from .base import BaseScraper
 
@@ -33,7 +35,10 @@ class GreenhouseScraper(BaseScraper):
             return f"https://boards-api.greenhouse.io/v1/boards/{company}/jobs"
         return None
 
-    def scrape(self, url: str, limit: int = 50) -> List[Dict]:
+    def request_host(self, url: str) -> str:
+        return super().request_host(self._guess_api(url) or url)
+
+    async def scrape_async(self, url: str, limit: int = 50) -> List[Dict]:
         items: List[Dict] = []
         api = self._guess_api(url)
         # Company slug from URL for fallback
@@ -44,9 +49,9 @@ class GreenhouseScraper(BaseScraper):
         # 1) Public API
         if api:
             try:
-                resp = requests.get(api, headers=self._HEADERS, timeout=12)
-                if resp.ok:
-                    data = resp.json() or {}
+                resp = await fetch(api, headers=self._HEADERS)
+                if resp.is_success:
+                    data = await parse_cached(resp, "json", json.loads) or {}
                     jobs = data.get("jobs", [])
                     count = 0
                     for d in jobs:
@@ -77,9 +82,9 @@ class GreenhouseScraper(BaseScraper):
 
         # 2) HTML fallback
         try:
-            r = requests.get(url, headers=self._HEADERS, timeout=12)
+            r = await fetch(url, headers=self._HEADERS)
             r.raise_for_status()
-            soup = BeautifulSoup(r.content, "html.parser")
+            soup = await asyncio.to_thread(make_soup, r.content)
             postings = soup.select("section#jobs a[href*='/jobs/']") or soup.select("a[href*='greenhouse.io']")
             for a in postings[: limit * 2]:
                 href = a.get("href")
@@ -102,11 +107,10 @@ class GreenhouseScraper(BaseScraper):
 
 
 def _normalize_html(text: str) -> str:
-    from bs4 import BeautifulSoup as _BS
     try:
         t = text or ""
         if "<" in t and ">" in t:
-            return _BS(t, "html.parser").get_text(" ", strip=True)
+            return html_to_text(t)
         return t
     except Exception:
         return (text or "").strip()
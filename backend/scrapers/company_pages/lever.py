@@ -1,9 +1,13 @@
+import asyncio
+import json
 import re
 from typing import List, Dict
 
-import requests
 from bs4 import BeautifulSoup
 
+from scrapers.engine import fetch, parse_cached
+from utils.html_parsing import html_to_text, make_soup
+
 from .base import BaseScraper
 
 
@@ -37,7 +41,10 @@ class LeverScraper(BaseScraper):
             return f"https://api.lever.co/v0/postings/{company}?mode=json"
         return None
 
-    def scrape(self, url: str, limit: int = 50) -> List[Dict]:
+    def request_host(self, url: str) -> str:
+        return super().request_host(self._guess_api(url) or url)
+
+    async def scrape_async(self, url: str, limit: int = 50) -> List[Dict]:
         items: List[Dict] = []
         # Company slug fallback from URL
         company_slug = None
@@ -51,9 +58,9 @@ class LeverScraper(BaseScraper):
         api_url = self._guess_api(url)
         if api_url:
             try:
-                resp = requests.get(api_url, headers=self._HEADERS, timeout=12)
-                if resp.ok:
-                    data = resp.json()
+                resp = await fetch(api_url, headers=self._HEADERS)
+                if resp.is_success:
+                    data = await parse_cached(resp, "json", json.loads)
                     for d in data[:limit]:
                         title = d.get("text") or d.get("title") or "Internship"
                         # Filter to internships only
@@ -77,9 +84,9 @@ class LeverScraper(BaseScraper):
 
         # 2) Fallback: parse HTML listing page for links
         try:
-            r = requests.get(url, headers=self._HEADERS, timeout=12)
+            r = await fetch(url, headers=self._HEADERS)
             r.raise_for_status()
-            soup = BeautifulSoup(r.content, "html.parser")
+            soup = await asyncio.to_thread(make_soup, r.content)
             postings = soup.select(".posting, .lever, a[href*='lever.co']")
             for p in postings[: limit * 2]:
                 a = p if p.name == "a" else p.select_one("a")
@@ -119,11 +126,10 @@ def _extract_location(soup: BeautifulSoup, container) -> str | None:
 
 
 def _normalize_html(text: str) -> str:
-    from bs4 import BeautifulSoup as _BS
     try:
         t = text or ""
         if "<" in t and ">" in t:
-            return _BS(t, "html.parser").get_text(" ", strip=True)
+            return html_to_text(t)
         return t
     except Exception:
         return (text or "").strip()
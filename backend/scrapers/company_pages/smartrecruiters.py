@@ -1,7 +1,8 @@
+import json
 import re
 from typing import List, Dict
 
-import requests
+from scrapers.engine import fetch, parse_cached
 
 from .base import BaseScraper
 
@@ -32,16 +33,19 @@ class SmartRecruitersScraper(BaseScraper):
             return m.group(1)
         return None
 
-    def scrape(self, url: str, limit: int = 50) -> List[Dict]:
+    def request_host(self, url: str) -> str:
+        return "api.smartrecruiters.com" if self._guess_company(url) else super().request_host(url)
+
+    async def scrape_async(self, url: str, limit: int = 50) -> List[Dict]:
         items: List[Dict] = []
         company = self._guess_company(url)
         if not company:
             return items
         api = f"https://api.smartrecruiters.com/v1/companies/{company}/postings?released=true&limit={max(10, min(100, limit))}"
         try:
-            r = requests.get(api, headers=self._HEADERS, timeout=12)
-            if r.ok:
-                data = r.json() or {}
+            r = await fetch(api, headers=self._HEADERS)
+            if r.is_success:
+                data = await parse_cached(r, "json", json.loads) or {}
                 postings = data.get("content") or []
                 for p in postings:
                     title = (p.get("name") or "Internship").strip()
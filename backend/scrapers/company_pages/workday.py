@@ -1,10 +1,12 @@
+import asyncio
 import re
 from typing import List, Dict
 
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 
+from scrapers.engine import fetch
+from utils.html_parsing import make_soup
+
 from .base import BaseScraper
 
 
@@ -26,7 +28,7 @@ class WorkdayScraper(BaseScraper):
     def can_handle(self, url: str) -> bool:
         return "workday" in url
 
-    def scrape(self, url: str, limit: int = 50) -> List[Dict]:
+    async def scrape_async(self, url: str, limit: int = 50) -> List[Dict]:
         items: List[Dict] = []
         # Derive company from subdomain like company.wd1.myworkdayjobs.com
         company_slug = None
@@ -38,9 +40,9 @@ class WorkdayScraper(BaseScraper):
         except Exception:
             company_slug = None
         try:
-            r = requests.get(url, headers=self._HEADERS, timeout=12)
+            r = await fetch(url, headers=self._HEADERS)
             r.raise_for_status()
-            soup = BeautifulSoup(r.content, "html.parser")
+            soup = await asyncio.to_thread(make_soup, r.content)
             anchors = soup.select("a[href]")
             for a in anchors:
                 href = a.get("href") or ""
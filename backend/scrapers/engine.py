@@ -0,0 +1,260 @@
+"""Asyncio scraping engine shared by every scraper.
+
+One background thread runs one event loop that owns a single connection-pooled
+httpx.AsyncClient. Requests are throttled per host by semaphores so a burst of
+searches cannot open hundreds of sockets to the same site, and work submitted
+through the engine can be cancelled for real when a time budget expires.
+Per-host pool size, timeout and retry policy come from utils/http_client.py.
+GETs are revalidated with ETag / Last-Modified when the engine has a
+ValidatorStore (utils/conditional_http.py); a 304 comes back as the stored 200.
+
+Sync callers (FastAPI threadpool handlers, scripts) use run_sync(coro); code that
+wants a concurrent.futures.Future (e.g. SingleFlight) uses get_engine().submit().
+with_request_hook() runs a scraper with a callback invoked for every request
+attempt it makes, including tasks it spawns (used to meter pre-warm traffic).
+
+Knobs (env):
+  SCRAPE_MAX_CONNECTIONS  total pooled connections (default 64)
+  SCRAPE_MAX_KEEPALIVE    idle keep-alive connections kept (default 32)
+  (per-host limits and keep-alive expiry: see utils/http_client.py)
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from utils.conditional_http import ValidatorStore, get_validators
+from utils.http_client import (
+    RETRY_STATUSES,
+    HostPolicies,
+    HttpStats,
+    get_async_stats,
+    get_policies,
+    keepalive_expiry,
+    rewrite_url,
+)
+
+
+# hook(host) for each request attempt; set per task by with_request_hook()
+_REQUEST_HOOK: "contextvars.ContextVar[Optional[Callable[[str], None]]]" = contextvars.ContextVar("request_hook", default=None)
+
+
+class ScrapeEngine:
+    """Owns the engine event loop, the pooled async client and per-host limits."""
+
+    def __init__(
+        self,
+        max_connections: int = 64,
+        max_keepalive: int = 32,
+        keepalive_s: float = 30.0,
+        policies: Optional[HostPolicies] = None,
+        stats: Optional[HttpStats] = None,
+        validators: Optional[ValidatorStore] = None,
+    ) -> None:
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_s = keepalive_s
+        self.policies = policies or HostPolicies()
+        self.http_stats = stats or HttpStats()
+        self.validators = validators
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_sems: Dict[str, asyncio.Semaphore] = {}
+        self._counters: Dict[str, int] = {"requests": 0, "errors": 0, "retries": 0, "cancelled": 0}
+        self._active: Dict[str, int] = {}
+
+    # --- loop management ---
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    started = threading.Event()
+                    t = threading.Thread(target=self._run_loop, args=(loop, started), name="scrape-engine", daemon=True)
+                    t.start()
+                    started.wait()
+                    self._thread = t
+                    self._loop = loop
+        return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        loop.run_forever()
+
+    def in_engine_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> concurrent.futures.Future:
+        """Schedule fn(*args) on the engine loop; cancelling the Future cancels the task."""
+        return asyncio.run_coroutine_threadsafe(fn(*args, **kwargs), self.loop)
+
+    def run_sync(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Block the calling (non-engine) thread until coro finishes on the engine loop."""
+        if self.in_engine_thread():
+            raise RuntimeError("run_sync() called from the engine loop; await the coroutine instead")
+        fut = asyncio.run_coroutine_threadsafe(coro, self.loop)  # type: ignore[arg-type]
+        try:
+            return fut.result(timeout)
+        except concurrent.futures.TimeoutError:
+            fut.cancel()
+            raise
+
+    # --- HTTP ---
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                    keepalive_expiry=self.keepalive_s,
+                ),
+                follow_redirects=True,
+                timeout=httpx.Timeout(12.0),
+            )
+        return self._client
+
+    def _host_sem(self, host: str, limit: int) -> asyncio.Semaphore:
+        # One semaphore per host caps both concurrency and pooled sockets to it
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(limit)
+            self._host_sems[host] = sem
+        return sem
+
+    def _tracer(self, host: str) -> Callable[[str, Dict[str, Any]], Awaitable[None]]:
+        """httpcore trace hook: count newly opened connections (vs. pooled reuse)."""
+        stats = self.http_stats
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            if event == "connection.connect_tcp.complete":
+                stats.record(host, "new_connections")
+            elif event == "connection.start_tls.complete":
+                stats.record(host, "tls_handshakes")
+
+        return trace
+
+    async def fetch(
+        self,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+    ) -> httpx.Response:
+        """GET url through the shared client, respecting the per-host limit.
+
+        timeout/retries/backoff default to the host's policy. Retries connection
+        errors and RETRY_STATUSES with exponential backoff; raises
+        httpx.HTTPError once retries are exhausted (callers already treat
+        network failures as "no results").
+        """
+        host = (urlparse(url).hostname or "").lower()
+        pol = self.policies.resolve(host)[1]
+        timeout = pol.timeout if timeout is None else timeout
+        retries = pol.retries if retries is None else retries
+        backoff = pol.backoff if backoff is None else backoff
+        client = self._get_client()
+        trace = self._tracer(host)
+        target = rewrite_url(url)
+        if self.validators is not None:
+            headers = self.validators.request_headers(url, headers)
+        attempt = 0
+        while True:
+            self._counters["requests"] += 1
+            self.http_stats.record(host, "requests")
+            hook = _REQUEST_HOOK.get()
+            if hook is not None:
+                hook(host)
+            try:
+                async with self._host_sem(host, pol.limit):
+                    self._active[host] = self._active.get(host, 0) + 1
+                    try:
+                        resp = await client.get(target, headers=headers, timeout=timeout, extensions={"trace": trace})
+                    finally:
+                        self._active[host] -= 1
+                if resp.status_code in RETRY_STATUSES and attempt < retries:
+                    raise httpx.HTTPStatusError(f"retryable status {resp.status_code}", request=resp.request, response=resp)
+                if self.validators is not None:
+                    resp = self.validators.on_response(url, resp, self.http_stats, host)
+                return resp
+            except asyncio.CancelledError:
+                self._counters["cancelled"] += 1
+                raise
+            except httpx.HTTPError:
+                if attempt >= retries:
+                    self._counters["errors"] += 1
+                    self.http_stats.record(host, "errors")
+                    raise
+                attempt += 1
+                self._counters["retries"] += 1
+                self.http_stats.record(host, "retries")
+                await asyncio.sleep(backoff * (2 ** (attempt - 1)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loop_running": self._loop is not None,
+            "max_connections": self.max_connections,
+            "keepalive_s": self.keepalive_s,
+            "active_by_host": {h: n for h, n in self._active.items() if n},
+            "conditional": self.validators.stats() if self.validators is not None else None,
+            **self._counters,
+        }
+
+
+_ENGINE: Optional[ScrapeEngine] = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_engine() -> ScrapeEngine:
+    """Process-wide engine, configured from env on first use (loop starts lazily)."""
+    global _ENGINE
+    if _ENGINE is None:
+        with _ENGINE_LOCK:
+            if _ENGINE is None:
+                _ENGINE = ScrapeEngine(
+                    max_connections=int(os.getenv("SCRAPE_MAX_CONNECTIONS", "64")),
+                    max_keepalive=int(os.getenv("SCRAPE_MAX_KEEPALIVE", "32")),
+                    keepalive_s=keepalive_expiry(),
+                    policies=get_policies(),
+                    stats=get_async_stats(),
+                    validators=get_validators(),
+                )
+    return _ENGINE
+
+
+async def fetch(url: str, **kwargs: Any) -> httpx.Response:
+    return await get_engine().fetch(url, **kwargs)
+
+
+def run_sync(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    return get_engine().run_sync(coro, timeout=timeout)
+
+
+async def with_request_hook(hook: Callable[[str], None], fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+    """await fn(*args) with hook(host) called for every request attempt it (or any task it creates) makes."""
+    token = _REQUEST_HOOK.set(hook)
+    try:
+        return await fn(*args)
+    finally:
+        _REQUEST_HOOK.reset(token)
+
+
+async def parse_cached(resp: httpx.Response, name: str, fn: Callable[..., Any], *args: Any) -> Any:
+    """fn(resp.content, *args) in a worker thread, skipped when resp revalidated a body already parsed as name."""
+    eng = get_engine()
+    if eng.validators is None:
+        return await asyncio.to_thread(fn, resp.content, *args)
+    return await eng.validators.parse_cached_async(resp, name, fn, *args, stats=eng.http_stats)
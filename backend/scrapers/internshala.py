@@ -1,12 +1,14 @@
 # backend/scrapers/internshala.py
+import asyncio
 import os
-import requests
 import time
 import re
-from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+from scrapers.engine import fetch, parse_cached, run_sync
+from utils.html_parsing import class_strainer, make_soup
+from utils.keyword_matcher import KeywordMatcher
+from utils.result_cache import get_cache
 
 BASE_URL = "https://internshala.com"
 
@@ -21,29 +23,63 @@ HEADERS = {
     "Referer": "https://internshala.com/internships",
 }
 
-# Shared session with simple retries (network resilience) and polite timeouts.
-_session = requests.Session()
-# Slightly higher retries for flaky datacenter IPs; keep small to respect time budget
-_retries = Retry(
-    total=3,
-    backoff_factor=0.6,  # gentle exponential backoff
-    status_forcelist=[429, 500, 502, 503, 504],
-    allowed_methods=["GET"],  # type: ignore
-)
-_session.mount("https://", HTTPAdapter(max_retries=_retries))
-_session.headers.update(HEADERS)
+# Requests go through the shared scrape engine; pool size and retry/backoff for
+# internshala.com come from its policy in utils/http_client.py.
+
+# Detail pages are cached per URL (they rarely change once posted)
+DETAIL_CACHE_NS = "internshala_detail"
+# Strong refs to detail fetches still warming the cache after a deadline. They
+# belong to no scrape any more: each request is bounded by its fetch timeout,
+# even if the scrape that started them is later cancelled.
+_BACKGROUND: "set[asyncio.Task]" = set()
 
+# Terms match whole words (see utils/keyword_matcher.py), so list the word forms
 TAG_PATTERNS = {
     "remote": ["remote", "work from home", "wfh"],
     "hybrid": ["hybrid"],
     "onsite": ["on-site", "onsite", "on site"],
     "stipend": ["₹", "stipend", "per month", "per week", "per day"],
-    "tech": ["software", "developer", "programming", "coding", "tech", "IT"],
+    "tech": ["software", "developer", "developers", "programming", "coding", "tech", "technology", "technologies", "technical"],
     "data-science": ["data science", "machine learning", "ai", "analytics", "data analyst"],
     "web-dev": ["web development", "frontend", "backend", "full stack", "react", "javascript"],
     "mobile": ["mobile app", "android", "ios", "flutter", "react native"],
-    "internship": ["internship", "intern", "trainee"],
+    "internship": ["internship", "internships", "intern", "interns", "trainee"],
 }
+_TAG_MATCHER = KeywordMatcher(TAG_PATTERNS)
+
+# Tech-relevance weights per term group; the label is the term that scores
+_RELEVANCE_GROUPS = [
+    # Core tech keywords (high weight)
+    (15, {
+        "software engineer": ["software engineer"], "developer": ["developer", "developers"],
+        "programming": ["programming"], "coding": ["coding"],
+        "engineer": ["engineer", "engineers", "engineering"], "computer science": ["computer science"],
+        "technology": ["technology"], "software development": ["software development"],
+    }),
+    # Specific tech skills (medium weight)
+    (8, {t: [t] for t in (
+        "python", "java", "javascript", "react", "node", "angular", "vue",
+        "html", "css", "sql", "mongodb", "aws", "docker", "git", "linux",
+    )}),
+    # Tech domains (medium weight)
+    (10, {t: [t] for t in (
+        "web development", "mobile app", "data science", "machine learning",
+        "artificial intelligence", "cybersecurity", "cloud", "devops",
+    )}),
+    # B.Tech friendly terms (low weight)
+    (5, {
+        "intern": ["intern", "interns", "internship", "internships"], "trainee": ["trainee", "trainees"],
+        "fresher": ["fresher", "freshers"], "graduate": ["graduate", "graduates"],
+        "entry level": ["entry level", "entry-level"], "junior": ["junior"],
+    }),
+    # Negative indicators (reduce score)
+    (-10, {t: [t] for t in (
+        "sales", "marketing", "content writing", "graphic design", "finance",
+        "hr", "human resources", "business development", "accounting",
+    )}),
+]
+_RELEVANCE_WEIGHTS = {label: w for w, group in _RELEVANCE_GROUPS for label in group}
+_RELEVANCE_MATCHER = KeywordMatcher({label: forms for _, group in _RELEVANCE_GROUPS for label, forms in group.items()})
 
 # B.Tech/Tech focused keywords for enhanced searching
 BTECH_TECH_KEYWORDS = [
@@ -63,12 +99,8 @@ def _auto_tags(desc: str) -> List[str]:
     """
     Generate tags based on job description content.
     """
-    tags = []
-    d = desc.lower()
-    for tag, keys in TAG_PATTERNS.items():
-        if any(k in d for k in keys):
-            tags.append(tag)
-    return tags
+    hits = _TAG_MATCHER.present(desc)
+    return [tag for tag in TAG_PATTERNS if tag in hits]
 
 def _enhance_query_for_tech(query: str) -> str:
     """
@@ -111,57 +143,44 @@ def _calculate_tech_relevance_score(title: str, description: str, skills: List[s
     """
     Calculate how relevant a job is for B.Tech/tech students (0-100 scale).
     """
-    content = f"{title} {description}".lower()
+    content = f"{title} {description}"
     if skills:
-        content += " " + " ".join(skills).lower()
-    
-    score = 0.0
-    
-    # Core tech keywords (high weight)
-    high_value_terms = [
-        "software engineer", "developer", "programming", "coding", "engineer",
-        "computer science", "IT", "technology", "software development"
-    ]
-    for term in high_value_terms:
-        if term in content:
-            score += 15
-    
-    # Specific tech skills (medium weight)
-    tech_skills = [
-        "python", "java", "javascript", "react", "node", "angular", "vue",
-        "html", "css", "sql", "mongodb", "aws", "docker", "git", "linux"
-    ]
-    for skill in tech_skills:
-        if skill in content:
-            score += 8
-    
-    # Tech domains (medium weight)
-    domains = [
-        "web development", "mobile app", "data science", "machine learning",
-        "artificial intelligence", "cybersecurity", "cloud", "devops"
-    ]
-    for domain in domains:
-        if domain in content:
-            score += 10
-    
-    # B.Tech friendly terms (low weight)
-    btech_terms = ["intern", "trainee", "fresher", "graduate", "entry level", "junior"]
-    for term in btech_terms:
-        if term in content:
-            score += 5
-    
-    # Negative indicators (reduce score)
-    non_tech_terms = [
-        "sales", "marketing", "content writing", "graphic design", "finance",
-        "hr", "human resources", "business development", "accounting"
-    ]
-    for term in non_tech_terms:
-        if term in content:
-            score -= 10
-    
+        content += " " + " ".join(skills)
+    # Each distinct term found scores once
+    score = float(sum(_RELEVANCE_WEIGHTS[t] for t in _RELEVANCE_MATCHER.present(content)))
     return min(100.0, max(0.0, score))
 
-def _fetch_detail_page(url: str) -> Dict[str, str]:
+# Partial parsing: only the containers the scraper reads are turned into nodes
+_LISTING_ONLY = class_strainer("individual_internship")
+_DETAIL_ONLY = class_strainer("internship_details", "about_company", "skills", "posted_by_container")
+
+def _parse_detail_page(content: bytes) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    soup = make_soup(content, _DETAIL_ONLY)
+
+    # Description
+    desc_block = soup.select_one("div.internship_details div.text-container")
+    if desc_block:
+        out["description_full"] = _normalize(desc_block.get_text(" ", strip=True))
+
+    # About company
+    about_block = soup.select_one("div.about_company")
+    if about_block:
+        out["about_company"] = _normalize(about_block.get_text(" ", strip=True))
+
+    # Skills required
+    skills_block = soup.select("div.skills span")
+    if skills_block:
+        skills = [s.get_text(strip=True) for s in skills_block if s.get_text(strip=True)]
+        out["skills_required"] = skills
+
+    # Posted date
+    date_block = soup.select_one("div.posted_by_container span")
+    if date_block:
+        out["posted"] = _normalize(date_block.get_text(strip=True))
+    return out
+
+async def _fetch_detail_page_async(url: str) -> Dict[str, str]:
     """
     Fetch the internship detail page and extract extra fields:
     - full description
@@ -169,37 +188,70 @@ def _fetch_detail_page(url: str) -> Dict[str, str]:
     - requirements / skills
     - posted date
     """
-    out: Dict[str, str] = {}
     try:
-        r = _session.get(url, timeout=14)
+        r = await fetch(url, headers=HEADERS, timeout=14)
         r.raise_for_status()
-        soup = BeautifulSoup(r.content, "html.parser")
+        # Parsing (and the cache write) is blocking; keep it off the engine loop
+        return await asyncio.to_thread(_parse_and_store_detail, url, r.content)
+    except Exception:
+        # Fail silently for detail fetch
+        return {}
 
-        # Description
-        desc_block = soup.select_one("div.internship_details div.text-container")
-        if desc_block:
-            out["description_full"] = _normalize(desc_block.get_text(" ", strip=True))
+def _parse_and_store_detail(url: str, content: bytes) -> Dict[str, str]:
+    out = _parse_detail_page(content)
+    if out:
+        get_cache().set(DETAIL_CACHE_NS, url, out)
+    return out
 
-        # About company
-        about_block = soup.select_one("div.about_company")
-        if about_block:
-            out["about_company"] = _normalize(about_block.get_text(" ", strip=True))
+def _cached_details(urls: List[str]) -> Dict[str, Dict]:
+    cache = get_cache()
+    out: Dict[str, Dict] = {}
+    for u in urls:
+        hit = cache.get(DETAIL_CACHE_NS, u)
+        if hit is not None:
+            out[u] = hit
+    return out
 
-        # Skills required
-        skills_block = soup.select("div.skills span")
-        if skills_block:
-            skills = [s.get_text(strip=True) for s in skills_block if s.get_text(strip=True)]
-            out["skills_required"] = skills
+async def _enrich_details(urls: List[str], concurrency: int, deadline_s: float) -> Dict[str, Dict]:
+    """
+    Fetch detail pages for urls concurrently (at most `concurrency` at a time)
+    and return whatever is ready after `deadline_s`. Cached pages cost nothing.
 
-        # Posted date
-        date_block = soup.select_one("div.posted_by_container span")
-        if date_block:
-            out["posted"] = _normalize(date_block.get_text(strip=True))
+    Cancelling the caller before the deadline cancels every fetch. Fetches
+    still running at the deadline are detached: they finish in the background
+    (each request bounded by its fetch timeout) so the next search finds them in the
+    cache, and cancelling the scrape afterwards does not stop them.
+    """
+    if not urls:
+        return {}
+    details = await asyncio.to_thread(_cached_details, urls)
+    missing = [u for u in urls if u not in details]
+    if not missing:
+        return details
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(u: str) -> Dict[str, str]:
+        async with sem:
+            return await _fetch_detail_page_async(u)
+
+    tasks = {asyncio.create_task(one(u)): u for u in missing}
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=max(0.0, deadline_s))
+    except asyncio.CancelledError:
+        # Caller abandoned the scrape: don't keep its detail fetches alive
+        for t in tasks:
+            t.cancel()
+        raise
+    for t in done:
+        if not t.cancelled() and t.exception() is None and t.result():
+            details[tasks[t]] = t.result()
+    for t in pending:  # detached, see docstring
+        _BACKGROUND.add(t)
+        t.add_done_callback(_BACKGROUND.discard)
+    return details
 
-    except Exception:
-        # Fail silently for detail fetch
-        pass
-    return out
+def _fetch_detail_page(url: str) -> Dict[str, str]:
+    return run_sync(_fetch_detail_page_async(url))
 
 def _candidate_urls(enhanced_query: str, location: Optional[str]) -> List[str]:
     q = "-".join(enhanced_query.strip().split())
@@ -223,7 +275,59 @@ def _candidate_urls(enhanced_query: str, location: Optional[str]) -> List[str]:
         urls.append(f"{base_kw}/in-{'-'.join(location.strip().split())}/page-2")
     return urls
 
+def _parse_listing(content: bytes, max_cards: int) -> List[Dict]:
+    """Extract the shallow per-card fields from a listing page."""
+    soup = make_soup(content, _LISTING_ONLY)
+    # Try multiple selector variants; site markup changes periodically
+    cards = soup.select("div.individual_internship")
+    if not cards:
+        cards = soup.select("div.container-fluid.individual_internship")
+    if not cards:
+        cards = soup.select("div[class*='individual_internship']")
+
+    rows: List[Dict] = []
+    for card in cards[:max_cards]:
+        title_tag = card.select_one("h3 a, a.view_detail_button, a[href*='/internship/']")
+        title = title_tag.get_text(strip=True) if title_tag else "Internship"
+
+        company_tag = card.select_one("div.company_name a, div.company_name, .company_and_premium span.company-name")
+        company = company_tag.get_text(strip=True) if company_tag else "Company"
+
+        link = title_tag.get("href") if title_tag else None
+        if link and link.startswith("/"):
+            link = BASE_URL + link
+
+        loc_tag = card.select_one(".locations > a, .location_link, .location, .locations span")
+        loc_txt = loc_tag.get_text(strip=True) if loc_tag else "India"
+
+        stipend_node = card.select_one(".stipend, span.stipend")
+        stipend = stipend_node.get_text(strip=True) if stipend_node else ""
+
+        desc_sec = card.select_one(".internship_meta, .other_detail_item_row, .details, .internship_desc") or card
+        desc_text = desc_sec.get_text(" ", strip=True)
+
+        tags = []
+        for t in card.select(".tag_container .round_tabs a, .tag_container span"):
+            tx = t.get_text(strip=True)
+            if tx:
+                tags.append(tx.lower())
+
+        rows.append({
+            "title": title,
+            "company": company,
+            "link": link,
+            "location": loc_txt,
+            "stipend": stipend,
+            "desc_text": desc_text,
+            "tags": tags,
+        })
+    return rows
+
 def fetch_internships(query: str, location: Optional[str] = None, limit: int = 12) -> List[Dict]:
+    """Blocking wrapper around fetch_internships_async (for scripts and sync callers)."""
+    return run_sync(fetch_internships_async(query, location, limit))
+
+async def fetch_internships_async(query: str, location: Optional[str] = None, limit: int = 12) -> List[Dict]:
     """
     Scrape Internshala for tech-focused internships matching the given keyword query.
     Enhanced for B.Tech/CS students with better query building and relevance scoring.
@@ -237,22 +341,21 @@ def fetch_internships(query: str, location: Optional[str] = None, limit: int = 1
     # Allow either INTERNSHALA_HTTP_TIMEOUT or legacy INSHALA_HTTP_TIMEOUT
     req_timeout = int(os.getenv("INTERNSHALA_HTTP_TIMEOUT", os.getenv("INSHALA_HTTP_TIMEOUT", "15")))
     tech_min = float(os.getenv("TECH_RELEVANCE_MIN", "8"))
+    # Detail-page enrichment: how many cards, how many fetches at once, and how
+    # long (seconds) the listing may wait for them
+    detail_count = int(os.getenv("INTERNSHALA_DETAIL_COUNT", "12"))
+    detail_concurrency = int(os.getenv("INTERNSHALA_DETAIL_CONCURRENCY", "4"))
+    detail_deadline = float(os.getenv("INTERNSHALA_DETAIL_DEADLINE", "4.0"))
     debug = os.getenv("DEBUG_SCRAPERS", "0").lower() in {"1","true","yes","on"}
-    soup = None
     last_err = None
-    cards = []
+    cards: List[Dict] = []
     used_url = None
     for u in urls:
         try:
-            resp = _session.get(u, timeout=req_timeout)
+            resp = await fetch(u, headers=HEADERS, timeout=req_timeout)
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.content, "html.parser")
-            # Try multiple selector variants; site markup changes periodically
-            cards = soup.select("div.individual_internship")
-            if not cards:
-                cards = soup.select("div.container-fluid.individual_internship")
-            if not cards:
-                cards = soup.select("div[class*='individual_internship']")
+            # Fetch more initially to filter better
+            cards = await parse_cached(resp, "listing", _parse_listing, limit * 3)
             if cards:
                 used_url = u
                 break
@@ -266,36 +369,19 @@ def fetch_internships(query: str, location: Optional[str] = None, limit: int = 1
         return []
     items: List[Dict] = []
 
-    for idx, card in enumerate(cards[:limit*3]):  # Fetch more initially to filter better
-        title_tag = card.select_one("h3 a, a.view_detail_button, a[href*='/internship/']")
-        title = title_tag.get_text(strip=True) if title_tag else "Internship"
-
-        company_tag = card.select_one("div.company_name a, div.company_name, .company_and_premium span.company-name")
-        company = company_tag.get_text(strip=True) if company_tag else "Company"
-
-        link = title_tag.get("href") if title_tag else None
-        if link and link.startswith("/"):
-            link = BASE_URL + link
-
-        loc_tag = card.select_one(".locations > a, .location_link, .location, .locations span")
-        loc_txt = loc_tag.get_text(strip=True) if loc_tag else "India"
-
-        stipend_node = card.select_one(".stipend, span.stipend")
-        stipend = stipend_node.get_text(strip=True) if stipend_node else ""
-
-        desc_sec = card.select_one(".internship_meta, .other_detail_item_row, .details, .internship_desc") or card
-        desc_text = desc_sec.get_text(" ", strip=True)
-
-        tags = []
-        for t in card.select(".tag_container .round_tabs a, .tag_container span"):
-            tx = t.get_text(strip=True)
-            if tx:
-                tags.append(tx.lower())
-
-        # Fetch detail page for full info
-        extra = {}
-        if link and idx < 3:
-            extra = _fetch_detail_page(link)
+    # Fetch detail pages for full info, concurrently and within the deadline
+    detail_urls = [c["link"] for c in cards[:detail_count] if c["link"]]
+    details = await _enrich_details(list(dict.fromkeys(detail_urls)), detail_concurrency, detail_deadline)
+
+    for card in cards:
+        title = card["title"]
+        company = card["company"]
+        link = card["link"]
+        loc_txt = card["location"]
+        stipend = card["stipend"]
+        desc_text = card["desc_text"]
+        tags = card["tags"]
+        extra = details.get(link, {}) if link else {}
 
         # Calculate tech relevance score
         full_desc = extra.get("description_full") or desc_text
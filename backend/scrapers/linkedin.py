@@ -1,9 +1,11 @@
+import asyncio
 import os
 import time
 from typing import List, Dict, Optional
 
-import requests
-from bs4 import BeautifulSoup
+from scrapers.engine import fetch, run_sync
+from utils.html_parsing import class_strainer, make_soup
+from utils.keyword_matcher import KeywordMatcher
 
 
 def _enhance_query(query: str) -> str:
@@ -31,19 +33,21 @@ def _build_search_url(query: str, location: Optional[str]) -> str:
     return url
 
 
-def _http_fetch(url: str, timeout: float = 12.0) -> Optional[str]:
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
-        ),
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-        "Cache-Control": "no-cache",
-        "Pragma": "no-cache",
-    }
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+}
+
+
+async def _http_fetch_async(url: str, timeout: float = 12.0) -> Optional[str]:
     try:
-        r = requests.get(url, headers=headers, timeout=timeout)
+        r = await fetch(url, headers=_HEADERS, timeout=timeout)
         if r.status_code == 200 and r.text:
             return r.text
     except Exception:
@@ -51,8 +55,33 @@ def _http_fetch(url: str, timeout: float = 12.0) -> Optional[str]:
     return None
 
 
+def _http_fetch(url: str, timeout: float = 12.0) -> Optional[str]:
+    return run_sync(_http_fetch_async(url, timeout))
+
+
+_CARDS_ONLY = class_strainer("base-card")
+
+# Card tags, matched on title + snippet; badge tags also match the card's badge text
+_BADGE_TAG_TERMS = {
+    "easy-apply": ["easy apply"],
+    "promoted": ["promoted"],
+    "actively-hiring": ["actively hiring"],
+}
+_CARD_TAGS = KeywordMatcher({
+    "remote": ["remote", "wfh"],
+    "full-stack": ["full stack", "fullstack"],
+    "programming": ["python", "java", "javascript", "react", "node"],
+    "data-science": ["data science", "machine learning", "ai", "analytics"],
+    "backend": ["backend", "api", "apis", "server"],
+    "frontend": ["frontend", "ui", "ux", "web"],
+    **_BADGE_TAG_TERMS,
+})
+_BADGE_TAGS = KeywordMatcher(_BADGE_TAG_TERMS)
+_CARD_TAG_ORDER = _CARD_TAGS.labels_in_order
+
+
 def _parse_cards(html: str, limit: int) -> List[Dict]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html, _CARDS_ONLY)
     cards = soup.select("div.base-card")[: max(limit, 20)]
     out: List[Dict] = []
     for card in cards:
@@ -70,28 +99,9 @@ def _parse_cards(html: str, limit: int) -> List[Dict]:
 
         # Detect badges
         badges = " ".join([b.get_text(" ", strip=True) for b in card.select("span,div") if b and b.get_text(strip=True)])
-        badges_l = badges.lower()
-
-        content_lower = f"{title} {desc}".lower()
-        auto_tags: List[str] = []
-        if "remote" in content_lower or "wfh" in content_lower:
-            auto_tags.append("remote")
-        if "full stack" in content_lower or "fullstack" in content_lower:
-            auto_tags.append("full-stack")
-        if any(lang in content_lower for lang in ["python", "java", "javascript", "react", "node"]):
-            auto_tags.append("programming")
-        if any(term in content_lower for term in ["data science", "machine learning", "ai", "analytics"]):
-            auto_tags.append("data-science")
-        if any(term in content_lower for term in ["backend", "api", "server"]):
-            auto_tags.append("backend")
-        if any(term in content_lower for term in ["frontend", "ui", "ux", "web"]):
-            auto_tags.append("frontend")
-        if "easy apply" in badges_l or "easy apply" in content_lower:
-            auto_tags.append("easy-apply")
-        if "promoted" in badges_l or "promoted" in content_lower:
-            auto_tags.append("promoted")
-        if "actively hiring" in badges_l or "actively hiring" in content_lower:
-            auto_tags.append("actively-hiring")
+
+        hits = _CARD_TAGS.present(f"{title} {desc}") | _BADGE_TAGS.present(badges)
+        auto_tags: List[str] = [tag for tag in _CARD_TAG_ORDER if tag in hits]
 
         out.append({
             "title": title,
@@ -107,6 +117,11 @@ def _parse_cards(html: str, limit: int) -> List[Dict]:
 
 
 def fetch_linkedin_internships(query: str, location: Optional[str] = 'India', limit: int = 12) -> List[Dict]:
+    """Blocking wrapper around fetch_linkedin_internships_async."""
+    return run_sync(fetch_linkedin_internships_async(query, location, limit))
+
+
+async def fetch_linkedin_internships_async(query: str, location: Optional[str] = 'India', limit: int = 12) -> List[Dict]:
     if os.getenv("DISABLE_LINKEDIN", "0") in {"1", "true", "yes", "on"}:
         return []
 
@@ -116,25 +131,31 @@ def fetch_linkedin_internships(query: str, location: Optional[str] = 'India', li
     url_easy = url + "&f_AL=true"
 
     # First try light HTTP fetch (fast and resource-friendly)
-    html = _http_fetch(url)
+    html = await _http_fetch_async(url)
     results: List[Dict] = []
     if html:
-        results = _parse_cards(html, limit)
+        results = await asyncio.to_thread(_parse_cards, html, limit)
         if results:
             return results
     # Try Easy Apply variant quickly
-    html_e = _http_fetch(url_easy)
+    html_e = await _http_fetch_async(url_easy)
     if html_e:
-        r2 = _parse_cards(html_e, limit)
+        r2 = await asyncio.to_thread(_parse_cards, html_e, limit)
         if r2:
             return r2
 
+    # Playwright's sync API blocks; run it on a worker thread
+    pw = await asyncio.to_thread(_playwright_fallback, url, url_easy, limit)
+    return pw or results
+
+
+def _playwright_fallback(url: str, url_easy: str, limit: int) -> List[Dict]:
     # Optional Playwright fallback (headless, still lighter than full Selenium)
     try:
         from playwright.sync_api import sync_playwright  # type: ignore
     except Exception:
-        # If Playwright isn't available, return empty (or keep HTTP results if any)
-        return results
+        # If Playwright isn't available, return empty (caller keeps HTTP results if any)
+        return []
 
     try:
         with sync_playwright() as p:
@@ -178,4 +199,4 @@ def fetch_linkedin_internships(query: str, location: Optional[str] = 'India', li
         # Swallow and return whatever we have
         pass
 
-    return results
\ No newline at end of file
+    return []
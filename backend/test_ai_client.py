@@ -0,0 +1,109 @@
+import json as _json
+import time
+
+import requests
+
+from utils.ai_client import AnswerCache, ModelHealth, OpenRouterClient, prompt_key
+
+
+class _Resp:
+    def __init__(self, status, content=None, headers=None, chunk_delay=0.0):
+        self.status_code = status
+        self.headers = headers or {}
+        self.answer = content
+        self.chunk_delay = chunk_delay
+        self.closed = False
+        self.text = ""
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}", response=self)
+
+    def iter_content(self, chunk_size=1):
+        body = _json.dumps({"choices": [{"message": {"content": self.answer}}]}).encode()
+        for i in range(0, len(body), 8):
+            time.sleep(self.chunk_delay)
+            yield body[i:i + 8]
+
+    def json(self):
+        return _json.loads(self._content)
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeSession:
+    """Per-model behaviour: (delay_s, status, content, headers[, per-chunk body delay])."""
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.calls = []
+        self.responses = {}
+
+    def post(self, url, json=None, headers=None, timeout=None, stream=False):
+        model = json["model"]
+        self.calls.append(model)
+        delay, status, content, hdrs, *chunk_delay = self.plan[model]
+        time.sleep(delay)
+        self.responses[model] = _Resp(status, content, hdrs, *chunk_delay)
+        return self.responses[model]
+
+
+def _client(plan, **kw):
+    return OpenRouterClient(session=_FakeSession(plan), **kw)
+
+
+def test_hedge_beats_slow_model():
+    c = _client({"slow": (1.0, 200, "late", None), "fast": (0.0, 200, "quick", None)}, hedge=2, hedge_delay_s=0.05)
+    started = time.perf_counter()
+    assert c.complete("u", {}, {}, ["slow", "fast"]) == ("quick", "fast")
+    assert time.perf_counter() - started < 0.8
+    assert c.stats()["hedged"] == 1
+
+
+def test_losing_attempt_is_aborted_and_frees_the_pool():
+    # The slow model answers headers at once but trickles its body; the fast one wins
+    c = _client({"slow": (0.0, 200, "late", None, 0.05), "fast": (0.0, 200, "quick", None)},
+                hedge=2, hedge_delay_s=0.05, max_turns=1)
+    assert c.complete("u", {}, {}, ["slow", "fast"]) == ("quick", "fast")
+    time.sleep(0.2)
+    assert c.stats()["aborted"] == 1 and c.session.responses["slow"].closed
+    assert "slow" not in c.health.snapshot()  # losing is neither a success nor a failure
+    # Both pool workers are free again: the next turn's first attempt starts at once
+    started = time.perf_counter()
+    assert c.complete("u", {}, {}, ["fast"]) == ("quick", "fast")
+    assert time.perf_counter() - started < 0.2
+
+
+def test_rate_limited_model_cools_down_and_moves_last():
+    errors = []
+    c = _client({"a": (0.0, 429, None, {"retry-after": "30"}), "b": (0.0, 200, "ok", None)}, hedge=1)
+    assert c.complete("u", {}, {}, ["a", "b"], on_error=lambda m, e: errors.append(m)) == ("ok", "b")
+    assert errors == ["a"]
+    assert c.health.order(["a", "b"]) == ["b", "a"]
+    assert c.health.snapshot()["a"]["rate_limited"] == 1 and c.health.snapshot()["a"]["cooldown_s"] > 20
+    c.session.calls.clear()
+    c.complete("u", {}, {}, ["a", "b"])
+    assert c.session.calls == ["b"]
+
+
+def test_deadline_bounds_turn():
+    c = _client({"a": (0.5, 200, "late", None)}, hedge=1, deadline_s=0.1)
+    started = time.perf_counter()
+    assert c.complete("u", {}, {}, ["a"]) is None
+    assert time.perf_counter() - started < 0.4 and c.stats()["deadline_exceeded"] == 1
+
+
+def test_answer_cache_and_health_order():
+    cache = AnswerCache(max_entries=1, ttl_s=60)
+    k1, k2 = prompt_key("hi", {"skills": ["sql"]}, "MODE: short."), prompt_key("hi", {"skills": ["sql"]}, "MODE: long/detail.")
+    assert k1 != k2 and k1 == prompt_key("hi", {"skills": ["sql"]}, "MODE: short.")
+    cache.put(k1, "answer", "m")
+    assert cache.get(k1) == ("answer", "m")
+    cache.put(k2, "other")
+    assert cache.get(k1) is None and cache.stats()["entries"] == 1
+    health = ModelHealth()
+    health.success("slow", 4000)
+    health.success("quick", 300)
+    health.failure("broken")
+    assert health.order(["broken", "slow", "quick", "new"]) == ["quick", "new", "slow", "broken"]
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from utils import batch_scorer
+from utils.batch_scorer import TermIndex
+from utils.recommender import _rank_batch, rank_internships, rank_per_job
+
+WORDS = ["python", "java", "javascript", "react", "sql", "ml", "data", "web", "api", "remote",
+         "intern", "developer", "backend", "ui", "c++", "node.js", "café", "🚀", "analyst"]
+CITIES = ["Bangalore", "Mumbai", "Remote", "Delhi NCR", "", None]
+
+PATHS = [False] + ([True] if batch_scorer.numpy_available() else [])
+
+
+def _jobs(n, seed=7):
+    rnd = random.Random(seed)
+    return [{
+        "title": " ".join(rnd.choices(WORDS, k=3)).title(),
+        "description": " ".join(rnd.choices(WORDS, k=rnd.randint(0, 30))),
+        "location": rnd.choice(CITIES),
+        "stipend": rnd.choice([None, "", "₹ 10,000 /month"]),
+        "tags": rnd.sample(["remote", "tech", "paid", "Backend"], rnd.randint(0, 3)),
+    } for _ in range(n)]
+
+
+@pytest.mark.parametrize("use_numpy", PATHS)
+def test_term_index_matches_substring_scan(use_numpy):
+    texts = [f"{j['title']} {j['description']}".lower() for j in _jobs(150)]
+    index = TermIndex(texts, use_numpy=use_numpy)
+    for term in WORDS + ["a", "on node", "ja", "", "zzz", "\x00"]:
+        want = [i for i, t in enumerate(texts) if term and term != "\x00" and term in t]
+        assert list(index.jobs_with(term)) == want, term
+    assert index.to_list(index.count(["python", "python", "sql"])) == [
+        ("python" in t) + ("sql" in t) for t in texts]
+
+
+@pytest.mark.parametrize("use_numpy", PATHS)
+def test_batch_ranking_matches_per_job(monkeypatch, use_numpy):
+    import utils.recommender as rec
+
+    monkeypatch.setattr(rec, "TermIndex", lambda texts: TermIndex(texts, use_numpy=use_numpy))
+    jobs = _jobs(400, seed=11)
+    resume = {
+        "skills": ["Python", "SQL", "React", "node.js"],
+        "roles": ["Developer"],
+        "location": "Bangalore",
+        "experience": [{"title": "Backend intern", "description": "Built API in python and sql"}],
+        "preferred_tags": ["remote", "backend"],
+    }
+    for k in (1, 5, 400):
+        assert _rank_batch(resume, jobs, k=k) == rank_per_job(resume, jobs, k=k)
+    assert _rank_batch({}, jobs, k=50) == rank_per_job({}, jobs, k=50)
+    assert rank_internships(resume, [], k=5) == []
+
+
+def test_small_lists_skip_the_batch_index(monkeypatch):
+    import utils.recommender as rec
+
+    def boom(texts):
+        raise AssertionError("TermIndex built for a small list")
+
+    monkeypatch.setattr(rec, "TermIndex", boom)
+    jobs = _jobs(rec._BATCH_MIN_JOBS - 1)
+    resume = {"skills": ["python"], "roles": ["developer"]}
+    assert rank_internships(resume, jobs, k=10) == rank_per_job(resume, jobs, k=10)
+
+
+def test_norm_collapses_whitespace_like_the_regex():
+    import re
+
+    from utils.recommender import _norm
+
+    for s in ["  a \t b\n\nc ", "x  y\x1cz", "", None, "one"]:
+        assert _norm(s) == re.sub(r"\s+", " ", (s or "").strip())
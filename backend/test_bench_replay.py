@@ -0,0 +1,56 @@
+import pytest
+
+from benchmarks.bench_search import percentile, run
+from benchmarks.replay_server import ReplayServer
+from scrapers.company_pages import scrape_company_careers
+from scrapers.internshala import fetch_internships
+from utils import http_client
+
+
+@pytest.fixture()
+def replay():
+    with ReplayServer() as srv:
+        prev = http_client.set_url_rewriter(http_client.replay_rewriter(srv.base_url))
+        try:
+            yield srv
+        finally:
+            http_client.set_url_rewriter(prev)
+
+
+def test_replay_rewriter_keeps_host_and_query():
+    rw = http_client.replay_rewriter("http://127.0.0.1:9/")
+    assert rw("https://api.lever.co/v0/postings/acme?mode=json") == "http://127.0.0.1:9/api.lever.co/v0/postings/acme?mode=json"
+    assert rw("https://internshala.com") == "http://127.0.0.1:9/internshala.com/"
+
+
+def test_scrapers_read_replayed_fixtures(replay):
+    lever = scrape_company_careers("https://jobs.lever.co/acme", limit=50)
+    assert lever and all(j["source"] == "lever" and "intern" in j["title"].lower() for j in lever)
+    assert scrape_company_careers("https://boards.greenhouse.io/acme", limit=5)
+    assert fetch_internships("python", "India", 5)
+    assert replay.hits["lever_postings.json"] == 1
+    # stats are keyed by the original host, not the replay server
+    assert "api.lever.co" in http_client.get_async_stats().snapshot()["hosts"]
+
+
+def test_percentile_nearest_rank():
+    vals = list(range(1, 101))
+    assert (percentile(vals, 50), percentile(vals, 95), percentile(vals, 99)) == (50, 95, 99)
+    assert percentile([], 95) == 0.0
+
+
+def test_bench_search_reports_latency_and_stages(monkeypatch):
+    import os
+
+    monkeypatch.setenv("RESULT_CACHE_DISABLE", "1")
+    monkeypatch.delenv("ALLOW_SAMPLE_FALLBACK", raising=False)  # run() defaults it to 0
+    monkeypatch.setenv("SEARCH_SWR", "0")
+    monkeypatch.setenv("RESULT_CACHE_PATH", "off")
+    monkeypatch.setenv("OFFLINE_MODE", "0")
+    monkeypatch.setenv("INTERNSHALA_DETAIL_COUNT", "2")
+    rep = run(requests=4, concurrency=2, latency_ms=0, jitter_ms=0, warmup=0)
+    # The run's environment defaults do not leak back to the caller
+    assert "ALLOW_SAMPLE_FALLBACK" not in os.environ and os.environ["OFFLINE_MODE"] == "0"
+    assert rep["latency"]["n"] == 4 and rep["latency"]["p95_ms"] >= rep["latency"]["p50_ms"] > 0
+    assert {"dispatch", "rank", "wait"} <= set(rep["stages"])
+    assert "internshala" in rep["results"]["sources"]
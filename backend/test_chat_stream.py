@@ -0,0 +1,102 @@
+import json
+import random
+
+from fastapi.testclient import TestClient
+
+import main
+from utils.ai_client import OpenRouterClient
+from utils.llm_stream import AiTextFormatter, format_ai_text, gemini_deltas, iter_sse_data, openrouter_deltas
+
+
+def test_incremental_format_matches_batch():
+    samples = [
+        "  Hello\r\n\r\n🎯 Summary\n\n- Python\n  \n🔧 Fix\n💡 Tip  \n\n",
+        "\n\n8/10\n",
+        "a\n \n🎯 b\t\n\n",
+        "",
+    ]
+    rnd = random.Random(7)
+    for text in samples:
+        for _ in range(20):
+            cuts = sorted(rnd.sample(range(len(text) + 1), k=min(len(text), 4)))
+            chunks = [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]
+            fmt = AiTextFormatter()
+            assert "".join(fmt.feed(c) for c in chunks) + fmt.flush() == format_ai_text(text)
+    assert format_ai_text("x\n\n🎯 Summary") == "x\n\n🎯 Summary"
+
+
+def test_sse_parsing():
+    lines = [b": OPENROUTER PROCESSING", b"", b'data: {"choices":[{"delta":{"content":"Hel"}}]}', b"",
+             'data: {"choices":[{"delta":{"content":"lo"}}]}', "", "data: [DONE]", "", 'data: {"late": 1}', ""]
+    assert list(openrouter_deltas(iter_sse_data(lines))) == ["Hel", "lo"]
+    g = ['data: {"candidates":[{"content":{"parts":[{"text":"Hi "},{"text":"there"}]}}]}', ""]
+    assert list(gemini_deltas(iter_sse_data(g))) == ["Hi there"]
+
+
+class _StreamResp:
+    def __init__(self, status, lines):
+        self.status_code = status
+        self.headers = {}
+        self.lines = lines
+        self.closed = False
+        self.text = ""
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"HTTP {self.status_code}", response=self)
+
+    def iter_lines(self, chunk_size=512):
+        return iter(self.lines)
+
+    def close(self):
+        self.closed = True
+
+
+class _StreamSession:
+    def __init__(self, plan):
+        self.plan = plan
+        self.responses = []
+
+    def post(self, url, json=None, headers=None, timeout=None, stream=False):
+        assert stream and json["stream"] is True
+        status, pieces = self.plan[json["model"]]
+        lines = []
+        for p in pieces:
+            lines += ["data: " + __import__("json").dumps({"choices": [{"delta": {"content": p}}]}), ""]
+        resp = _StreamResp(status, lines + ["data: [DONE]", ""])
+        self.responses.append(resp)
+        return resp
+
+
+def test_client_stream_falls_back_before_first_token():
+    session = _StreamSession({"a": (429, []), "b": (200, ["🎯 Sum", "mary\n\n", "- ok"])})
+    client = OpenRouterClient(session=session)
+    out = list(client.stream("u", {}, {}, ["a", "b"]))
+    assert [m for m, _ in out] == ["b", "b", "b"]
+    assert all(r.closed for r in session.responses)
+    assert client.health.order(["a", "b"]) == ["b", "a"]
+
+
+def test_chat_stream_endpoint(monkeypatch):
+    session = _StreamSession({"m1": (200, ["  Hi", "\n\n💡 Tip", ": ship it\n"])})
+    client = OpenRouterClient(session=session)
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setenv("OPENROUTER_MODELS", "m1")
+    monkeypatch.setenv("OFFLINE_MODE", "0")
+    monkeypatch.setattr(main, "get_ai_client", lambda: client)
+    monkeypatch.setattr(main, "GOOGLE_API_KEY", "")
+    http = TestClient(main.app)
+    body = {"message": "tips please", "session_id": "s-stream"}
+    r = http.post("/api/chat/stream", json=body)
+    frames = [json.loads(line) for line in r.text.splitlines() if line]
+    deltas = "".join(f["text"] for f in frames if f["event"] == "delta")
+    done = frames[-1]
+    assert done["event"] == "done" and done["response"] == deltas == "Hi\n\n💡 Tip: ship it"
+    assert done["model"] == "m1" and not done["cached"]
+    # Same turn again: served from the answer cache, and /api/chat agrees
+    again = [json.loads(line) for line in http.post("/api/chat/stream", json=body).text.splitlines() if line]
+    assert again[-1]["cached"] and again[-1]["response"] == done["response"]
+    assert http.post("/api/chat", json=body).json()["response"] == done["response"]
+    sse = http.post("/api/chat/stream?format=sse", json=body)
+    assert sse.headers["content-type"].startswith("text/event-stream") and "event: done" in sse.text
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from utils.gemini_client import GeminiBusy, GeminiClient, GeminiError
+
+_OK = {"candidates": [{"content": {"parts": [{"text": "Dear Hiring Manager, hello."}]}}]}
+
+
+def _client(handler, **kw):
+    kw.setdefault("backoff_s", 0.01)
+    return GeminiClient(transport=httpx.MockTransport(handler), **kw)
+
+
+def test_retries_429_then_succeeds():
+    calls = []
+
+    def handler(request):
+        calls.append(request.headers["x-goog-api-key"])
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"retry-after": "0"}, json={"error": "quota"})
+        return httpx.Response(200, json=_OK)
+
+    c = _client(handler)
+    assert c.generate_sync("gemini-2.5-flash", {"contents": []}, key="k") == _OK
+    assert calls == ["k", "k"]
+    st = c.stats()
+    assert st["retries"] == 1 and st["rate_limited"] == 1 and st["errors"] == 0
+    with pytest.raises(GeminiError) as e:
+        _client(lambda r: httpx.Response(400, text="bad"), max_retries=3).generate_sync("m", {}, key="k")
+    assert e.value.status == 400
+
+
+def test_token_bucket_paces_calls():
+    c = _client(lambda r: httpx.Response(200, json=_OK), rpm=1200, burst=1)  # 20/s
+    started = time.perf_counter()
+    for _ in range(4):
+        c.generate_sync("m", {}, key="k")
+    assert time.perf_counter() - started >= 0.14
+    assert c.stats()["throttle_wait_ms"] >= 100
+
+
+def test_queue_bound_rejects_instead_of_piling_up():
+    release = threading.Event()
+
+    async def handler(request):
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        return httpx.Response(200, json=_OK)
+
+    c = _client(handler, max_concurrency=1, max_queue=1)
+
+    async def burst():
+        tasks = [asyncio.ensure_future(c.generate("m", {}, key="k")) for _ in range(3)]
+        await asyncio.sleep(0.2)
+        release.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(burst())
+    assert sum(isinstance(r, GeminiBusy) for r in results) == 1
+    assert sum(r == _OK for r in results) == 2
+
+
+def test_stream_lines_and_error_before_first_line():
+    body = 'data: {"candidates":[{"content":{"parts":[{"text":"Hi"}]}}]}\n\ndata: {"candidates":[{"content":{"parts":[{"text":" there"}]}}]}\n\n'
+
+    def handler(request):
+        assert "streamGenerateContent" in request.url.path and request.url.params["alt"] == "sse"
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    lines = list(_client(handler).open_stream_sync("m", {}, key="k"))
+    assert [ln for ln in lines if ln] == [ln for ln in body.split("\n") if ln]
+    with pytest.raises(GeminiError):
+        _client(lambda r: httpx.Response(403, text="denied")).open_stream_sync("m", {}, key="k")
+
+
+def test_cover_letter_route_awaits_shared_client(monkeypatch):
+    c = _client(lambda r: httpx.Response(200, json=_OK))
+    monkeypatch.setattr(main, "GOOGLE_API_KEY", "k")
+    monkeypatch.setattr(main, "get_gemini_client", lambda: c)
+    r = TestClient(main.app).post("/api/messages/cover-letter", json={"resume": {"name": "Asha"}, "job": {"title": "Data Intern"}})
+    assert r.json()["message"] == "Dear Hiring Manager, hello." and c.stats()["calls"] == 1
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import os
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from routes import gov_feeds
+from utils.gov_store import ModerationStore, SeedFeed
+
+
+@pytest.fixture(autouse=True)
+def _fresh_gov_cache(monkeypatch):
+    monkeypatch.setattr(gov_feeds, "_SOURCE_CACHE", {})
+    monkeypatch.setattr(gov_feeds, "_CACHE", {"ts": 0.0, "items": [], "sources": {}, "complete": True, "expires_at": 0.0})
+
+
+def _fake_meta(delays, titles=None, fail=(), calls=None):
+    by_url = {src.url: src.name for src in gov_feeds._SOURCES}
+
+    async def page_meta(url, timeout=10.0):
+        name = by_url[url]
+        if calls is not None:
+            calls.append(name)
+        await asyncio.sleep(delays.get(name, 0.05))
+        if name in fail:
+            raise RuntimeError("boom")
+        return (titles or {}).get(name, (f"{name} live", f"{name} live description"))
+
+    return page_meta
+
+
+def test_fan_out_is_concurrent_and_bounded(monkeypatch):
+    # Every source takes 0.3s (4s+ sequentially); one hangs; one is unreachable
+    delays = {src.name: 0.3 for src in gov_feeds._SOURCES}
+    delays["isro"] = 30
+    monkeypatch.setattr(gov_feeds, "_page_meta_async", _fake_meta(delays, titles={"ongc": ("", "")}, fail={"sebi"}))
+    started = time.perf_counter()
+    items, statuses = gov_feeds._aggregate_live(force=True, deadline_s=1.0, timeout_s=0.8)
+    elapsed = time.perf_counter() - started
+    assert elapsed < 1.5
+    assert statuses["aicte"]["status"] == "ok"
+    assert statuses["isro"]["status"] == "timeout"
+    assert statuses["ongc"]["status"] == "fallback"
+    assert statuses["sebi"]["status"] == "error"
+    assert set(statuses) == {src.name for src in gov_feeds._SOURCES}
+    # Slow and failed sources still contribute their static listing, marked with their status
+    by_source = {it.get("feed_source"): it for it in items if it.get("feed_source")}
+    assert by_source["isro"]["source_status"] == "timeout"
+    assert by_source["isro"]["description"].startswith("ISRO Careers")
+    assert by_source["aicte"]["description"] == "aicte live description"
+    assert not gov_feeds._is_complete(statuses)
+
+
+def test_global_deadline_cuts_off_slow_sources(monkeypatch):
+    delays = {src.name: 5 for src in gov_feeds._SOURCES}
+    delays["aicte"] = 0.01
+    monkeypatch.setattr(gov_feeds, "_page_meta_async", _fake_meta(delays))
+    started = time.perf_counter()
+    _, statuses = gov_feeds._aggregate_live(force=True, deadline_s=0.3, timeout_s=10)
+    assert time.perf_counter() - started < 1.0
+    assert statuses["aicte"]["status"] == "ok"
+    assert statuses["ncs"]["status"] == "timeout"
+    assert statuses["ncs"]["ms"] < 1000
+
+
+def test_live_endpoint_reports_sources_and_short_ttl_for_partial(monkeypatch):
+    delays = {src.name: 0.01 for src in gov_feeds._SOURCES}
+    delays["barc"] = 30
+    monkeypatch.setattr(gov_feeds, "_page_meta_async", _fake_meta(delays))
+    monkeypatch.setattr(gov_feeds, "_DEADLINE_S", 0.3)
+    client = TestClient(main.app)
+    r = client.post("/api/gov/feeds/live?force=true", json={"limit": 200})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["complete"] is False
+    assert body["sources"]["barc"]["status"] == "timeout"
+    assert any(it.get("feed_source") == "barc" for it in body["results"])
+    info = client.get("/api/gov/feeds/cache-info").json()
+    assert info["sources"]["aicte"]["status"] == "ok" and info["sources"]["aicte"]["fresh"]
+    assert info["expires_at"] - info["cached_at"] <= gov_feeds._PARTIAL_TTL_S + 1
+    assert info["refresh"]["rounds"] >= 1 and info["refresh"]["last_ms"] > 0
+
+
+def test_concurrent_callers_share_one_aggregation(monkeypatch):
+    calls = []
+    monkeypatch.setattr(gov_feeds, "_page_meta_async", _fake_meta({}, calls=calls))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(gov_feeds._get_cached_items())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == 8 and all(results)
+    assert sorted(calls) == sorted(src.name for src in gov_feeds._SOURCES)
+
+
+def test_only_expired_sources_are_refetched(monkeypatch):
+    calls = []
+    delays = {"isro": 30}
+    monkeypatch.setattr(gov_feeds, "_page_meta_async", _fake_meta(delays, calls=calls))
+    monkeypatch.setattr(gov_feeds, "_DEADLINE_S", 0.3)
+    monkeypatch.setattr(gov_feeds, "_PARTIAL_TTL_S", 0.0)
+    monkeypatch.setattr(gov_feeds, "_SOURCE_TTLS", {"ncs": 0.0})
+    gov_feeds._refresh()
+    assert gov_feeds._CACHE["sources"]["isro"]["status"] == "timeout"
+    # isro failed (partial TTL) and ncs has a zero TTL; everything else is still fresh
+    calls.clear()
+    gov_feeds._refresh()
+    assert sorted(calls) == ["isro", "ncs"]
+    assert gov_feeds._REFRESH_STATS["last_fetched"] == ["ncs", "isro"]
+    assert len(gov_feeds._CACHE["items"]) > len(gov_feeds._SOURCES)  # cached sources + seeds still served
+
+
+def test_force_does_not_join_a_normal_refresh(monkeypatch):
+    calls = []
+    monkeypatch.setattr(gov_feeds, "_page_meta_async", _fake_meta({}, calls=calls))
+    gate = threading.Event()
+    # A normal refresh is in flight (held open here) when a forced one arrives
+    normal = gov_feeds._REFRESH_FLIGHTS.submit("gov", lambda: gate.wait(5) and [])
+    forced = []
+    t = threading.Thread(target=lambda: forced.append(gov_feeds._get_cached_items(force=True)))
+    t.start()
+    time.sleep(0.05)
+    gate.set()
+    t.join(5)
+    assert normal.result() == []
+    assert forced and forced[0]  # a real aggregation, not the joined flight's result
+    assert sorted(calls) == sorted(src.name for src in gov_feeds._SOURCES)
+
+
+def test_source_ttls_parse_floats_and_skip_bad_entries():
+    assert gov_feeds._parse_source_ttls(" isro=3600, NCS=0.5 ,") == {"isro": 3600.0, "ncs": 0.5}
+    assert gov_feeds._parse_source_ttls("") == {}
+    for bad in ("isro=0", "isro=-5", "isro=abc", "isro=1h", "isro", "=60", "isro=inf", "isro=nan"):
+        assert gov_feeds._parse_source_ttls(f"{bad},ncs=60") == {"ncs": 60.0}
+
+
+def test_seed_feed_reloads_only_when_file_changes(tmp_path):
+    path = tmp_path / "feeds.json"
+    path.write_text(json.dumps([
+        {"title": "Rajasthan IT Internship", "location": "Jaipur, Rajasthan", "apply_url": "https://rajasthan.gov.in/a", "verified": True},
+        {"title": "Private Data Internship", "location": "Pune", "apply_url": "https://example.com/b", "verified": False},
+    ]))
+    built = []
+
+    def normalize(raw):
+        built.append(raw["title"])
+        return gov_feeds._seed_item(raw)
+
+    feed = SeedFeed(str(path), normalize)
+    assert [it["title"] for it in feed.items(state="rajasthan")] == ["Rajasthan IT Internship"]
+    assert [it["title"] for it in feed.items(only_verified=True)] == ["Rajasthan IT Internship"]
+    assert len(feed.items()) == 2
+    assert len(built) == 2  # normalized once across reads
+    path.write_text(json.dumps([{"title": "Pune Govt Internship", "location": "Pune", "verified": True}]))
+    os.utime(path, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+    assert [it["title"] for it in feed.items(state="pune")] == ["Pune Govt Internship"]
+    assert feed.stats()["loads"] == 2
+
+
+def test_moderation_writes_are_batched_and_atomic(tmp_path):
+    path = tmp_path / "mod.json"
+    store = ModerationStore(str(path), flush_delay_s=60)
+    for i in range(20):
+        store.approve(f"https://x.gov.in/{i}")
+    store.flag("https://spam.example.com/")
+    assert store.decided("https://x.gov.in/3") and store.decided("https://spam.example.com/")
+    assert not path.exists() and store.stats()["pending"] == 21
+    assert store.flush()
+    assert store.stats() == {"approved": 20, "flagged": 1, "pending": 0, "writes": 1, "flush_delay_s": 60.0}
+    assert len(json.loads(path.read_text())["approved"]) == 20
+    assert not [p for p in os.listdir(tmp_path) if p.startswith(".tmp-")]
+    # A hand edit is picked up; local decisions made since are written on top of it
+    path.write_text(json.dumps({"approved": ["https://manual.gov.in/"], "flagged": []}))
+    os.utime(path, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+    store.flag("https://spam2.example.com/")
+    assert store.decided("https://manual.gov.in/") and not store.decided("https://x.gov.in/3")
+    store.flush()
+    assert json.loads(path.read_text()) == {"approved": ["https://manual.gov.in/"], "flagged": ["https://spam2.example.com/"]}
@@ -0,0 +1,27 @@
+import os
+
+from benchmarks.bench_parsers import CASES, FIXTURES
+from scrapers.internshala import _parse_detail_page, _parse_listing
+from utils.html_parsing import make_soup, parser_name
+
+
+def _read(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+def test_strainers_keep_what_the_scrapers_read():
+    for case in CASES:
+        if case["only"] is None:
+            continue
+        markup = _read(case["file"])
+        full = case["count"](make_soup(markup, parser="html.parser"))
+        strained = case["count"](make_soup(markup, case["only"], parser=parser_name()))
+        assert full and full == strained, case["name"]
+
+
+def test_internshala_fixture_parses():
+    rows = _parse_listing(_read("internshala_listing.html"), 50)
+    assert rows and all(r["title"] and r["link"].startswith("https://internshala.com/") for r in rows)
+    detail = _parse_detail_page(_read("internshala_detail.html"))
+    assert detail["description_full"] and detail["skills_required"]
@@ -0,0 +1,85 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import main
+from utils.job_index import JobIndex, stipend_amount
+
+
+def _job(i, title, desc="", location="Bangalore", stipend=None, **extra):
+    return {"title": title, "description": desc, "company": f"Co{i}", "location": location,
+            "stipend": stipend, "apply_url": f"https://example.com/job/{i}?ref=x", "tags": [], **extra}
+
+
+def test_bm25_ranks_title_and_rare_terms_first():
+    idx = JobIndex()
+    idx.add([
+        _job(1, "Marketing Intern", "python mentioned once in passing"),
+        _job(2, "Python Developer Intern", "build apis with python and django"),
+        _job(3, "Data Analyst Intern", "excel and sql"),
+        _job(4, "Backend Intern", "python", skills_required=["Django", "PostgreSQL"]),
+    ])
+    titles = [j["title"] for j in idx.search("python django")]
+    # Both django matches (title / boosted skills) beat a passing mention; no match, no hit
+    assert set(titles[:2]) == {"Python Developer Intern", "Backend Intern"}
+    assert titles[2:] == ["Marketing Intern"]
+    assert idx.search("") == [] and idx.search("the and of") == []
+
+
+def test_upsert_ttl_and_capacity():
+    idx = JobIndex(ttl=100, max_docs=2)
+    idx.add([_job(1, "Python Intern")], now=0)
+    assert idx.add([_job(1, "Python Intern (updated)")], now=50) == 0  # same URL -> replaced
+    assert [j["title"] for j in idx.search("python", now=60)] == ["Python Intern (updated)"]
+    assert idx.search("python", now=151) == []  # expired but not yet pruned
+    assert idx.prune(now=151) == 1 and len(idx) == 0
+
+    idx.add([_job(2, "Java Intern")], now=0)
+    idx.add([_job(3, "Java Developer")], now=10)
+    idx.add([_job(4, "Java Trainee")], now=20)  # over capacity: soonest-to-expire goes
+    assert sorted(j["title"] for j in idx.search("java", now=30)) == ["Java Developer", "Java Trainee"]
+    assert idx.stats()["evicted"] == 1
+
+
+def test_filters_and_results_are_copies():
+    idx = JobIndex()
+    idx.add([
+        _job(1, "Python Intern", location="Bangalore, Karnataka", stipend="₹ 5,000-12,000 /month"),
+        _job(2, "Python Intern", location="Mumbai", stipend="₹ 2,000 /week"),
+        _job(3, "Python Intern", location="Remote", stipend="Unpaid"),
+        _job(4, "Python Intern", location="Bangalore", stipend=None),
+    ])
+    assert {j["company"] for j in idx.search("python", location="bangalore")} == {"Co1", "Co4"}
+    assert {j["company"] for j in idx.search("python", min_stipend=8000)} == {"Co1", "Co2"}
+    assert {j["company"] for j in idx.search("python", paid_only=True)} == {"Co1", "Co2"}
+    idx.search("python")[0]["tags"].append("mutated")
+    assert all(not j["tags"] for j in idx.search("python"))
+    assert stipend_amount("Performance based") is None and stipend_amount("₹ 500 /day") == 15000
+
+
+def test_search_answers_from_local_index(monkeypatch):
+    idx = JobIndex()
+    idx.add([_job(i, f"Python Developer Intern {i}", "python", stipend="₹ 10,000 /month") for i in range(30)])
+    scraped = []
+
+    async def _scraper(query, location, limit):
+        scraped.append(query)
+        await asyncio.sleep(0.5)
+        return []
+
+    monkeypatch.setattr(main, "get_index", lambda: idx)
+    monkeypatch.setattr(main, "fetch_internships_async", _scraper)
+    monkeypatch.setattr(main, "scrape_company_careers_async", None)
+    monkeypatch.setattr(main, "DISABLE_LINKEDIN", True)
+    monkeypatch.setenv("SEARCH_LOCAL_FIRST", "1")
+    monkeypatch.setenv("SEARCH_LOCAL_MIN", "20")
+    monkeypatch.setenv("DUPLICATE_ROLE_LIMIT_N", "0")
+
+    client = TestClient(main.app)
+    r = client.post("/api/search", json={"query": "python", "filters": {"min_stipend": 5000}})
+    assert r.status_code == 200
+    body = r.json()
+    assert len(body) == 30 and all(j["title"].startswith("Python Developer Intern") for j in body)
+    assert scraped  # live scrapes were still dispatched to top up the index
+    r = client.post("/api/search", json={"query": "python", "filters": {"min_stipend": 20000}})
+    assert r.json() == []
@@ -0,0 +1,35 @@
+from utils.keyword_matcher import KeywordMatcher, tokenize
+
+
+def test_whole_word_matching_and_symbols():
+    m = KeywordMatcher(["java", "javascript", "ai", "c++", "node.js", "ci/cd", "machine learning", ""])
+    text = "Maintain JavaScript + Node.js services, C++ tooling and CI/CD; some AI and Machine  Learning."
+    assert m.find(text) == ["javascript", "node.js", "c++", "ci/cd", "ai", "machine learning"]
+    assert "java" not in m.present(text)  # not inside "javascript"
+    assert m.find("") == []
+
+
+def test_overlapping_patterns_and_order():
+    m = KeywordMatcher(["learning", "machine learning", "deep learning", "b c d", "a b c", "b"])
+    assert m.find("deep learning then machine learning") == ["deep learning", "learning", "machine learning"]
+    # shorter patterns ending inside longer ones are still reported
+    assert m.find("a b c d") == ["a b c", "b c d", "b"]
+    assert m.find("a b c d", limit=2) == ["a b c", "b c d"]
+
+
+def test_label_mapping_and_tokenizer():
+    m = KeywordMatcher({"remote": ["remote", "work from home", "wfh"], "stipend": ["₹", "per month"]})
+    assert m.find("₹ 10,000 per month, work from home") == ["stipend", "remote"]
+    assert m.labels_in_order == ["remote", "stipend"]
+    assert tokenize("Node.js, C++") == ["node", ".", "js", ",", "c", "+", "+"]
+
+
+def test_scrapers_use_word_boundaries():
+    from scrapers.internshala import _auto_tags, _calculate_tech_relevance_score
+
+    assert _auto_tags("Maintain the UI; build features") == []  # no "ai"/"it" false positives
+    assert _auto_tags("Remote python developer internship, ₹ 10000 per month") == ["remote", "stipend", "tech", "internship"]
+    for text in ("Information Technology intern", "Emerging technologies", "Technical writer"):
+        assert "tech" in _auto_tags(text), text
+    # "java" no longer double-counts inside "javascript", "hr" not inside "three"
+    assert _calculate_tech_relevance_score("JavaScript Intern", "three months") == 8 + 5
@@ -0,0 +1,54 @@
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+
+import main
+from utils.gemini_client import GeminiClient
+from utils.llm_cache import LLMCache, get_llm_cache, llm_key
+
+
+def test_key_is_canonical_and_cache_bounded():
+    a = llm_key("r", "m", resume={"name": "A", "skills": ["x"]}, job={"title": "T", "company": None})
+    b = llm_key("r", "m ", job={"company": None, "title": "T"}, resume={"skills": ["x"], "name": "A"})
+    assert a == b and a != llm_key("r", "m", resume={"name": "A"}, job={"title": "T"})
+    assert llm_key("r", "m", tags={"b", "a"}) == llm_key("r", "m", tags={"a", "b"})
+
+    cache = LLMCache(max_entries=2, ttl_s=60)
+    cache.put("k1", {"x": [1]})
+    got = cache.get("k1")
+    got["x"].append(2)
+    assert cache.get("k1") == {"x": [1]}
+    cache.put("k2", "two")
+    cache.put("k3", "three")
+    assert cache.get("k1") is None and cache.stats()["evictions"] == 1
+    assert cache.lookup("k3", regenerate=True) is None and cache.lookup("k3") == "three"
+
+    short = LLMCache(ttl_s=0.05)
+    short.put("k", "v")
+    time.sleep(0.1)
+    assert short.get("k") is None
+
+
+def test_cover_letter_cached_until_regenerate(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(1)
+        return httpx.Response(200, json={"candidates": [{"content": {"parts": [{"text": f"Letter #{len(calls)}"}]}}]})
+
+    gem = GeminiClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(main, "GOOGLE_API_KEY", "k")
+    monkeypatch.setattr(main, "get_gemini_client", lambda: gem)
+    client = TestClient(main.app)
+    body = {"resume": {"name": "Neha", "skills": ["python"]}, "job": {"title": "ML Intern", "company": "Zeta"}}
+    first = client.post("/api/messages/cover-letter", json=body).json()
+    second = client.post("/api/messages/cover-letter", json=body).json()
+    assert first["message"] == second["message"] == "Letter #1" and second["cached"] and len(calls) == 1
+    fresh = client.post("/api/messages/cover-letter", json=dict(body, regenerate=True)).json()
+    assert fresh["message"] == "Letter #2" and not fresh["cached"]
+    # The regenerated letter replaces the cached one
+    assert client.post("/api/messages/cover-letter", json=body).json()["message"] == "Letter #2"
+    other = client.post("/api/messages/cover-letter", json=dict(body, mode="linkedin")).json()
+    assert other["message"] == "Letter #3" and len(calls) == 3
+    assert get_llm_cache().stats()["regenerated"] >= 1
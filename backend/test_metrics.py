@@ -0,0 +1,48 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from utils import metrics
+
+client = TestClient(main.app)
+
+
+@pytest.fixture()
+def enabled():
+    metrics.set_enabled(True)
+    metrics.reset()
+    yield
+    metrics.set_enabled(False)
+    metrics.reset()
+
+
+def test_disabled_spans_are_free_and_unrecorded():
+    metrics.set_enabled(False)
+    hist = metrics.histogram("test_noop_seconds", "noop", ("stage",))
+    assert hist.time(stage="a") is hist.time(stage="b")  # shared no-op
+    with hist.time(stage="a"):
+        pass
+    hist.observe(1.0, stage="a")
+    assert hist.snapshot() == {}
+    assert client.get("/metrics").status_code == 404
+
+
+def test_histogram_renders_cumulative_buckets(enabled):
+    hist = metrics.histogram("test_render_seconds", "render", ("stage",), buckets=(0.1, 1.0))
+    hist.observe(0.05, stage="x")
+    hist.observe(0.5, stage="x")
+    hist.observe(5.0, stage="x")
+    text = metrics.render()
+    assert '# TYPE test_render_seconds histogram' in text
+    assert 'test_render_seconds_bucket{stage="x",le="0.1"} 1' in text
+    assert 'test_render_seconds_bucket{stage="x",le="1.0"} 2' in text
+    assert 'test_render_seconds_bucket{stage="x",le="+Inf"} 3' in text
+    assert 'test_render_seconds_count{stage="x"} 3' in text
+
+
+def test_metrics_endpoint_exposes_search_stages(enabled, monkeypatch):
+    monkeypatch.setenv("OFFLINE_MODE", "1")
+    assert client.post("/api/search", json={"query": "python"}).status_code == 200
+    r = client.get("/metrics")
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/plain")
+    assert 'search_stage_seconds_count{stage="serialize"} 1' in r.text
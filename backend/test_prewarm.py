@@ -0,0 +1,138 @@
+from fastapi.testclient import TestClient
+
+import main
+from utils.prewarm import HostBudget, Prewarmer, PrewarmTask, QueryPopularity, parse_seeds
+
+
+def test_popularity_decays_and_ranks():
+    pop = QueryPopularity(half_life_s=100)
+    for _ in range(4):
+        pop.record("Python  Internship", "India", now=0)
+    pop.record("react internship", "India", now=0)
+    assert [q for q, _, _ in pop.top(2, now=0)] == ["python internship", "react internship"]
+    # Three fresh hits beat four that are two half-lives old (4 -> 1)
+    for _ in range(3):
+        pop.record("sql internship", "india", now=200)
+    assert pop.top(1, now=200)[0][:2] == ("sql internship", "india")
+    restored = QueryPopularity(half_life_s=100)
+    restored.load(pop.snapshot(now=200), now=200)
+    assert [q for q, _, _ in restored.top(3, now=200)] == [q for q, _, _ in pop.top(3, now=200)]
+
+
+def test_host_budget_refills():
+    budget = HostBudget(per_minute=2)
+    assert budget.available("internshala.com", now=0)
+    budget.charge("internshala.com", now=0)
+    budget.charge("internshala.com", now=0)
+    assert not budget.available("internshala.com", now=1)
+    assert budget.available("www.linkedin.com", now=1)  # budgets are per host
+    assert budget.available("internshala.com", now=31)
+
+
+def test_host_budget_debt_holds_back_until_repaid():
+    budget = HostBudget(per_minute=6)
+    budget.charge("internshala.com", n=13, now=0)  # one scrape: listing + 12 detail pages
+    assert not budget.available("internshala.com", now=60)  # 6 - 13 + 6 = -1
+    assert budget.available("internshala.com", now=80)
+
+
+def test_round_skips_fresh_and_over_budget():
+    ran = []
+
+    budget = HostBudget(per_minute=3)
+
+    def scrape(q):
+        ran.append(q)
+        budget.charge("internshala.com")  # what the engine hook does per request
+
+    def plan(query, location):
+        return [
+            PrewarmTask("internshala", "internshala.com", f"{query}|a", lambda: False, lambda q=query: scrape(q)),
+            PrewarmTask("internshala", "internshala.com", f"{query}|b", lambda: False, lambda q=query: scrape(q)),
+            PrewarmTask("company", "careers.example.com", "shared", lambda: True, lambda: ran.append("company")),
+        ]
+
+    pop = QueryPopularity()
+    pop.record("python internship", "india")
+    saved = []
+    warmer = Prewarmer(pop, plan, budget, top_n=2,
+                       seeds=parse_seeds("data science internship@Pune"), save=saved.append)
+    assert warmer.targets() == [("python internship", "india"), ("data science internship", "pune")]
+    result = warmer.run_once()
+    assert len(result["dispatched"]) == 3 and result["over_budget"] == 1
+    assert result["fresh"] == 1  # the shared company task is checked once per round
+    assert "company" not in ran and saved and saved[0][0][0] == "python internship"
+
+
+def test_searches_feed_popularity_and_plan_uses_search_cache_keys(monkeypatch):
+    pop = QueryPopularity()
+    monkeypatch.setattr(main, "_POPULAR", pop)
+    monkeypatch.setattr(main, "_search_live", lambda q, loc, profile: [])
+    TestClient(main.app).post("/api/search", json={"query": "Python Internship", "filters": {"location": "Pune"}})
+    assert pop.top(1)[0][:2] == ("python internship", "pune")
+
+    monkeypatch.setattr(main, "DISABLE_LINKEDIN", True)
+    tasks = main._prewarm_plan("python internship", "pune")
+    per_query = int(main.os.getenv("SEARCH_PER_QUERY_LIMIT", "20"))
+    assert main.make_key("Python Internship", "Pune", per_query) in {t.key for t in tasks}
+    assert {t.source for t in tasks} == {"internshala", "company"}
+    assert all(t.host and "/" not in t.host for t in tasks)
+    # Exactly the scrapes an anonymous search dispatches, company pages included
+    queries = main._build_search_queries("python internship", main.resume_profile)
+    dispatched = {(src, main.make_key(*args)) for src, _fn, args in main._scrape_calls(queries, "pune", main.resume_profile)}
+    assert {(t.source, t.key) for t in tasks} == dispatched
+
+
+def test_prewarm_scrape_is_charged_per_http_request(monkeypatch):
+    import asyncio
+    import time
+
+    from scrapers.engine import fetch as engine_fetch
+
+    budget = HostBudget(per_minute=3)
+    monkeypatch.setattr(main, "_PREWARM_BUDGET", budget)
+
+    async def scraper(query, location, limit):
+        # Four requests, three of them from tasks the scrape spawns (like detail pages)
+        async def page(i):
+            try:
+                await engine_fetch(f"http://127.0.0.1:9/{query}/{i}", timeout=0.2, retries=0)
+            except Exception:
+                pass
+        await page(0)
+        await asyncio.gather(*(asyncio.create_task(page(i)) for i in range(1, 4)))
+        return []
+
+    main._prewarm_task("internshala", "127.0.0.1", scraper, "charged", "india", 5).run().result(timeout=10)
+    assert not budget.available("127.0.0.1")  # 3 tokens - 4 requests
+    assert budget.available("127.0.0.1", now=time.time() + 40)
+    budget2 = HostBudget(per_minute=3)
+    monkeypatch.setattr(main, "_PREWARM_BUDGET", budget2)
+    main._scrape_future("internshala", scraper, "uncharged", "india", 5).result(timeout=10)
+    assert budget2.available("127.0.0.1")  # interactive scrapes are not metered
+
+
+def test_company_prewarm_gates_and_charges_the_fetched_api_host(monkeypatch):
+    from scrapers.company_pages import careers_request_host
+
+    assert careers_request_host("https://jobs.lever.co/acme") == "api.lever.co"
+    assert careers_request_host("https://boards.greenhouse.io/acme") == "boards-api.greenhouse.io"
+    assert careers_request_host("https://careers.smartrecruiters.com/Acme") == "api.smartrecruiters.com"
+    assert careers_request_host("https://acme.example.com/careers") == "acme.example.com"
+
+    from scrapers.engine import fetch as engine_fetch
+
+    budget = HostBudget(per_minute=2)
+    monkeypatch.setattr(main, "_PREWARM_BUDGET", budget)
+
+    async def scraper(url, limit):
+        # API request plus a fallback to the careers page on another host
+        for target in ("http://127.0.0.1:9/api", "http://localhost:9/page"):
+            try:
+                await engine_fetch(target, timeout=0.2, retries=0)
+            except Exception:
+                pass
+        return []
+
+    main._prewarm_task("company", "api.lever.co", scraper, "https://jobs.lever.co/acme", 25).run().result(timeout=10)
+    assert not budget.available("api.lever.co")  # both requests drew on the gated key
@@ -0,0 +1,66 @@
+import time
+
+from utils.result_cache import ResultCache, make_key
+
+
+def test_make_key_normalizes():
+    assert make_key("  Python   Developer ", "India", 20) == make_key("python developer", "INDIA", "20")
+
+
+def test_hit_miss_and_ttl(tmp_path):
+    cache = ResultCache(path=str(tmp_path / "c.sqlite3"), ttls={"internshala": 0.2})
+    key = make_key("python", "india", 20)
+    assert cache.get("internshala", key) is None
+    cache.set("internshala", key, [{"title": "Python Intern"}])
+    assert cache.get("internshala", key) == [{"title": "Python Intern"}]
+    time.sleep(0.3)
+    assert cache.get("internshala", key) is None
+    ns = cache.stats()["namespaces"]["internshala"]
+    assert ns["hits"] == 1 and ns["misses"] == 2
+
+
+def test_hits_are_copies():
+    cache = ResultCache(path=None)
+    cache.set("linkedin", "k", [{"tags": []}])
+    first = cache.get("linkedin", "k")
+    first[0]["tags"].append("hot")
+    assert cache.get("linkedin", "k") == [{"tags": []}]
+
+
+def test_memory_budget_evicts_lru():
+    cache = ResultCache(path=None, max_mem_bytes=200)
+    for i in range(10):
+        cache.set("company", str(i), "x" * 50)
+    stats = cache.stats()
+    assert stats["mem_bytes"] <= 200
+    assert stats["namespaces"]["company"]["evictions"] > 0
+    assert cache.get("company", "9") == "x" * 50
+    assert cache.get("company", "0") is None
+
+
+def test_disk_shared_between_instances(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    ResultCache(path=path).set("internshala", "q", [1, 2, 3])
+    other = ResultCache(path=path)
+    assert other.get("internshala", "q") == [1, 2, 3]
+    assert other.stats()["namespaces"]["internshala"]["disk_hits"] == 1
+
+
+def test_disk_tier_is_opt_in(monkeypatch, tmp_path):
+    from utils.result_cache import _cache_from_env
+
+    monkeypatch.delenv("RESULT_CACHE_PATH", raising=False)
+    assert _cache_from_env().stats()["backend"] == "memory"
+    monkeypatch.setenv("RESULT_CACHE_PATH", str(tmp_path / "c.sqlite3"))
+    assert _cache_from_env().stats()["backend"] == "sqlite"
+
+
+def test_clear_resets_stats(tmp_path):
+    cache = ResultCache(path=str(tmp_path / "c.sqlite3"))
+    cache.set("internshala", "q", [1])
+    cache.get("internshala", "q")
+    cache.get("internshala", "missing")
+    cache.clear()
+    st = cache.stats()
+    assert st["mem_entries"] == 0 and st["totals"] == {} and st["disk_errors"] == 0
+    assert cache.get("internshala", "q") is None
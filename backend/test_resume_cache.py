@@ -0,0 +1,31 @@
+from fastapi.testclient import TestClient
+
+import main
+from utils.resume_cache import ResumeCache, get_resume_cache, resume_hash
+from utils.resume_extract import get_extractor
+
+
+def test_lru_bounds_and_copies():
+    cache = ResumeCache(max_entries=2)
+    for i in range(3):
+        cache.put(f"h{i}", {"text": f"resume {i}", "skills": {"sql", "python"}, "roles": []})
+    assert cache.get("h0") is None and cache.stats()["evictions"] == 1
+    rec = cache.get("h2")
+    assert rec["skills"] == ["python", "sql"] and rec["text"] == "resume 2"
+    rec["skills"].append("mutated")
+    assert cache.get("h2")["skills"] == ["python", "sql"]
+
+
+def test_reupload_skips_extraction():
+    client = TestClient(main.app)
+    body = b"Asha Verma\nLocation: Jaipur\nEmail: asha@example.com\nPython, SQL, Docker and React projects"
+    files = {"file": ("resume.txt", body, "text/plain")}
+    first = client.post("/api/upload-resume", files=files, headers={"X-Session-Id": "s-cache"}).json()
+    parsed = get_extractor().stats()["documents"]
+    second = client.post("/api/upload-resume", files=files, headers={"X-Session-Id": "s-cache"}).json()
+    assert get_extractor().stats()["documents"] == parsed
+    assert first == second
+    assert first["resume_hash"] == resume_hash(body)
+    cached = get_resume_cache().get(first["resume_hash"])
+    assert cached["email"] == "asha@example.com"
+    assert set(cached["skills"]) >= {"python", "sql", "docker", "react"}
@@ -0,0 +1,83 @@
+import asyncio
+import io
+import time
+
+import docx
+from fastapi.testclient import TestClient
+
+import main
+from utils.resume_extract import ResumeExtractor, extract_document
+
+
+def _slow_extract(content, filename, max_pages, max_chars):
+    time.sleep(float(content.decode() or 0))
+    return {"text": filename, "tech": [], "truncated": False}
+
+
+def test_extract_document_text_and_docx():
+    out = extract_document(b"Python  and React\n\nDocker, python again", "cv.txt")
+    assert out == {"text": "Python and React Docker, python again", "tech": ["python", "react", "docker"], "truncated": False}
+    buf = io.BytesIO()
+    d = docx.Document()
+    d.add_paragraph("Jane Doe")
+    d.add_paragraph("Skills: SQL, Pandas")
+    d.save(buf)
+    out = extract_document(buf.getvalue(), "cv.DOCX", max_chars=12)
+    assert out["text"] == "Jane Doe Ski" and out["truncated"]
+    assert extract_document(b"not a docx", "cv.docx")["error"].startswith("Failed to parse DOCX")
+
+
+def test_guards_size_busy_and_timeout():
+    ex = ResumeExtractor(workers=1, timeout_s=0.5, max_bytes=16, max_inflight=1, fn=_slow_extract)
+
+    async def run():
+        too_big = await ex.extract(b"x" * 17, "cv.txt")
+        slow = asyncio.ensure_future(ex.extract(b"5", "slow.txt"))
+        await asyncio.sleep(0.05)
+        busy = await ex.extract(b"0", "other.txt")
+        # The loop stays responsive while the worker process is stuck
+        started = time.perf_counter()
+        await asyncio.sleep(0.1)
+        tick = time.perf_counter() - started
+        timed_out = await slow
+        ok = await ex.extract(b"0", "fine.txt")  # the replacement worker serves the next upload
+        return too_big, busy, tick, timed_out, ok
+
+    try:
+        too_big, busy, tick, timed_out, ok = asyncio.run(run())
+    finally:
+        ex.shutdown()
+    assert "too large" in too_big["error"]
+    assert "busy" in busy["error"]
+    assert tick < 0.3
+    assert "too long" in timed_out["error"]
+    assert ok["text"] == "fine.txt"
+    stats = ex.stats()
+    assert (stats["timeouts"], stats["too_large"], stats["rejected_busy"], stats["worker_restarts"]) == (1, 1, 1, 1)
+
+
+def test_timeout_kills_only_the_runaway_worker():
+    ex = ResumeExtractor(workers=2, timeout_s=1.0, fn=_slow_extract)
+
+    async def run():
+        slow = asyncio.ensure_future(ex.extract(b"5", "slow.txt"))
+        await asyncio.sleep(0.5)
+        # Still parsing in the other process when the slow one is killed at t=1.0
+        healthy = await ex.extract(b"0.8", "healthy.txt")
+        return await slow, healthy
+
+    try:
+        slow, healthy = asyncio.run(run())
+    finally:
+        ex.shutdown()
+    assert "too long" in slow["error"]
+    assert healthy["text"] == "healthy.txt"
+    assert ex.stats()["worker_restarts"] == 1 and ex.stats()["errors"] == 0
+
+def test_upload_resume_uses_extractor():
+    client = TestClient(main.app)
+    files = {"file": ("resume.txt", b"Jane Doe\nLocation: Pune\nPython, SQL and Docker projects", "text/plain")}
+    r = client.post("/api/upload-resume", files=files)
+    body = r.json()
+    assert body["success"] and body["location"].startswith("Pune")
+    assert body["skills_count"] >= 3
@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scrapers.engine import ScrapeEngine
+from utils.conditional_http import ValidatorStore
+from utils.http_client import HostPolicies, HostPolicy, PooledSession, parse_host_limits
+from utils.singleflight import SingleFlight
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(0.2)
+            body = b"<html><title>ok</title></html>"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            pass  # client cancelled mid-request
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class _ETagHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = b'{"jobs": [{"title": "Data Intern"}]}'
+    seen_validators = []
+
+    def do_GET(self):
+        etag = '"v1"'
+        type(self).seen_validators.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server_url():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    _SlowHandler.peak = 0
+    yield f"http://127.0.0.1:{srv.server_port}/"
+    srv.shutdown()
+
+
+def test_parse_host_limits():
+    assert parse_host_limits("internshala.com=6, www.linkedin.com=2,bad,x=") == {
+        "internshala.com": 6,
+        "www.linkedin.com": 2,
+    }
+
+
+def test_policies_match_by_domain_suffix():
+    pols = HostPolicies(HostPolicy(limit=3), {"internshala.com": HostPolicy(limit=6, retries=3)})
+    assert pols.resolve("www.internshala.com") == ("internshala.com", pols.hosts["internshala.com"])
+    key, pol = pols.for_url("https://example.org/jobs")
+    assert key == "example.org" and pol.limit == 3
+
+
+def test_per_host_limit_is_respected(server_url):
+    eng = ScrapeEngine(policies=HostPolicies(HostPolicy(limit=2)))
+
+    async def burst():
+        return await asyncio.gather(*(eng.fetch(server_url) for _ in range(6)))
+
+    responses = eng.run_sync(burst(), timeout=10)
+    assert [r.status_code for r in responses] == [200] * 6
+    assert _SlowHandler.peak <= 2
+    assert eng.stats()["requests"] == 6
+
+
+def test_connection_reuse_is_counted(server_url):
+    eng = ScrapeEngine()
+
+    async def sequential():
+        for _ in range(3):
+            await eng.fetch(server_url)
+
+    eng.run_sync(sequential(), timeout=10)
+    host = eng.http_stats.snapshot()["hosts"]["127.0.0.1"]
+    assert host["requests"] == 3
+    assert host["new_connections"] == 1
+
+    session = PooledSession(HostPolicies())
+    for _ in range(3):
+        session.get(server_url)
+    sync_host = session.snapshot()["hosts"]["127.0.0.1"]
+    assert (sync_host["requests"], sync_host["new_connections"]) == (3, 1)
+    session.close()
+
+
+def test_released_flight_cancels_running_request(server_url):
+    eng = ScrapeEngine()
+    flights = SingleFlight(eng)
+
+    async def slow():
+        await eng.fetch(server_url)
+        await asyncio.sleep(5)
+
+    fut = flights.submit("k", slow)
+    time.sleep(0.05)
+    flights.release(fut)
+    time.sleep(0.05)
+    assert fut.cancelled()
+    assert flights.stats()["cancelled"] == 1
+
+
+def test_conditional_get_serves_304_from_stored_body():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _ETagHandler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{srv.server_port}/v1/postings"
+    eng = ScrapeEngine(validators=ValidatorStore())
+    parses = []
+
+    def parse(content):
+        parses.append(content)
+        return {"n": len(content)}
+
+    async def twice():
+        out = []
+        for _ in range(2):
+            resp = await eng.fetch(url)
+            value = await eng.validators.parse_cached_async(resp, "json", parse, stats=eng.http_stats)
+            out.append((resp, value))
+        return out
+
+    try:
+        (first, v1), (second, v2) = eng.run_sync(twice(), timeout=10)
+    finally:
+        srv.shutdown()
+    assert _ETagHandler.seen_validators[-2:] == [None, '"v1"']
+    assert first.status_code == second.status_code == 200
+    assert second.content == first.content and second.json()["jobs"][0]["title"] == "Data Intern"
+    assert second.extensions.get("revalidated") and not first.extensions.get("revalidated")
+    assert v1 == v2 and len(parses) == 1
+    host = eng.http_stats.snapshot()["hosts"]["127.0.0.1"]
+    assert host["not_modified"] == 1
+    assert host["bytes_downloaded"] == host["bytes_saved"] == len(_ETagHandler.body)
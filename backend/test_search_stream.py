@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+import main
+
+client = TestClient(main.app)
+
+
+class _NoCache:
+    def get(self, *a, **k):
+        return None
+
+    def get_with_age(self, *a, **k):
+        return None
+
+    def set(self, *a, **k):
+        pass
+
+
+async def _fast_internshala(query, location, limit):
+    await asyncio.sleep(0.01)
+    return [{
+        "title": f"Python Developer Intern ({query})",
+        "company": "Acme",
+        "location": "India",
+        "apply_url": f"https://example.com/{query.replace(' ', '-')}",
+        "source": "internshala",
+        "tags": ["python"],
+        "description": "python developer",
+    }]
+
+
+async def _slow_company(url, limit):
+    await asyncio.sleep(0.2)
+    return [{"title": "Software Intern", "company": "Beta", "location": "India",
+             "apply_url": url + "#intern", "source": "lever", "tags": [], "description": "software"}]
+
+
+def test_stream_emits_partial_then_final(monkeypatch):
+    monkeypatch.setattr(main, "get_cache", lambda: _NoCache())
+    monkeypatch.setattr(main, "fetch_internships_async", _fast_internshala)
+    monkeypatch.setattr(main, "scrape_company_careers_async", _slow_company)
+
+    r = client.post("/api/search/stream", json={"query": "python"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    frames = [json.loads(line) for line in r.text.splitlines() if line.strip()]
+
+    assert frames[0]["event"] == "start"
+    assert frames[-1]["event"] == "final" and frames[-1]["complete"] is True
+    partial = [f for f in frames if f["event"] == "results"]
+    assert partial and partial[0]["source"] == "internshala"
+    urls = [j["apply_url"] for f in partial for j in f["jobs"]]
+    assert len(urls) == len(set(urls))  # each listing streamed once
+    assert frames[-1]["jobs"]
+
+
+def test_stream_sse_format(monkeypatch):
+    monkeypatch.setenv("OFFLINE_MODE", "1")
+    r = client.post("/api/search/stream?format=sse", json={"query": "python"})
+    assert r.headers["content-type"].startswith("text/event-stream")
+    assert r.text.startswith("event: final\ndata: ")
+
+
+
+def _frames(r):
+    return [json.loads(line) for line in r.text.splitlines() if line.strip()]
+
+
+async def _mixed_stipends(query, location, limit):
+    return [
+        {"title": "Python Intern (paid)", "company": "Acme", "location": "India", "stipend": "₹ 10,000 /month",
+         "apply_url": "https://example.com/paid", "source": "internshala", "tags": [], "description": "python"},
+        {"title": "Python Intern (unpaid)", "company": "Acme", "location": "India", "stipend": "Unpaid",
+         "apply_url": "https://example.com/unpaid", "source": "internshala", "tags": [], "description": "python"},
+    ]
+
+
+def test_stream_applies_min_stipend(monkeypatch):
+    monkeypatch.setattr(main, "get_cache", lambda: _NoCache())
+    monkeypatch.setattr(main, "fetch_internships_async", _mixed_stipends)
+    monkeypatch.setattr(main, "scrape_company_careers_async", None)
+    monkeypatch.setattr(main, "DISABLE_LINKEDIN", True)
+
+    frames = _frames(client.post("/api/search/stream", json={"query": "python", "filters": {"min_stipend": 5000}}))
+    streamed = [j["apply_url"] for f in frames if f["event"] in ("results", "final") for j in f["jobs"]]
+    assert streamed and set(streamed) == {"https://example.com/paid"}
+
+    monkeypatch.setenv("OFFLINE_MODE", "1")
+    frames = _frames(client.post("/api/search/stream", json={"query": "python", "filters": {"min_stipend": 5000}}))
+    assert frames[-1]["event"] == "final" and frames[-1]["jobs"] == []  # sample listings carry no stipend
+
+
+def test_stream_answers_from_local_index(monkeypatch):
+    from utils.job_index import JobIndex
+
+    idx = JobIndex()
+    idx.add([{"title": f"Python Developer Intern {i}", "description": "python", "company": f"Co{i}",
+              "location": "India", "stipend": "₹ 10,000 /month" if i % 2 else "Unpaid",
+              "apply_url": f"https://example.com/local/{i}", "tags": []} for i in range(30)])
+    scraped = []
+
+    async def _scraper(query, location, limit):
+        scraped.append(query)
+        return []
+
+    monkeypatch.setattr(main, "get_cache", lambda: _NoCache())
+    monkeypatch.setattr(main, "get_index", lambda: idx)
+    monkeypatch.setattr(main, "fetch_internships_async", _scraper)
+    monkeypatch.setattr(main, "scrape_company_careers_async", None)
+    monkeypatch.setattr(main, "DISABLE_LINKEDIN", True)
+    monkeypatch.setenv("SEARCH_LOCAL_FIRST", "1")
+    monkeypatch.setenv("DUPLICATE_ROLE_LIMIT_N", "0")
+
+    monkeypatch.setenv("SEARCH_LOCAL_MIN", "20")
+    frames = _frames(client.post("/api/search/stream", json={"query": "python", "filters": {"min_stipend": 5000, "location": "India"}}))
+    assert [f["event"] for f in frames] == ["start", "final"]
+    assert len(frames[-1]["jobs"]) == 15 and frames[-1]["complete"] is True
+    assert scraped  # live scrapes still refresh the index
+
+    # Too few indexed postings: they stream first, then live sources top them up
+    monkeypatch.setenv("SEARCH_LOCAL_MIN", "100")
+    frames = _frames(client.post("/api/search/stream", json={"query": "python", "filters": {"min_stipend": 5000, "location": "India"}}))
+    assert frames[1]["event"] == "results" and frames[1]["source"] == "local" and len(frames[1]["jobs"]) == 15
+    assert len(frames[-1]["jobs"]) == 15
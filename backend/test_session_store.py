@@ -0,0 +1,60 @@
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+from utils.session_store import MemoryBackend, SessionStore, SqliteBackend, decode, encode
+
+
+def _entry(text="python sql"):
+    return {"resume_text": text, "resume_profile": {"skills": {"sql", "python"}, "roles": {"data analyst"}, "location": "Pune"}}
+
+
+def test_compact_roundtrip_restores_sets():
+    blob = encode(_entry("python " * 500))
+    assert blob[:1] == b"z" and len(blob) < 500
+    back = decode(blob)
+    assert back["resume_profile"]["skills"] == {"python", "sql"}
+    assert back["resume_text"].startswith("python")
+
+
+def test_memory_backend_lru_ttl_and_budget():
+    store = SessionStore(MemoryBackend(max_entries=3, max_bytes=10_000), ttl_s=60)
+    for i in range(5):
+        store.set(f"s{i}", _entry())
+        store.get("s0")  # keep s0 hot
+    st = store.stats()
+    assert st["sessions"] == 3 and st["evictions"] == 2
+    assert store.get("s0") is not None and store.get("s1") is None
+    # Byte budget: large entries push older ones out, total stays under the budget
+    for i in range(20):
+        store.set(f"big{i}", _entry("".join(chr(0x4E00 + (i * 97 + j) % 2000) for j in range(3000))))
+    assert store.stats()["bytes"] <= 10_000
+    assert store.get("x" * 500) is None and store.stats()["rejected_ids"] == 1
+
+    short = SessionStore(MemoryBackend(10, 10_000), ttl_s=0.05)
+    short.set("t", _entry())
+    time.sleep(0.1)
+    assert short.get("t") is None and short.stats()["sessions"] == 0
+
+
+def test_sqlite_backend_shared_between_stores(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    a = SessionStore(SqliteBackend(path, max_entries=100), ttl_s=60)
+    b = SessionStore(SqliteBackend(path, max_entries=100), ttl_s=60)
+    a.set("shared", _entry())
+    got = b.get("shared")
+    assert got["resume_profile"]["roles"] == {"data analyst"}
+    b.delete("shared")
+    assert a.get("shared") is None
+
+
+def test_upload_then_profile_via_store():
+    client = TestClient(main.app)
+    sid = client.post("/api/session").json()["session_id"]
+    assert main._get_session_profile(sid) == ("", {"skills": set(), "roles": set(), "location": None})
+    body = b"Ravi Kumar\nLocation: Chennai\nPython, SQL and Docker projects"
+    client.post("/api/upload-resume", files={"file": ("r.txt", body, "text/plain")}, headers={"X-Session-Id": sid})
+    text, profile = main._get_session_profile(sid)
+    assert "Python" in text and {"python", "sql"} <= profile["skills"]
+    assert isinstance(profile["roles"], set)
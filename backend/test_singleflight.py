@@ -0,0 +1,39 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.singleflight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_flight():
+    calls = []
+    gate = threading.Event()
+
+    def work(q):
+        calls.append(q)
+        gate.wait(2)
+        return [q]
+
+    sf = SingleFlight(ThreadPoolExecutor(max_workers=4))
+    futs = [sf.submit(("internshala", "internship|india"), work, "internship") for _ in range(5)]
+    other = sf.submit(("internshala", "python|india"), work, "python")
+    gate.set()
+    assert all(f.result(timeout=2) == ["internship"] for f in futs)
+    assert other.result(timeout=2) == ["python"]
+    assert len(calls) == 2
+    time.sleep(0.05)
+    stats = sf.stats()
+    assert stats["flights"] == 2 and stats["joined"] == 4 and stats["inflight"] == 0
+    assert sorted(r["waiters"] for r in stats["recent"]) == [1, 5]
+
+
+def test_release_cancels_unstarted_abandoned_flight():
+    blocker = threading.Event()
+    sf = SingleFlight(ThreadPoolExecutor(max_workers=1))
+    busy = sf.submit("busy", blocker.wait, 2)
+    queued = sf.submit("queued", lambda: "never")
+    sf.release(queued)
+    blocker.set()
+    busy.result(timeout=2)
+    assert queued.cancelled()
+    assert sf.stats()["cancelled"] == 1
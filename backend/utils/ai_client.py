@@ -0,0 +1,404 @@
+"""Pooled, hedged OpenRouter chat completions with per-model health and an answer cache.
+
+The chat path used to open a fresh connection per model attempt, wait up to
+40 s on each one, and walk the free-model list serially. With the first
+models rate-limited, one chat turn could take minutes.
+
+- One pooled requests.Session: keep-alive and TLS are reused across turns.
+- Hedging: the first model starts at once. If it has not answered after
+  AI_HEDGE_DELAY_S (or it fails), the next model starts, with at most
+  AI_HEDGE requests in flight. The first non-empty answer wins, and the whole
+  turn is bounded by AI_DEADLINE_S. When the turn ends, losing attempts are
+  aborted: queued ones never send their request, and running ones close
+  their response instead of reading it to the end. The attempt pool holds
+  AI_MAX_TURNS * AI_HEDGE workers, so under the expected load a new turn's
+  first attempt does not queue behind other turns' attempts.
+- ModelHealth: a 429 puts a model in cooldown (Retry-After when given,
+  otherwise AI_COOLDOWN_S). Failures and EWMA latency are kept per model, and
+  the fallback list is reordered so cooling, failing and slow models go last.
+- stream(): the same health-ordered fallback for token streaming. Models are
+  tried in turn until one sends its first token; the turn is then committed
+  to it and its deltas are passed through as they arrive.
+- AnswerCache: identical (message, profile hash, mode) prompts are answered
+  from an in-process LRU for AI_CACHE_TTL_S. Like parsed resumes, these
+  answers stay in process and are never written to the shared result cache.
+
+Knobs (env):
+  AI_HEDGE              models in flight at once (default 2; 1 = serial)
+  AI_HEDGE_DELAY_S      seconds before hedging onto the next model (default 2.5)
+  AI_MAX_TURNS          chat turns expected in flight at once; sizes the attempt pool (default 8)
+  AI_DEADLINE_S         overall budget per chat turn (default 45)
+  AI_ATTEMPT_TIMEOUT_S  per-model read timeout (default 25)
+  AI_COOLDOWN_S         cooldown after a 429 without Retry-After (default 60)
+  AI_CACHE_TTL_S        answer cache lifetime (default 900)
+  AI_CACHE_MAX          answers kept (default 512; 0 disables)
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.llm_stream import iter_sse_data, openrouter_deltas
+
+
+def prompt_key(*parts: Any) -> str:
+    """Stable hash of JSON-able prompt parts (sets sorted)."""
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=lambda o: sorted(o) if isinstance(o, (set, frozenset)) else str(o))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """key -> (answer, model, expires_at); LRU-bounded."""
+
+    def __init__(self, max_entries: int = 512, ttl_s: float = 900.0) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_s = float(ttl_s)
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, Tuple[str, Optional[str], float]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: str) -> Optional[Tuple[str, Optional[str]]]:
+        with self._lock:
+            ent = self._data.get(key)
+            if ent is None or ent[2] <= time.time():
+                if ent is not None:
+                    del self._data[key]
+                self._stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return ent[0], ent[1]
+
+    def put(self, key: str, answer: str, model: Optional[str] = None) -> None:
+        if not self.max_entries or not answer or self.ttl_s <= 0:
+            return
+        with self._lock:
+            self._data[key] = (answer, model, time.time() + self.ttl_s)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._data), "max_entries": self.max_entries, "ttl_s": self.ttl_s, **self._stats}
+
+
+class ModelHealth:
+    """Recent 429s, failure streaks and EWMA latency per model."""
+
+    def __init__(self, cooldown_s: float = 60.0, alpha: float = 0.3) -> None:
+        self.cooldown_s = float(cooldown_s)
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._m: Dict[str, Dict[str, Any]] = {}
+
+    def _get(self, model: str) -> Dict[str, Any]:
+        return self._m.setdefault(model, {"ok": 0, "errors": 0, "rate_limited": 0, "streak": 0, "ewma_ms": None, "cool_until": 0.0})
+
+    def success(self, model: str, ms: float) -> None:
+        with self._lock:
+            h = self._get(model)
+            h["ok"] += 1
+            h["streak"] = 0
+            h["ewma_ms"] = ms if h["ewma_ms"] is None else (1 - self.alpha) * h["ewma_ms"] + self.alpha * ms
+            h["cool_until"] = 0.0
+
+    def failure(self, model: str, status: Optional[int] = None, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            h = self._get(model)
+            h["errors"] += 1
+            h["streak"] += 1
+            if status == 429:
+                h["rate_limited"] += 1
+                h["cool_until"] = time.time() + (retry_after if retry_after is not None else self.cooldown_s)
+
+    def order(self, models: List[str]) -> List[str]:
+        """models reordered: cooling down last, then by failure streak, then latency (whole seconds); ties keep config order."""
+        now = time.time()
+        with self._lock:
+            def rank(item: Tuple[int, str]) -> Tuple[int, int, int, int]:
+                pos, model = item
+                h = self._m.get(model)
+                if h is None:
+                    return (0, 0, 0, pos)
+                return (int(h["cool_until"] > now), h["streak"], int((h["ewma_ms"] or 0) // 1000), pos)
+
+            return [m for _, m in sorted(enumerate(models), key=rank)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            return {
+                m: {**{k: v for k, v in h.items() if k != "cool_until"}, "cooldown_s": max(0.0, round(h["cool_until"] - now, 1))}
+                for m, h in self._m.items()
+            }
+
+
+def _retry_after(resp: Optional[requests.Response]) -> Optional[float]:
+    try:
+        return float(resp.headers.get("retry-after")) if resp is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class OpenRouterClient:
+    """Races up to `hedge` models per turn over one pooled session."""
+
+    def __init__(
+        self,
+        hedge: int = 2,
+        hedge_delay_s: float = 2.5,
+        deadline_s: float = 45.0,
+        attempt_timeout_s: float = 25.0,
+        health: Optional[ModelHealth] = None,
+        cache: Optional[AnswerCache] = None,
+        session: Optional[requests.Session] = None,
+        max_turns: int = 8,
+    ) -> None:
+        self.hedge = max(1, int(hedge))
+        self.hedge_delay_s = max(0.0, float(hedge_delay_s))
+        self.deadline_s = float(deadline_s)
+        self.attempt_timeout_s = float(attempt_timeout_s)
+        self.health = health or ModelHealth()
+        self.cache = cache or AnswerCache()
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(4, max_turns * self.hedge))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+        # One worker per attempt of every expected concurrent turn (see AI_MAX_TURNS)
+        self.max_turns = max(1, int(max_turns))
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_turns * self.hedge, thread_name_prefix="openrouter")
+        self._stats_lock = threading.Lock()
+        self._stats = {"turns": 0, "attempts": 0, "hedged": 0, "aborted": 0, "deadline_exceeded": 0, "streams": 0}
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _attempt(
+        self, base: str, headers: Dict[str, str], payload: Dict[str, Any], model: str, timeout: float, timer: Any,
+        abort: threading.Event,
+    ) -> Optional[str]:
+        if abort.is_set():
+            return None  # the turn ended while this attempt was queued
+        started = time.perf_counter()
+        resp: Optional[requests.Response] = None
+        try:
+            if timer is not None:
+                with timer.time(model=model):
+                    resp = self._post(base, headers, payload, model, timeout, abort)
+            else:
+                resp = self._post(base, headers, payload, model, timeout, abort)
+            if resp is None:
+                return None
+            resp.raise_for_status()
+            choices = resp.json().get("choices") or []
+            content = (choices[0].get("message") or {}).get("content") if choices else None
+        except Exception:
+            if abort.is_set():
+                return None  # lost the race; its error says nothing about the model
+            self.health.failure(model, getattr(resp, "status_code", None), _retry_after(resp))
+            raise
+        if not content:
+            self.health.failure(model)
+            return None
+        self.health.success(model, (time.perf_counter() - started) * 1000)
+        return content
+
+    def _post(
+        self, base: str, headers: Dict[str, str], payload: Dict[str, Any], model: str, timeout: float, abort: threading.Event,
+    ) -> Optional[requests.Response]:
+        """POST with the body read in chunks; None (connection dropped) once the turn is over."""
+        resp = self.session.post(base, json=dict(payload, model=model), headers=headers, timeout=(5.0, timeout), stream=True)
+        try:
+            body = []
+            for chunk in resp.iter_content(chunk_size=8192):
+                if abort.is_set():
+                    self._count("aborted")
+                    return None
+                body.append(chunk)
+            resp._content = b"".join(body)  # json()/text read the buffered body as usual
+        finally:
+            resp.close()
+        return resp
+
+    def complete(
+        self,
+        base: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        models: List[str],
+        timer: Any = None,
+        on_error: Optional[Callable[[str, BaseException], None]] = None,
+    ) -> Optional[Tuple[str, str]]:
+        """(content, model) from the first model to answer, or None when all failed or the deadline passed."""
+        self._count("turns")
+        queue = self.health.order(models)
+        deadline = time.monotonic() + self.deadline_s
+        running: Dict[concurrent.futures.Future, str] = {}
+        abort = threading.Event()
+
+        def launch() -> None:
+            model = queue.pop(0)
+            timeout = max(1.0, min(self.attempt_timeout_s, deadline - time.monotonic()))
+            if running:
+                self._count("hedged")
+            self._count("attempts")
+            running[self._pool.submit(self._attempt, base, headers, payload, model, timeout, timer, abort)] = model
+
+        try:
+            if queue:
+                launch()
+            return self._race(running, queue, launch, deadline, on_error)
+        finally:
+            # Free the pool for other turns: losers stop reading and drop their connection
+            abort.set()
+            for fut in running:
+                fut.cancel()
+
+    def _race(
+        self,
+        running: Dict[concurrent.futures.Future, str],
+        queue: List[str],
+        launch: Callable[[], None],
+        deadline: float,
+        on_error: Optional[Callable[[str, BaseException], None]],
+    ) -> Optional[Tuple[str, str]]:
+        while running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._count("deadline_exceeded")
+                return None
+            can_hedge = bool(queue) and len(running) < self.hedge
+            wait_s = min(remaining, self.hedge_delay_s) if can_hedge else remaining
+            done, _ = concurrent.futures.wait(list(running), timeout=wait_s, return_when=concurrent.futures.FIRST_COMPLETED)
+            for fut in done:
+                model = running.pop(fut)
+                try:
+                    content = fut.result()
+                except Exception as e:
+                    if on_error is not None:
+                        on_error(model, e)
+                    content = None
+                if content:
+                    return content, model
+            # A failure frees its slot at once; a slow model gets company after the hedge delay
+            if done:
+                if queue and len(running) < self.hedge:
+                    launch()
+            elif can_hedge:
+                launch()
+        return None
+
+    def stream(
+        self,
+        base: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        models: List[str],
+        timer: Any = None,
+        on_error: Optional[Callable[[str, BaseException], None]] = None,
+    ) -> Iterator[Tuple[str, str]]:
+        """(model, text delta) pairs from the first model that starts answering; nothing when all fail.
+
+        Upstream is read only as fast as the caller consumes, so a slow client
+        slows the upstream read instead of buffering the completion.
+        """
+        self._count("streams")
+        deadline = time.monotonic() + self.deadline_s
+        headers = dict(headers, Accept="text/event-stream")
+        for model in self.health.order(models):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._count("deadline_exceeded")
+                return
+            self._count("attempts")
+            started = time.perf_counter()
+            resp: Optional[requests.Response] = None
+            try:
+                resp = self.session.post(
+                    base,
+                    json=dict(payload, model=model, stream=True),
+                    headers=headers,
+                    timeout=(5.0, max(1.0, min(self.attempt_timeout_s, remaining))),
+                    stream=True,
+                )
+                resp.raise_for_status()
+                deltas = openrouter_deltas(iter_sse_data(resp.iter_lines(chunk_size=256)))
+                first = next(deltas, None)
+            except Exception as e:
+                self.health.failure(model, getattr(resp, "status_code", None), _retry_after(resp))
+                if resp is not None:
+                    resp.close()
+                if on_error is not None:
+                    on_error(model, e)
+                continue
+            if first is None:
+                self.health.failure(model)
+                resp.close()
+                continue
+            # Health latency for streams is time to first token
+            ttft = time.perf_counter() - started
+            self.health.success(model, ttft * 1000)
+            if timer is not None:
+                timer.observe(ttft, model=model)
+            try:
+                yield model, first
+                for delta in deltas:
+                    yield model, delta
+            except Exception as e:
+                # Mid-stream failure: the tokens already sent cannot be taken back, so stop here
+                if on_error is not None:
+                    on_error(model, e)
+            finally:
+                resp.close()
+            return
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            counters = dict(self._stats)
+        return {
+            "hedge": self.hedge,
+            "hedge_delay_s": self.hedge_delay_s,
+            "deadline_s": self.deadline_s,
+            "max_turns": self.max_turns,
+            **counters,
+            "models": self.health.snapshot(),
+            "cache": self.cache.stats(),
+        }
+
+
+_CLIENT: Optional[OpenRouterClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client() -> OpenRouterClient:
+    """Process-wide client, configured from env on first chat."""
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = OpenRouterClient(
+                    hedge=int(os.getenv("AI_HEDGE", "2")),
+                    hedge_delay_s=float(os.getenv("AI_HEDGE_DELAY_S", "2.5")),
+                    deadline_s=float(os.getenv("AI_DEADLINE_S", "45")),
+                    attempt_timeout_s=float(os.getenv("AI_ATTEMPT_TIMEOUT_S", "25")),
+                    max_turns=int(os.getenv("AI_MAX_TURNS", "8")),
+                    health=ModelHealth(cooldown_s=float(os.getenv("AI_COOLDOWN_S", "60"))),
+                    cache=AnswerCache(
+                        max_entries=int(os.getenv("AI_CACHE_MAX", "512")),
+                        ttl_s=float(os.getenv("AI_CACHE_TTL_S", "900")),
+                    ),
+                )
+    return _CLIENT
@@ -0,0 +1,195 @@
+"""Batch scoring primitives for recommendations.
+
+A per-job ranker asks "does resume term t occur in job text j?" once per term
+per job. TermIndex answers that for all jobs at once, which is what lets
+utils.recommender.rank_internships score large batches cheaply:
+
+- All job texts are joined into one corpus, separated by NUL, so no term can
+  span two jobs.
+- For each term, the matching job indices are found in one pass.
+  - With NumPy, the corpus is a UTF-8 byte array whose offsets are sorted by
+    byte value once. A term starts from the offsets of its rarest byte, the
+    other bytes are checked only there, and the surviving offsets are mapped
+    to jobs with searchsorted.
+  - Without NumPy, str.find skips ahead to the next job after each hit.
+- presence() stacks these into a terms x jobs boolean matrix. count() and
+  any() reduce it to per-job vectors that the scorer combines with array
+  arithmetic.
+
+Matching is plain substring containment, exactly like the `term in text`
+checks it replaces, so scores (and therefore rankings) are unchanged.
+Vectors are NumPy arrays when NumPy is installed, otherwise a small list-backed
+stand-in (Vec) supporting the same arithmetic, so the scorer is written once.
+"""
+from __future__ import annotations
+
+import bisect
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class Vec(list):
+    """Elementwise float vector used when NumPy is unavailable."""
+
+    def _zip(self, other: Any, fn) -> "Vec":
+        if isinstance(other, list):
+            return Vec(fn(a, b) for a, b in zip(self, other))
+        return Vec(fn(a, other) for a in self)
+
+    def __add__(self, other):  # type: ignore[override]
+        return self._zip(other, lambda a, b: a + b)
+
+    def __radd__(self, other):
+        return Vec(other + a for a in self)
+
+    def __mul__(self, other):  # type: ignore[override]
+        return self._zip(other, lambda a, b: a * b)
+
+    def __rmul__(self, other):  # type: ignore[override]
+        return Vec(other * a for a in self)
+
+    def __truediv__(self, other):
+        return self._zip(other, lambda a, b: a / b)
+
+
+class _PyOps:
+    """The handful of NumPy functions the scorer uses, over Vec."""
+
+    @staticmethod
+    def asarray(xs: Iterable[Any], dtype: Any = float) -> Vec:
+        return Vec(dtype(x) for x in xs)
+
+    @staticmethod
+    def zeros(n: int) -> Vec:
+        return Vec([0.0] * n)
+
+    @staticmethod
+    def minimum(a: Any, b: Any) -> Vec:
+        return a._zip(b, min) if isinstance(a, Vec) else Vec(min(a, x) for x in b)
+
+    @staticmethod
+    def maximum(a: Any, b: Any) -> Vec:
+        return a._zip(b, max) if isinstance(a, Vec) else Vec(max(a, x) for x in b)
+
+    @staticmethod
+    def where(cond: Sequence[Any], a: Any, b: Any) -> Vec:
+        pick = lambda v, i: v[i] if isinstance(v, list) else v  # noqa: E731
+        return Vec(pick(a, i) if c else pick(b, i) for i, c in enumerate(cond))
+
+
+class TermIndex:
+    """Substring-presence index over a batch of job texts."""
+
+    def __init__(self, texts: Sequence[str], use_numpy: Optional[bool] = None) -> None:
+        self.size = len(texts)
+        self.use_numpy = np is not None if use_numpy is None else bool(use_numpy and np is not None)
+        self.ops: Any = np if self.use_numpy else _PyOps
+        clean = [t.replace("\x00", " ") for t in texts]
+        self._starts: List[int] = []
+        pos = 0
+        for t in clean:
+            self._starts.append(pos)
+            pos += len(t) + 1
+        self._corpus = "\x00".join(clean)
+        self._memo: Dict[str, Sequence[int]] = {}
+        if self.use_numpy:
+            # UTF-8 is self-synchronizing, so byte-level substring hits are exactly
+            # the str-level ones; NUL bytes only occur at the job separators.
+            self._codes = np.frombuffer(self._corpus.encode("utf-8", "surrogatepass"), dtype=np.uint8)
+            # Offsets of every byte value, grouped by value and ascending within a group
+            self._by_byte = np.argsort(self._codes, kind="stable")
+            self._byte_count = np.bincount(self._codes, minlength=256)
+            self._byte_start = np.concatenate(([0], np.cumsum(self._byte_count)))
+            self._np_starts = np.concatenate(([0], self._by_byte[: self._byte_count[0]] + 1))
+
+    def jobs_with(self, term: str) -> Sequence[int]:
+        """Sorted indices of the jobs whose text contains term (empty term: none)."""
+        hit = self._memo.get(term)
+        if hit is None:
+            if not term or "\x00" in term or not self.size:
+                hit = []
+            elif self.use_numpy:
+                hit = self._jobs_with_numpy(term)
+            else:
+                hit = self._jobs_with_find(term)
+            self._memo[term] = hit
+        return hit
+
+    def _jobs_with_find(self, term: str) -> List[int]:
+        out: List[int] = []
+        starts, find = self._starts, self._corpus.find
+        pos = 0
+        while True:
+            at = find(term, pos)
+            if at < 0:
+                return out
+            job = bisect.bisect_right(starts, at) - 1
+            out.append(job)
+            if job + 1 >= len(starts):
+                return out
+            pos = starts[job + 1]  # one hit per job is enough
+
+    def _jobs_with_numpy(self, term: str):
+        codes = self._codes
+        pat = np.frombuffer(term.encode("utf-8", "surrogatepass"), dtype=np.uint8)
+        last = len(codes) - len(pat)
+        if last < 0:
+            return []
+        # Start from the offsets of the term's rarest byte, then check the other bytes there
+        order = np.argsort(self._byte_count[pat], kind="stable")
+        first = int(order[0])
+        b = pat[first]
+        cand = self._by_byte[self._byte_start[b]: self._byte_start[b + 1]] - first
+        cand = cand[(cand >= 0) & (cand <= last)]
+        for k in order[1:]:
+            if not cand.size:
+                break
+            cand = cand[codes[cand + k] == pat[k]]
+        if not cand.size:
+            return []
+        jobs = np.searchsorted(self._np_starts, cand, side="right") - 1
+        return jobs[np.concatenate(([True], jobs[1:] != jobs[:-1]))]
+
+    def presence(self, terms: Sequence[str]):
+        """len(terms) x size boolean matrix (list of per-term bool rows without NumPy)."""
+        if self.use_numpy:
+            mat = np.zeros((len(terms), self.size), dtype=bool)
+            for row, term in enumerate(terms):
+                mat[row, self.jobs_with(term)] = True
+            return mat
+        rows = []
+        for term in terms:
+            row = [False] * self.size
+            for j in self.jobs_with(term):
+                row[j] = True
+            rows.append(row)
+        return rows
+
+    def count(self, terms: Iterable[str]):
+        """Per job: how many of the distinct terms occur in its text."""
+        uniq = list(dict.fromkeys(terms))
+        if self.use_numpy:
+            return self.presence(uniq).sum(axis=0) if uniq else np.zeros(self.size, dtype=np.int64)
+        counts = [0] * self.size
+        for term in uniq:
+            for j in self.jobs_with(term):
+                counts[j] += 1
+        return Vec(counts)
+
+    def any(self, terms: Iterable[str]):
+        """Per job: 1.0 if any term occurs in its text, else 0.0."""
+        hits = self.count(terms)
+        if self.use_numpy:
+            return (hits > 0).astype(float)
+        return Vec(1.0 if h else 0.0 for h in hits)
+
+    def to_list(self, vec: Any) -> List[float]:
+        return vec.tolist() if self.use_numpy else list(vec)
@@ -0,0 +1,195 @@
+"""Conditional GETs for scrapes: ETag / Last-Modified revalidation.
+
+Gov portal pages, ATS JSON boards and Internshala listings rarely change
+between scrapes, yet they were downloaded and parsed in full every time.
+
+- ValidatorStore keeps, per URL, the validators of the last 200 response and
+  its body (a memory LRU bounded by a byte budget).
+- The scrape engine sends If-None-Match / If-Modified-Since when it has
+  validators. A 304 answer is turned back into a 200 built from the stored
+  body, so callers see no difference. resp.extensions["revalidated"] is True.
+- parse_cached() memoizes a caller's parse of that body. A revalidated
+  response skips the parse too.
+
+Savings are recorded per host in the engine's HttpStats: not_modified (304s),
+bytes_downloaded / bytes_saved, and parse_ms_saved.
+
+Knobs (env):
+  CONDITIONAL_HTTP_DISABLE      1 to send plain GETs and store nothing
+  CONDITIONAL_HTTP_MEM_MB       body store budget in MB (default 16)
+  CONDITIONAL_HTTP_MAX_BODY_KB  larger bodies are not stored (default 2048)
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+# Headers kept with a stored body; the rest (encoding, length, cookies) describe the original transfer
+_KEEP_HEADERS = ("content-type", "etag", "last-modified", "cache-control", "date")
+
+
+class _Entry:
+    __slots__ = ("etag", "last_modified", "content", "headers", "stored_at", "parsed")
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], content: bytes, headers: Dict[str, str]) -> None:
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content = content
+        self.headers = headers
+        self.stored_at = time.time()
+        self.parsed: Dict[Any, Any] = {}  # (name, args) -> (value, parse_ms)
+
+
+class ValidatorStore:
+    """Per-URL validators + last body, LRU-bounded by total body bytes."""
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, max_body_bytes: int = 2 * 1024 * 1024, enabled: bool = True) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.max_body_bytes = max(0, int(max_body_bytes))
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, url: str) -> Optional[_Entry]:
+        with self._lock:
+            ent = self._entries.get(url)
+            if ent is not None:
+                self._entries.move_to_end(url)
+            return ent
+
+    def request_headers(self, url: str, headers: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+        """headers plus validators for url (unless the caller already set its own)."""
+        ent = self._get(url) if self.enabled else None
+        if ent is None:
+            return headers
+        out = dict(headers or {})
+        names = {k.lower() for k in out}
+        if ent.etag and "if-none-match" not in names:
+            out["If-None-Match"] = ent.etag
+        if ent.last_modified and "if-modified-since" not in names:
+            out["If-Modified-Since"] = ent.last_modified
+        return out
+
+    def on_response(self, url: str, resp: httpx.Response, stats: Any = None, host: Optional[str] = None) -> httpx.Response:
+        """Store validators from a 200; replace a 304 with the stored body. Returns what the caller should see."""
+        host = host or (urlparse(url).hostname or "").lower()
+        if resp.status_code == 304:
+            ent = self._get(url)
+            if ent is None:
+                return resp
+            if stats is not None:
+                stats.record(host, "not_modified")
+                stats.record(host, "bytes_saved", len(ent.content))
+            return httpx.Response(
+                200,
+                headers=ent.headers,
+                content=ent.content,
+                request=resp.request,
+                extensions={"revalidated": True, "source_url": url},
+            )
+        content = resp.content
+        if stats is not None:
+            stats.record(host, "bytes_downloaded", len(content))
+        resp.extensions = {**resp.extensions, "source_url": url}
+        if not self.enabled or resp.status_code != 200:
+            return resp
+        etag, last_mod = resp.headers.get("etag"), resp.headers.get("last-modified")
+        if not (etag or last_mod):
+            self.forget(url)  # the server stopped sending validators; do not revalidate stale ones
+            return resp
+        if len(content) > self.max_body_bytes:
+            self.forget(url)
+            return resp
+        headers = {k: resp.headers[k] for k in _KEEP_HEADERS if k in resp.headers}
+        ent = _Entry(etag, last_mod, content, headers)
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self._bytes -= len(old.content)
+            self._entries[url] = ent
+            self._bytes += len(content)
+            while self._bytes > self.max_bytes and self._entries:
+                _, ev = self._entries.popitem(last=False)
+                self._bytes -= len(ev.content)
+        return resp
+
+    def forget(self, url: str) -> None:
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self._bytes -= len(old.content)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def parse_cached(self, resp: httpx.Response, name: str, fn: Callable[..., Any], *args: Any, stats: Any = None) -> Any:
+        """fn(resp.content, *args), memoized per URL while the body is unchanged.
+
+        On a revalidated response the previous result is returned (as a deep
+        copy, so callers may mutate it) and the parse time it took is recorded
+        as saved.
+        """
+        url = resp.extensions.get("source_url") or str(resp.request.url)
+        ent = self._get(url) if self.enabled else None
+        if ent is not None and ent.content is not resp.content and ent.content != resp.content:
+            ent = None  # not the body we stored (too large, no validators, or replaced since)
+        memo_key = (name, args)
+        if ent is not None and resp.extensions.get("revalidated") and memo_key in ent.parsed:
+            value, ms = ent.parsed[memo_key]
+            if stats is not None:
+                stats.record((urlparse(url).hostname or "").lower(), "parse_ms_saved", int(round(ms)))
+            return copy.deepcopy(value)
+        started = time.perf_counter()
+        value = fn(resp.content, *args)
+        if ent is not None:
+            ent.parsed[memo_key] = (copy.deepcopy(value), (time.perf_counter() - started) * 1000)
+        return value
+
+    async def parse_cached_async(self, resp: httpx.Response, name: str, fn: Callable[..., Any], *args: Any, stats: Any = None) -> Any:
+        """parse_cached() with the parse itself run off the event loop."""
+        return await asyncio.to_thread(self.parse_cached, resp, name, fn, *args, stats=stats)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "urls": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "0").lower() in {"1", "true", "yes", "on"}
+
+
+_STORE: Optional[ValidatorStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_validators() -> ValidatorStore:
+    """Process-wide store, configured from env on first use."""
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = ValidatorStore(
+                    max_bytes=int(float(os.getenv("CONDITIONAL_HTTP_MEM_MB", "16")) * 1024 * 1024),
+                    max_body_bytes=int(float(os.getenv("CONDITIONAL_HTTP_MAX_BODY_KB", "2048")) * 1024),
+                    enabled=not _env_flag("CONDITIONAL_HTTP_DISABLE"),
+                )
+    return _STORE
@@ -0,0 +1,361 @@
+"""Shared async Gemini (Generative Language API) client.
+
+Cover letters, mock interviews, resume analysis and portfolio enrichment all
+called a blocking helper that used a new connection per call. It handled a
+429 with one time.sleep(1.0) retry that held a threadpool worker. A burst of
+clicks tied up the workers and then failed together.
+
+Like the scrape engine (scrapers/engine.py), GeminiClient owns a background
+event loop with one pooled httpx.AsyncClient. Every call goes through:
+
+- a concurrency slot: at most GEMINI_MAX_CONCURRENCY requests in flight.
+  Callers beyond that wait in FIFO order. At most GEMINI_MAX_QUEUE may wait,
+  for at most GEMINI_QUEUE_TIMEOUT_S; past either limit GeminiBusy is raised,
+  and the routes fall back to their templates instead of piling up.
+- a token bucket sized to the quota (GEMINI_RPM requests per minute, bursts of
+  GEMINI_BURST), served first come, first served. A 429 drains the bucket for
+  the Retry-After period, so queued callers slow down together instead of
+  each hitting the limit.
+- retries on 429 / 5xx / connection errors with jittered exponential backoff
+  (Retry-After wins when the server sends it).
+
+Async code awaits generate() / aopen_stream(). Sync code (threadpool handlers)
+uses generate_sync() / open_stream_sync().
+
+Knobs (env):
+  GEMINI_RPM               requests per minute (default 60; 0 = no rate limit)
+  GEMINI_BURST             bucket size (default 5)
+  GEMINI_MAX_CONCURRENCY   requests in flight (default 4)
+  GEMINI_MAX_QUEUE         callers waiting for a slot (default 64)
+  GEMINI_QUEUE_TIMEOUT_S   longest wait for a slot (default 30)
+  GEMINI_TIMEOUT_S         per-request read timeout (default 40)
+  GEMINI_MAX_RETRIES       retries per call (default 3)
+  GEMINI_BACKOFF_S         first backoff, doubled per retry with jitter (default 1.0)
+  GEMINI_BACKOFF_MAX_S     backoff cap (default 16)
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextlib
+import os
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+import httpx
+
+GEMINI_BASE = "https://generativelanguage.googleapis.com/v1beta"
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_END = object()
+
+
+class GeminiError(Exception):
+    """A Gemini call failed (status is the HTTP status when there was one)."""
+
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class GeminiBusy(GeminiError):
+    """Too many callers already waiting; try again later."""
+
+
+class TokenBucket:
+    """rate_per_min requests per minute with bursts of `burst`; waiters are served in arrival order."""
+
+    def __init__(self, rate_per_min: float, burst: int = 5) -> None:
+        self.rate = max(0.0, float(rate_per_min)) / 60.0
+        self.capacity = float(max(1, int(burst)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()  # asyncio.Lock wakes waiters FIFO
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """Take one token, waiting for it if needed; returns seconds waited."""
+        if not self.rate:
+            return 0.0
+        async with self._lock:
+            self._refill()
+            waited = 0.0
+            if self.tokens < 1:
+                waited = (1 - self.tokens) / self.rate
+                await asyncio.sleep(waited)
+                self._refill()
+            self.tokens -= 1
+            return waited
+
+    def penalize(self, seconds: float) -> None:
+        """Issue nothing for `seconds` (e.g. after a 429)."""
+        if not self.rate:
+            return
+        self._refill()
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+def _retry_after(resp: httpx.Response) -> Optional[float]:
+    try:
+        return max(0.0, float(resp.headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+
+class GeminiClient:
+    """Owns the Gemini event loop, the pooled client, the limiter and the queue."""
+
+    def __init__(
+        self,
+        rpm: float = 60,
+        burst: int = 5,
+        max_concurrency: int = 4,
+        max_queue: int = 64,
+        queue_timeout_s: float = 30.0,
+        timeout_s: float = 40.0,
+        max_retries: int = 3,
+        backoff_s: float = 1.0,
+        backoff_max_s: float = 16.0,
+        base_url: str = GEMINI_BASE,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_queue = max(0, int(max_queue))
+        self.queue_timeout_s = float(queue_timeout_s)
+        self.timeout_s = float(timeout_s)
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_s = float(backoff_s)
+        self.backoff_max_s = float(backoff_max_s)
+        self.base_url = base_url.rstrip("/")
+        self.bucket = TokenBucket(rpm, burst)
+        self._transport = transport
+        self._sem = asyncio.Semaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._waiting = 0
+        self._active = 0
+        self._stats = {"calls": 0, "streams": 0, "retries": 0, "rate_limited": 0, "errors": 0, "busy": 0, "throttle_wait_ms": 0}
+
+    # --- loop management (same shape as ScrapeEngine) ---
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    started = threading.Event()
+                    t = threading.Thread(target=self._run_loop, args=(loop, started), name="gemini-client", daemon=True)
+                    t.start()
+                    started.wait()
+                    self._thread = t
+                    self._loop = loop
+        return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        loop.run_forever()
+
+    def _in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def _submit(self, coro: Any) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def _run_sync(self, coro: Any) -> Any:
+        if self._in_loop_thread():
+            raise RuntimeError("sync Gemini call from the Gemini loop; await the coroutine instead")
+        return self._submit(coro).result()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_concurrency * 2, max_keepalive_connections=self.max_concurrency),
+                timeout=httpx.Timeout(self.timeout_s, connect=5.0),
+                transport=self._transport,
+            )
+        return self._client
+
+    # --- admission ---
+    @contextlib.asynccontextmanager
+    async def _slot(self):
+        if not self._sem.locked():
+            await self._sem.acquire()  # free slot: taken without suspending
+        else:
+            if self._waiting >= self.max_queue:
+                self._stats["busy"] += 1
+                raise GeminiBusy("Gemini queue is full", 503)
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._sem.acquire(), self.queue_timeout_s)
+            except asyncio.TimeoutError:
+                self._stats["busy"] += 1
+                raise GeminiBusy("Timed out waiting for a Gemini slot", 503) from None
+            finally:
+                self._waiting -= 1
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._sem.release()
+
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: uniform in [base/2, base] with base = backoff_s * 2^attempt, capped."""
+        base = min(self.backoff_max_s, self.backoff_s * (2 ** attempt))
+        return random.uniform(base / 2, base)
+
+    async def _send(self, model: str, payload: Dict[str, Any], key: str, stream: bool) -> httpx.Response:
+        """POST with limiter + retries; a streamed response is returned open (the caller closes it)."""
+        model = (model or "gemini-2.5-flash").strip()
+        url = f"{self.base_url}/models/{model}:" + ("streamGenerateContent?alt=sse" if stream else "generateContent")
+        client = self._get_client()
+        attempt = 0
+        while True:
+            waited = await self.bucket.acquire()
+            self._stats["throttle_wait_ms"] += int(waited * 1000)
+            retry_after: Optional[float] = None
+            try:
+                req = client.build_request("POST", url, json=payload, headers={"x-goog-api-key": key})
+                resp = await client.send(req, stream=stream)
+            except httpx.TransportError as e:
+                status, err = None, GeminiError(f"{type(e).__name__}: {e}")
+            else:
+                if resp.status_code < 400:
+                    return resp
+                body = (await resp.aread())[:300].decode("utf-8", "replace")
+                await resp.aclose()
+                status, retry_after = resp.status_code, _retry_after(resp)
+                err = GeminiError(f"HTTP {status}: {body}", status)
+                if status == 429:
+                    self._stats["rate_limited"] += 1
+                    self.bucket.penalize(retry_after if retry_after is not None else self._backoff(attempt))
+            if (status is not None and status not in _RETRY_STATUSES) or attempt >= self.max_retries:
+                self._stats["errors"] += 1
+                raise err
+            delay = retry_after if retry_after is not None else self._backoff(attempt)
+            attempt += 1
+            self._stats["retries"] += 1
+            await asyncio.sleep(min(delay, self.backoff_max_s))
+
+    async def _generate(self, model: str, payload: Dict[str, Any], key: str) -> Dict[str, Any]:
+        self._stats["calls"] += 1
+        async with self._slot():
+            resp = await self._send(model, payload, key, stream=False)
+            try:
+                return resp.json()
+            except ValueError as e:
+                self._stats["errors"] += 1
+                raise GeminiError(f"invalid JSON from Gemini: {e}") from None
+
+    async def _stream_lines(self, model: str, payload: Dict[str, Any], key: str):
+        self._stats["streams"] += 1
+        async with self._slot():
+            resp = await self._send(model, payload, key, stream=True)
+            try:
+                async for line in resp.aiter_lines():
+                    yield line
+            finally:
+                await resp.aclose()
+
+    # --- public API ---
+    def _key(self, key: Optional[str]) -> str:
+        key = (key if key is not None else os.getenv("GOOGLE_API_KEY", "")).strip()
+        if not key:
+            raise GeminiError("GOOGLE_API_KEY not set on backend", 400)
+        return key
+
+    async def generate(self, model: str, payload: Dict[str, Any], key: Optional[str] = None) -> Dict[str, Any]:
+        """generateContent response JSON; raises GeminiError (GeminiBusy when the queue is full)."""
+        return await asyncio.wrap_future(self._submit(self._generate(model, payload, self._key(key))))
+
+    def generate_sync(self, model: str, payload: Dict[str, Any], key: Optional[str] = None) -> Dict[str, Any]:
+        return self._run_sync(self._generate(model, payload, self._key(key)))
+
+    async def aopen_stream(self, model: str, payload: Dict[str, Any], key: Optional[str] = None) -> AsyncIterator[str]:
+        """Raw SSE lines of streamGenerateContent. Errors before the first line raise here, not mid-stream."""
+        agen = self._stream_lines(model, payload, self._key(key))
+        first = await asyncio.wrap_future(self._submit(_anext(agen)))
+        return self._aiter(agen, first)
+
+    async def _aiter(self, agen: Any, first: Any) -> AsyncIterator[str]:
+        item = first
+        try:
+            while item is not _END:
+                yield item
+                # Pulled one line at a time: upstream is read only as fast as the client takes it
+                item = await asyncio.wrap_future(self._submit(_anext(agen)))
+        finally:
+            self._submit(agen.aclose())
+
+    def open_stream_sync(self, model: str, payload: Dict[str, Any], key: Optional[str] = None) -> Iterator[str]:
+        agen = self._stream_lines(model, payload, self._key(key))
+        first = self._run_sync(_anext(agen))
+        return self._iter(agen, first)
+
+    def _iter(self, agen: Any, first: Any) -> Iterator[str]:
+        item = first
+        try:
+            while item is not _END:
+                yield item
+                item = self._run_sync(_anext(agen))
+        finally:
+            self._submit(agen.aclose())
+
+    def close(self) -> None:
+        """Close the pooled client (the loop thread is a daemon and ends with the process)."""
+        client, self._client = self._client, None
+        if client is not None and self._loop is not None:
+            try:
+                self._submit(client.aclose()).result(5)
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loop_running": self._loop is not None,
+            "rpm": round(self.bucket.rate * 60, 1),
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "waiting": self._waiting,
+            **self._stats,
+        }
+
+
+async def _anext(agen: Any) -> Any:
+    try:
+        return await agen.__anext__()
+    except StopAsyncIteration:
+        return _END
+
+
+_CLIENT: Optional[GeminiClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_gemini_client() -> GeminiClient:
+    """Process-wide client, configured from env (the loop starts on first call)."""
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = GeminiClient(
+                    rpm=float(os.getenv("GEMINI_RPM", "60")),
+                    burst=int(os.getenv("GEMINI_BURST", "5")),
+                    max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "4")),
+                    max_queue=int(os.getenv("GEMINI_MAX_QUEUE", "64")),
+                    queue_timeout_s=float(os.getenv("GEMINI_QUEUE_TIMEOUT_S", "30")),
+                    timeout_s=float(os.getenv("GEMINI_TIMEOUT_S", "40")),
+                    max_retries=int(os.getenv("GEMINI_MAX_RETRIES", "3")),
+                    backoff_s=float(os.getenv("GEMINI_BACKOFF_S", "1.0")),
+                    backoff_max_s=float(os.getenv("GEMINI_BACKOFF_MAX_S", "16")),
+                )
+    return _CLIENT
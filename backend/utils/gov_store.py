@@ -0,0 +1,238 @@
+"""File-backed data for the government feeds routes.
+
+Both files are small but were re-read on every request:
+
+- SeedFeed: data/gov_feeds.json is parsed and normalized once (URL parsing,
+  trust score, score). The result is sorted by score, and the verified subset
+  is precomputed. A state filter's matches are remembered per state. Each read
+  stats the file and rebuilds only when its mtime/size changed.
+- ModerationStore: approve/flag decisions are kept in memory. Writes are
+  batched: a burst of decisions within GOV_MOD_FLUSH_S becomes one file write.
+  The JSON is written to a temp file and os.replace()d outside the decision
+  lock, so readers never see a half-written file and never wait on disk. Edits
+  made to the file by hand (or by a sibling worker) are picked up on the next
+  read, and unflushed local decisions are kept on top of them.
+
+Knobs (env):
+  GOV_MOD_FLUSH_S   seconds to batch moderation writes before flushing (default 1.0; 0 = write immediately)
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+_Stamp = Optional[Tuple[int, int]]
+
+
+def file_stamp(path: str) -> _Stamp:
+    """(mtime_ns, size) of path, or None when it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """Write JSON to a temp file next to path and rename it into place."""
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=folder)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class _FeedSnapshot:
+    __slots__ = ("items", "verified", "by_state")
+
+    def __init__(self, items: List[Dict[str, Any]]) -> None:
+        self.items = sorted(items, key=lambda x: (x.get("score") or 0), reverse=True)
+        self.verified = [it for it in self.items if it.get("verified")]
+        # (state, only_verified) -> matching items, in score order
+        self.by_state: Dict[Tuple[str, bool], List[Dict[str, Any]]] = {}
+
+
+class SeedFeed:
+    """Normalized, score-sorted items of a JSON list file; rebuilt when the file changes."""
+
+    def __init__(self, path: str, normalize: Callable[[Dict[str, Any]], Dict[str, Any]], max_states: int = 256) -> None:
+        self.path = path
+        self.normalize = normalize
+        self.max_states = max_states
+        self._lock = threading.Lock()
+        self._stamp: _Stamp = None
+        self._snap = _FeedSnapshot([])
+        self._loads = 0
+
+    def _snapshot(self) -> _FeedSnapshot:
+        stamp = file_stamp(self.path)
+        if stamp == self._stamp and self._loads:
+            return self._snap
+        with self._lock:
+            if stamp != self._stamp or not self._loads:
+                self._snap = _FeedSnapshot(self._build())
+                self._stamp = stamp
+                self._loads += 1
+            return self._snap
+
+    def _build(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return []
+        out = []
+        for raw in data if isinstance(data, list) else []:
+            if not isinstance(raw, dict):
+                continue
+            try:
+                out.append(self.normalize(raw))
+            except Exception:
+                continue
+        return out
+
+    def items(self, state: Optional[str] = None, only_verified: bool = False) -> List[Dict[str, Any]]:
+        """Items best-first. state matches as a substring of location + description, as before."""
+        snap = self._snapshot()
+        base = snap.verified if only_verified else snap.items
+        key = (state or "").strip().lower()
+        if not key:
+            return list(base)
+        hit = snap.by_state.get((key, only_verified))
+        if hit is None:
+            hit = [it for it in base if key in (it.get("location") or "").lower() + " " + (it.get("description") or "").lower()]
+            if len(snap.by_state) < self.max_states:
+                snap.by_state[(key, only_verified)] = hit
+        return list(hit)
+
+    def stats(self) -> Dict[str, Any]:
+        snap = self._snapshot()
+        return {"items": len(snap.items), "verified": len(snap.verified), "states_indexed": len(snap.by_state), "loads": self._loads}
+
+
+class ModerationStore:
+    """Approved / flagged URL sets persisted to JSON with batched, atomic writes."""
+
+    KINDS = ("approved", "flagged")
+
+    def __init__(self, path: str, flush_delay_s: float = 1.0) -> None:
+        self.path = path
+        self.flush_delay_s = max(0.0, float(flush_delay_s))
+        self._lock = threading.Lock()  # guards the sets; never held during file I/O
+        self._write_lock = threading.Lock()  # one writer at a time
+        self._decisions: Dict[str, Set[str]] = {k: set() for k in self.KINDS}
+        self._pending: List[Tuple[str, str]] = []  # unflushed (kind, url)
+        self._stamp: _Stamp = None
+        self._loaded = False
+        self._timer: Optional[threading.Timer] = None
+        self._writes = 0
+
+    def _read_file(self) -> Dict[str, Set[str]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        return {k: set(data.get(k) or []) for k in self.KINDS}
+
+    def _refresh(self) -> None:
+        stamp = file_stamp(self.path)
+        if self._loaded and stamp == self._stamp:
+            return
+        decisions = self._read_file()
+        with self._lock:
+            for kind, url in self._pending:
+                decisions[kind].add(url)
+            self._decisions = decisions
+            self._stamp = stamp
+            self._loaded = True
+
+    # --- reads ---
+    def decided(self, url: str) -> bool:
+        self._refresh()
+        d = self._decisions
+        return url in d["approved"] or url in d["flagged"]
+
+    def snapshot(self) -> Dict[str, List[str]]:
+        self._refresh()
+        with self._lock:
+            return {k: sorted(v) for k, v in self._decisions.items()}
+
+    # --- writes ---
+    def add(self, kind: str, url: str) -> None:
+        if kind not in self.KINDS:
+            raise ValueError(f"unknown moderation kind: {kind}")
+        self._refresh()
+        with self._lock:
+            self._decisions[kind].add(url)
+            self._pending.append((kind, url))
+            if self.flush_delay_s and self._timer is not None:
+                return  # a flush is already scheduled and will include this decision
+            if self.flush_delay_s:
+                self._timer = threading.Timer(self.flush_delay_s, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self.flush()
+
+    def approve(self, url: str) -> None:
+        self.add("approved", url)
+
+    def flag(self, url: str) -> None:
+        self.add("flagged", url)
+
+    def flush(self) -> bool:
+        """Write pending decisions now; returns False when there was nothing to write."""
+        with self._write_lock:
+            with self._lock:
+                self._timer = None
+                if not self._pending:
+                    return False
+                pending, self._pending = self._pending, []
+            # The file changed since our last read (hand edit, sibling worker): write on top of it
+            merged = self._read_file() if file_stamp(self.path) != self._stamp else None
+            with self._lock:
+                if merged is not None:
+                    for kind, url in pending + self._pending:
+                        merged[kind].add(url)
+                    self._decisions = merged
+                payload = {k: sorted(v) for k, v in self._decisions.items()}
+            try:
+                write_json_atomic(self.path, payload)
+            except Exception:
+                with self._lock:
+                    self._pending[:0] = pending  # retry with the next flush
+                return False
+            self._stamp = file_stamp(self.path)
+            self._writes += 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **{k: len(v) for k, v in self._decisions.items()},
+                "pending": len(self._pending),
+                "writes": self._writes,
+                "flush_delay_s": self.flush_delay_s,
+            }
+
+
+def moderation_store(path: str) -> ModerationStore:
+    """Store configured from env; pending decisions are flushed at interpreter exit."""
+    store = ModerationStore(path, flush_delay_s=float(os.getenv("GOV_MOD_FLUSH_S", "1.0")))
+    atexit.register(store.flush)
+    return store
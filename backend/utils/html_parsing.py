@@ -0,0 +1,68 @@
+"""Pluggable HTML parsing for the scrapers.
+
+All scrapers build their trees through make_soup(), which picks the fastest
+BeautifulSoup tree builder installed (lxml, then the stdlib html.parser) and can
+restrict parsing to the elements a scraper actually reads via a SoupStrainer.
+Partial parsing skips building nodes for navigation, scripts and footers, which
+is most of a listing page.
+
+Knobs (env):
+  HTML_PARSER   force a tree builder ("lxml", "html.parser", "html5lib");
+                unknown or missing builders fall back to the default order
+"""
+from __future__ import annotations
+
+import os
+import re
+from typing import Any, Iterable, Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+# Fastest first; html.parser ships with Python so it always works
+_PREFERRED = ("lxml", "html.parser")
+
+_parser_name: Optional[str] = None
+
+
+def _available(name: str) -> bool:
+    try:
+        BeautifulSoup("<p></p>", name)
+        return True
+    except Exception:
+        return False
+
+
+def parser_name() -> str:
+    """The tree builder make_soup() uses (resolved once per process)."""
+    global _parser_name
+    if _parser_name is None:
+        forced = os.getenv("HTML_PARSER", "").strip().lower()
+        candidates = ((forced,) if forced else ()) + _PREFERRED
+        _parser_name = next((c for c in candidates if _available(c)), "html.parser")
+    return _parser_name
+
+
+def make_soup(
+    markup: Union[str, bytes],
+    only: Optional[SoupStrainer] = None,
+    parser: Optional[str] = None,
+) -> BeautifulSoup:
+    """Parse markup with the preferred builder, optionally keeping only `only` matches."""
+    return BeautifulSoup(markup, parser or parser_name(), parse_only=only)
+
+
+def class_strainer(*class_fragments: str, tag: Optional[str] = "div") -> SoupStrainer:
+    """Keep only `tag` elements whose class contains any fragment (plus their subtrees)."""
+    pattern = re.compile("|".join(re.escape(c) for c in class_fragments))
+    return SoupStrainer(tag, class_=pattern)
+
+
+def tags_strainer(names: Iterable[str], **attrs: Any) -> SoupStrainer:
+    """Keep only the named tags (optionally filtered by attributes)."""
+    return SoupStrainer(list(names), **attrs)
+
+
+def html_to_text(markup: str) -> str:
+    """Visible text of an HTML fragment (ATS APIs return descriptions as HTML)."""
+    return make_soup(markup).get_text(" ", strip=True)
@@ -0,0 +1,315 @@
+"""Central HTTP policy and pooled clients for every outbound scrape.
+
+Each host gets a policy (pool size / concurrency, timeout, retries, backoff),
+looked up by domain suffix so "internshala.com" also covers
+"www.internshala.com". Async traffic goes through the scrape engine
+(scrapers/engine.py), which reads these policies; sync callers use
+get_session(), a requests.Session that keeps one pooled, retrying adapter per
+policy. Both paths report per-host connection-reuse statistics (requests vs.
+newly opened connections).
+
+Knobs (env):
+  SCRAPE_PER_HOST_LIMIT   default pool size / concurrent requests per host (default 4)
+  SCRAPE_HOST_LIMITS      per-host overrides, e.g. "internshala.com=6,www.linkedin.com=2"
+  SCRAPE_KEEPALIVE_S      idle keep-alive expiry in seconds (default 30)
+  SCRAPE_REPLAY_BASE      send every scrape to this base URL instead, as
+                          <base>/<original host><path> (offline benchmarks)
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HostPolicy:
+    """Connection and retry policy for one host (or domain suffix)."""
+
+    __slots__ = ("limit", "timeout", "retries", "backoff")
+
+    def __init__(self, limit: int = 4, timeout: float = 12.0, retries: int = 1, backoff: float = 0.5) -> None:
+        self.limit = max(1, int(limit))
+        self.timeout = float(timeout)
+        self.retries = max(0, int(retries))
+        self.backoff = float(backoff)
+
+    def replace(self, **changes: Any) -> "HostPolicy":
+        vals = {k: getattr(self, k) for k in self.__slots__}
+        vals.update(changes)
+        return HostPolicy(**vals)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+# Tuned per-source defaults. Internshala tolerates a few parallel requests and
+# flakes on datacenter IPs (retries); LinkedIn and Bing throttle aggressively;
+# government portals are slow, so keep them to a couple of sockets each.
+_DEFAULT_POLICIES: Dict[str, HostPolicy] = {
+    "internshala.com": HostPolicy(limit=6, timeout=15.0, retries=3, backoff=0.6),
+    "linkedin.com": HostPolicy(limit=2, timeout=12.0, retries=0),
+    "bing.com": HostPolicy(limit=2, timeout=7.0, retries=1),
+    "api.lever.co": HostPolicy(limit=4, timeout=12.0, retries=2),
+    "boards-api.greenhouse.io": HostPolicy(limit=4, timeout=12.0, retries=2),
+    "api.smartrecruiters.com": HostPolicy(limit=4, timeout=12.0, retries=2),
+    "myworkdayjobs.com": HostPolicy(limit=2, timeout=12.0, retries=1),
+    "gov.in": HostPolicy(limit=2, timeout=10.0, retries=1),
+    "nic.in": HostPolicy(limit=2, timeout=10.0, retries=1),
+}
+
+
+def parse_host_limits(raw: str) -> Dict[str, int]:
+    out: Dict[str, int] = {}
+    for part in (raw or "").split(","):
+        host, _, n = part.partition("=")
+        host = host.strip().lower()
+        if host and n.strip().isdigit():
+            out[host] = max(1, int(n.strip()))
+    return out
+
+
+class HostPolicies:
+    """Suffix-matched policy table with a default for unknown hosts."""
+
+    def __init__(self, default: Optional[HostPolicy] = None, hosts: Optional[Dict[str, HostPolicy]] = None) -> None:
+        self.default = default or HostPolicy()
+        self.hosts: Dict[str, HostPolicy] = {h.lower(): p for h, p in (hosts or {}).items()}
+
+    def resolve(self, host: str) -> Tuple[str, HostPolicy]:
+        """Return (policy key, policy) for host; the key groups hosts sharing a pool."""
+        host = (host or "").lower()
+        labels = host.split(".")
+        for i in range(len(labels)):
+            suffix = ".".join(labels[i:])
+            pol = self.hosts.get(suffix)
+            if pol is not None:
+                return suffix, pol
+        return host, self.default
+
+    def for_url(self, url: str) -> Tuple[str, HostPolicy]:
+        return self.resolve(urlparse(url).hostname or "")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"default": self.default.as_dict(), "hosts": {h: p.as_dict() for h, p in sorted(self.hosts.items())}}
+
+    @classmethod
+    def from_env(cls) -> "HostPolicies":
+        default = HostPolicy(limit=int(os.getenv("SCRAPE_PER_HOST_LIMIT", "4")))
+        hosts = dict(_DEFAULT_POLICIES)
+        for host, limit in parse_host_limits(os.getenv("SCRAPE_HOST_LIMITS", "")).items():
+            base = hosts.get(host) or cls(default, hosts).resolve(host)[1]
+            hosts[host] = base.replace(limit=limit)
+        return cls(default, hosts)
+
+
+class HttpStats:
+    """Thread-safe per-host counters: requests vs. newly opened connections, conditional-GET savings."""
+
+    _FIELDS = (
+        "requests", "new_connections", "tls_handshakes", "retries", "errors",
+        "not_modified", "bytes_downloaded", "bytes_saved", "parse_ms_saved",
+    )
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, host: str, field: str, n: int = 1) -> None:
+        with self._lock:
+            c = self._hosts.setdefault(host, dict.fromkeys(self._FIELDS, 0))
+            c[field] = c.get(field, 0) + n
+
+    def set(self, host: str, field: str, value: int) -> None:
+        with self._lock:
+            c = self._hosts.setdefault(host, dict.fromkeys(self._FIELDS, 0))
+            c[field] = value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            hosts = {h: dict(c) for h, c in self._hosts.items()}
+        totals = dict.fromkeys(self._FIELDS, 0)
+        for c in hosts.values():
+            c["reuse_ratio"] = _reuse_ratio(c)
+            for k in self._FIELDS:
+                totals[k] += c.get(k, 0)
+        totals["reuse_ratio"] = _reuse_ratio(totals)  # type: ignore[assignment]
+        return {"totals": totals, "hosts": hosts}
+
+
+def _reuse_ratio(c: Dict[str, Any]) -> float:
+    """Share of requests served on an already-open connection."""
+    reqs = c.get("requests", 0)
+    if not reqs:
+        return 0.0
+    return round(max(0.0, 1.0 - c.get("new_connections", 0) / reqs), 3)
+
+
+class PooledSession(requests.Session):
+    """requests.Session routing each host to a pooled, retrying adapter for its policy."""
+
+    def __init__(self, policies: HostPolicies, stats: Optional[HttpStats] = None) -> None:
+        super().__init__()
+        self.policies = policies
+        self.stats = stats or HttpStats()
+        self._adapters_by_policy: Dict[str, HTTPAdapter] = {}
+        self._adapter_lock = threading.Lock()
+
+    def _adapter_for(self, key: str, pol: HostPolicy) -> HTTPAdapter:
+        adapter = self._adapters_by_policy.get(key)
+        if adapter is None:
+            with self._adapter_lock:
+                adapter = self._adapters_by_policy.get(key)
+                if adapter is None:
+                    retry = Retry(
+                        total=pol.retries,
+                        backoff_factor=pol.backoff,
+                        status_forcelist=sorted(RETRY_STATUSES),
+                        allowed_methods=["GET", "HEAD"],
+                        raise_on_status=False,
+                    )
+                    # Suffix policies (e.g. gov.in) span many hosts; keep a pool for each
+                    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pol.limit, max_retries=retry)
+                    self._adapters_by_policy[key] = adapter
+        return adapter
+
+    def get_adapter(self, url: str) -> HTTPAdapter:
+        if url.lower().startswith(("http://", "https://")):
+            key, pol = self.policies.for_url(url)
+            return self._adapter_for(key, pol)
+        return super().get_adapter(url)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        host = (urlparse(url).hostname or "").lower()
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.policies.for_url(url)[1].timeout
+        self.stats.record(host, "requests")
+        try:
+            return super().request(method, rewrite_url(url), **kwargs)
+        except requests.RequestException:
+            self.stats.record(host, "errors")
+            raise
+
+    def close(self) -> None:
+        super().close()
+        with self._adapter_lock:
+            for adapter in self._adapters_by_policy.values():
+                adapter.close()
+            self._adapters_by_policy.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-host counters with new connections taken from the live urllib3 pools."""
+        for host, c in self.pool_stats().items():
+            self.stats.set(host, "new_connections", c["connections"])
+        return self.stats.snapshot()
+
+    def pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """Connections opened vs. requests sent, read from the urllib3 pools."""
+        out: Dict[str, Dict[str, int]] = {}
+        with self._adapter_lock:
+            adapters = list(self._adapters_by_policy.values())
+        for adapter in adapters:
+            pools = adapter.poolmanager.pools
+            for pk in list(pools.keys()):
+                pool = pools.get(pk)
+                if pool is None:
+                    continue
+                c = out.setdefault(pool.host, {"connections": 0, "requests": 0})
+                c["connections"] += int(getattr(pool, "num_connections", 0))
+                c["requests"] += int(getattr(pool, "num_requests", 0))
+        return out
+
+
+def replay_rewriter(base: str) -> Callable[[str], str]:
+    """Rewriter mapping https://host/path?q to <base>/host/path?q (see benchmarks/replay_server.py)."""
+    base = base.rstrip("/")
+
+    def rewrite(url: str) -> str:
+        parts = urlparse(url)
+        if not parts.hostname:
+            return url
+        out = f"{base}/{parts.hostname}{parts.path or '/'}"
+        return f"{out}?{parts.query}" if parts.query else out
+
+    return rewrite
+
+
+_REWRITER: Optional[Callable[[str], str]] = None
+_REWRITER_SET = False
+
+
+def set_url_rewriter(fn: Optional[Callable[[str], str]]) -> Optional[Callable[[str], str]]:
+    """Install (or clear, with None) the outbound URL rewriter; returns the previous one.
+
+    Policies, limits and stats still key on the original host, so a replayed
+    run is throttled and reported exactly like a live one.
+    """
+    global _REWRITER, _REWRITER_SET
+    prev = _url_rewriter()
+    _REWRITER, _REWRITER_SET = fn, True
+    return prev
+
+
+def _url_rewriter() -> Optional[Callable[[str], str]]:
+    global _REWRITER, _REWRITER_SET
+    if not _REWRITER_SET:
+        base = os.getenv("SCRAPE_REPLAY_BASE", "").strip()
+        _REWRITER, _REWRITER_SET = (replay_rewriter(base) if base else None), True
+    return _REWRITER
+
+
+def rewrite_url(url: str) -> str:
+    fn = _url_rewriter()
+    return fn(url) if fn is not None else url
+
+
+_POLICIES: Optional[HostPolicies] = None
+_SESSION: Optional[PooledSession] = None
+_ASYNC_STATS = HttpStats()
+_LOCK = threading.Lock()
+
+
+def get_policies() -> HostPolicies:
+    global _POLICIES
+    if _POLICIES is None:
+        with _LOCK:
+            if _POLICIES is None:
+                _POLICIES = HostPolicies.from_env()
+    return _POLICIES
+
+
+def get_async_stats() -> HttpStats:
+    """Counters the scrape engine records into (new connections via httpcore traces)."""
+    return _ASYNC_STATS
+
+
+def keepalive_expiry() -> float:
+    return float(os.getenv("SCRAPE_KEEPALIVE_S", "30"))
+
+
+def get_session() -> PooledSession:
+    """Process-wide pooled session for sync callers outside the scrape engine."""
+    global _SESSION
+    if _SESSION is None:
+        policies = get_policies()
+        with _LOCK:
+            if _SESSION is None:
+                _SESSION = PooledSession(policies)
+    return _SESSION
+
+
+def stats() -> Dict[str, Any]:
+    """Connection-reuse statistics for diagnostics."""
+    return {
+        "async": _ASYNC_STATS.snapshot(),
+        "sync": _SESSION.snapshot() if _SESSION is not None else HttpStats().snapshot(),
+        "keepalive_s": keepalive_expiry(),
+        "policies": get_policies().as_dict(),
+    }
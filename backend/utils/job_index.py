@@ -0,0 +1,298 @@
+"""In-process inverted index over recently scraped internships.
+
+Every scraper result is upserted here (keyed like search dedupe: apply URL
+without query string), so /api/search can answer from listings the server has
+already seen instead of re-scraping the web on every request.
+
+- Fields indexed: title, description, skills_required, tags, company, location.
+  Title, skills and tags count extra (a simple BM25F-style field boost).
+- Queries are ranked with BM25 over the boosted term frequencies.
+- Filters: location (substring either way, as in the recommender) and stipend
+  (minimum monthly amount parsed from the stipend text, or paid only).
+- Postings expire after a TTL. Expired postings are skipped at query time and
+  dropped by prune(). When the index is full, the postings closest to expiry
+  are evicted first.
+
+Knobs (env):
+  JOB_INDEX_TTL_S      seconds a posting stays searchable after it was last scraped (default 21600)
+  JOB_INDEX_MAX_DOCS   cap on indexed postings (default 20000)
+  JOB_INDEX_DISABLE    1 to stop indexing (search then always returns nothing)
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# field -> term frequency multiplier
+FIELD_BOOSTS: Dict[str, int] = {
+    "title": 3,
+    "skills_required": 2,
+    "tags": 2,
+    "company": 1,
+    "location": 1,
+    "description": 1,
+}
+
+_TOKEN_RE = re.compile(r"\w[\w+#]*(?:\.\w+)*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in is of on or our the to we with you your".split()
+)
+_NUM_RE = re.compile(r"\d[\d,]*(?:\.\d+)?")
+_UNPAID_RE = re.compile(r"\bunpaid\b|\bno stipend\b")
+
+
+def tokenize(text: Any) -> List[str]:
+    if isinstance(text, (list, tuple, set)):
+        text = " ".join(str(t) for t in text)
+    return [t for t in _TOKEN_RE.findall(str(text or "").lower()) if t not in _STOPWORDS]
+
+
+def stipend_amount(stipend: Any) -> Optional[float]:
+    """Best monthly amount in a stipend string: 0.0 for unpaid, None when unknown.
+
+    "₹ 5,000-10,000 /month" -> 10000.0, "₹ 2,000 /week" -> 8000.0, "Unpaid" -> 0.0.
+    """
+    text = str(stipend or "").lower()
+    if not text.strip():
+        return None
+    if _UNPAID_RE.search(text):
+        return 0.0
+    amounts = []
+    for m in _NUM_RE.findall(text):
+        try:
+            amounts.append(float(m.replace(",", "")))
+        except ValueError:
+            continue
+    if not amounts:
+        return None
+    best = max(amounts)
+    if "week" in text:
+        best *= 4
+    elif "day" in text:
+        best *= 30
+    return best
+
+
+def index_key(job: Dict[str, Any]) -> str:
+    """Same identity /api/search dedupes on; falls back to title+company for URL-less rows."""
+    url = (job.get("apply_url") or "").split("?")[0].lower()
+    if url:
+        return url
+    return f"{job.get('title', '')}|{job.get('company', '')}".lower()
+
+
+def location_matches(wanted: Optional[str], job_loc: Optional[str]) -> bool:
+    if not wanted:
+        return True
+    w, j = wanted.strip().lower(), (job_loc or "").strip().lower()
+    return bool(j) and (w in j or j in w)
+
+
+class _Doc:
+    __slots__ = ("key", "job", "terms", "length", "expires_at", "stipend")
+
+    def __init__(self, key: str, job: Dict[str, Any], terms: Counter, expires_at: float) -> None:
+        self.key = key
+        self.job = job
+        self.terms = terms
+        self.length = sum(terms.values())
+        self.expires_at = expires_at
+        self.stipend = stipend_amount(job.get("stipend"))
+
+
+class JobIndex:
+    """Thread-safe BM25 index of job dicts with per-posting TTL."""
+
+    def __init__(self, ttl: float = 21600.0, max_docs: int = 20000, k1: float = 1.2, b: float = 0.75,
+                 enabled: bool = True) -> None:
+        self.ttl = float(ttl)
+        self.max_docs = max(1, int(max_docs))
+        self.k1 = k1
+        self.b = b
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._docs: Dict[str, _Doc] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_len = 0
+        # (expires_at, key); entries superseded by a re-add are skipped when popped
+        self._expiry: List[Tuple[float, str]] = []
+        self._stats = {"added": 0, "updated": 0, "expired": 0, "evicted": 0, "queries": 0}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # --- writes ---
+    def add(self, jobs: Iterable[Dict[str, Any]], ttl: Optional[float] = None, now: Optional[float] = None) -> int:
+        """Upsert jobs; a re-scraped posting replaces the old copy and restarts its TTL. Returns new postings."""
+        if not self.enabled:
+            return 0
+        now = time.time() if now is None else now
+        expires_at = now + (self.ttl if ttl is None else float(ttl))
+        # Tokenize outside the lock; only the posting-list updates are serialized
+        prepared = []
+        for job in jobs or []:
+            if not isinstance(job, dict) or not (job.get("title") or job.get("description")):
+                continue
+            terms: Counter = Counter()
+            for field, boost in FIELD_BOOSTS.items():
+                for tok in tokenize(job.get(field)):
+                    terms[tok] += boost
+            if terms:
+                prepared.append(_Doc(index_key(job), dict(job, tags=list(job.get("tags") or [])), terms, expires_at))
+        added = 0
+        with self._lock:
+            for doc in prepared:
+                if doc.key in self._docs:
+                    self._unlink(doc.key)
+                    self._stats["updated"] += 1
+                else:
+                    added += 1
+                    self._stats["added"] += 1
+                self._docs[doc.key] = doc
+                self._total_len += doc.length
+                for tok, tf in doc.terms.items():
+                    self._postings.setdefault(tok, {})[doc.key] = tf
+                heapq.heappush(self._expiry, (expires_at, doc.key))
+            self._prune_locked(now)
+            while len(self._docs) > self.max_docs and self._pop_soonest() is not None:
+                self._stats["evicted"] += 1
+        return added
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop expired postings; returns how many were removed."""
+        with self._lock:
+            return self._prune_locked(time.time() if now is None else now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self._expiry.clear()
+            self._total_len = 0
+
+    # --- reads ---
+    def search(
+        self,
+        query: str,
+        location: Optional[str] = None,
+        min_stipend: Optional[float] = None,
+        paid_only: bool = False,
+        limit: int = 50,
+        now: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """BM25-ranked live postings matching any query term, after filters.
+
+        Returns copies (safe to mutate), best first; ties go to the most
+        recently scraped posting.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.enabled:
+            return []
+        now = time.time() if now is None else now
+        with self._lock:
+            self._stats["queries"] += 1
+            n = len(self._docs)
+            if not n:
+                return []
+            avg_len = self._total_len / n
+            k1, b = self.k1, self.b
+            scores: Dict[str, float] = {}
+            for term in terms:
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                df = len(posting)
+                idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+                for key, tf in posting.items():
+                    doc = self._docs[key]
+                    norm = k1 * (1.0 - b + b * doc.length / avg_len)
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+            hits: List[Tuple[float, float, _Doc]] = []
+            for key, score in scores.items():
+                doc = self._docs[key]
+                if doc.expires_at <= now:
+                    continue
+                if not location_matches(location, doc.job.get("location")):
+                    continue
+                if paid_only and not doc.stipend:
+                    continue
+                if min_stipend is not None and (doc.stipend is None or doc.stipend < min_stipend):
+                    continue
+                hits.append((score, doc.expires_at, doc))
+            hits.sort(key=lambda h: (h[0], h[1]), reverse=True)
+            return [dict(d.job, tags=list(d.job.get("tags") or [])) for _, _, d in hits[: max(1, limit)]]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "docs": len(self._docs),
+                "terms": len(self._postings),
+                "ttl_s": self.ttl,
+                "max_docs": self.max_docs,
+                **self._stats,
+            }
+
+    # --- internals (caller holds self._lock) ---
+    def _unlink(self, key: str) -> None:
+        doc = self._docs.pop(key)
+        self._total_len -= doc.length
+        for tok in doc.terms:
+            posting = self._postings.get(tok)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del self._postings[tok]
+
+    def _pop_soonest(self) -> Optional[str]:
+        while self._expiry:
+            expires_at, key = heapq.heappop(self._expiry)
+            doc = self._docs.get(key)
+            if doc is not None and doc.expires_at == expires_at:
+                self._unlink(key)
+                return key
+        return None
+
+    def _prune_locked(self, now: float) -> int:
+        removed = 0
+        heap = self._expiry
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            doc = self._docs.get(key)
+            if doc is not None and doc.expires_at == expires_at:
+                self._unlink(key)
+                removed += 1
+        # Re-scraped postings leave superseded heap entries behind; compact now and then
+        if len(heap) > 4 * len(self._docs) + 64:
+            self._expiry = [(d.expires_at, k) for k, d in self._docs.items()]
+            heapq.heapify(self._expiry)
+        self._stats["expired"] += removed
+        return removed
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "0").lower() in {"1", "true", "yes", "on"}
+
+
+_INDEX: Optional[JobIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_index() -> JobIndex:
+    """Process-wide index instance, built lazily from env."""
+    global _INDEX
+    if _INDEX is None:
+        with _INDEX_LOCK:
+            if _INDEX is None:
+                _INDEX = JobIndex(
+                    ttl=float(os.getenv("JOB_INDEX_TTL_S", "21600")),
+                    max_docs=int(os.getenv("JOB_INDEX_MAX_DOCS", "20000")),
+                    enabled=not _env_flag("JOB_INDEX_DISABLE"),
+                )
+    return _INDEX
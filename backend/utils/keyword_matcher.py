@@ -0,0 +1,112 @@
+"""Compiled multi-keyword matcher (Aho-Corasick over word tokens).
+
+Skill extraction and auto-tagging used to run one substring scan per
+vocabulary entry, so cost grew with the vocabulary and "ai" matched inside
+"maintain". KeywordMatcher compiles the whole vocabulary into one automaton
+and finds every hit in a single pass over the text's tokens:
+
+- Case-insensitive; terms match whole tokens only. A token is a run of word
+  characters, or one punctuation character, so "c++", "node.js" and "ci/cd"
+  work as terms and "java" does not fire inside "javascript".
+- Labels come back in order of first occurrence. At the same position the
+  longer match wins, so the results are deterministic for a given text.
+
+A vocabulary is either an iterable of terms (each term is its own label) or a
+mapping of label -> surface forms, e.g. {"remote": ["remote", "wfh"]}.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Mapping, Tuple, Union
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+Vocabulary = Union[Iterable[str], Mapping[str, Iterable[str]]]
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over token sequences; build once, match many texts."""
+
+    def __init__(self, vocabulary: Vocabulary) -> None:
+        if isinstance(vocabulary, Mapping):
+            pairs = [(label, form) for label, forms in vocabulary.items() for form in forms]
+        else:
+            pairs = [(term, term) for term in vocabulary]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (label, pattern length in tokens) for every pattern ending here
+        self._out: List[List[Tuple[str, int]]] = [[]]
+        self.labels_in_order: List[str] = []
+        seen_labels = set()
+        for label, form in pairs:
+            toks = tokenize(form)
+            if not toks:
+                continue  # blank CSV cells etc. would otherwise match everything
+            self._add(toks, label)
+            if label not in seen_labels:
+                seen_labels.add(label)
+                self.labels_in_order.append(label)
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.labels_in_order)
+
+    def _add(self, toks: List[str], label: str) -> None:
+        state = 0
+        for tok in toks:
+            nxt = self._goto[state].get(tok)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][tok] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        if (label, len(toks)) not in self._out[state]:
+            self._out[state].append((label, len(toks)))
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        for state in queue:  # BFS; queue grows while iterating
+            for tok, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and tok not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(tok, 0) if state else 0
+                # Inherit shorter patterns that end at the same token
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def matches(self, text: str) -> List[Tuple[int, int, str]]:
+        """All hits as (start token, end token, label), sorted by start then longest first."""
+        goto, fail, out = self._goto, self._fail, self._out
+        hits: List[Tuple[int, int, str]] = []
+        state = 0
+        for i, tok in enumerate(tokenize(text)):
+            while state and tok not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(tok, 0)
+            for label, n in out[state]:
+                hits.append((i + 1 - n, i + 1, label))
+        hits.sort(key=lambda h: (h[0], -h[1]))
+        return hits
+
+    def find(self, text: str, limit: int = 0) -> List[str]:
+        """Distinct labels present in text, in order of first occurrence (at most limit if > 0)."""
+        found: List[str] = []
+        seen = set()
+        for _, _, label in self.matches(text):
+            if label not in seen:
+                seen.add(label)
+                found.append(label)
+                if limit and len(found) >= limit:
+                    break
+        return found
+
+    def present(self, text: str) -> set:
+        """Set of labels present in text."""
+        return {label for _, _, label in self.matches(text)}
@@ -4,8 +4,8 @@ import re
 from typing import List, Optional, Iterable, Dict
 from urllib.parse import quote
 
-import requests
-from bs4 import BeautifulSoup  # type: ignore
+from utils.html_parsing import make_soup, tags_strainer
+from utils.http_client import get_session
 
 
 def _clean(values: Optional[Iterable[str]], max_n: int = 4) -> List[str]:
@@ -29,7 +29,8 @@ def _bing_people_query(q: str) -> str:
 
 
 def _extract_profiles_from_html(html: str) -> List[Dict[str, str]]:
-    soup = BeautifulSoup(html, "html.parser")
+    # Only anchors matter; the selector below matches every anchor in document order
+    soup = make_soup(html, tags_strainer(["a"]))
     out: List[Dict[str, str]] = []
     for a in soup.select("li.b_algo h2 a, h2 a, a"):  # be permissive
         href = a.get("href") or ""
@@ -106,7 +107,8 @@ def search_hr_profiles(
     for q in queries:
         try:
             url = _bing_people_query(q)
-            r = requests.get(url, headers=headers, timeout=7)
+            # Pooled keep-alive session; bing.com policy sets the 7s timeout
+            r = get_session().get(url, headers=headers)
             if r.status_code != 200:
                 continue
             items = _extract_profiles_from_html(r.text)
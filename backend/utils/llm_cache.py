@@ -0,0 +1,129 @@
+"""Content-addressed cache for generated text (cover letters, interview questions, AI analysis).
+
+The Gemini-backed routes were called again on every click, even when the
+resume and job had not changed since the previous click. Each result is now
+stored under a canonical hash of what produced it:
+llm_key(route, model, **inputs). The inputs are JSON with sorted keys, and
+sets become sorted lists, so field order or set iteration order cannot split
+entries.
+
+- get() / put() keep the value as JSON. The byte budget counts real bytes,
+  and every get() returns a fresh copy that callers may mutate.
+- Entries expire after LLM_CACHE_TTL_S and are evicted LRU past
+  LLM_CACHE_MAX entries or LLM_CACHE_MB.
+- Routes take a `regenerate` flag. It skips the lookup and replaces the entry
+  with a fresh generation.
+- Only model output is cached; template fallbacks are not, so the next click
+  tries the model again.
+
+Generated text is personal (it is built from the resume), so like parsed
+resumes it stays in process and is never written to the shared result cache.
+
+Knobs (env):
+  LLM_CACHE_MAX     entries kept (default 512; 0 disables)
+  LLM_CACHE_MB      approximate size budget in MB (default 16)
+  LLM_CACHE_TTL_S   seconds an entry is served (default 21600)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def _canonical(o: Any) -> Any:
+    if isinstance(o, (set, frozenset)):
+        return sorted(o, key=str)
+    return str(o)
+
+
+def llm_key(route: str, model: Optional[str], **inputs: Any) -> str:
+    """Hash of (route, model, inputs) that is stable across dict ordering and processes."""
+    raw = json.dumps(
+        {"route": route, "model": (model or "").strip(), "inputs": inputs},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=_canonical,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """key -> (json, expires_at, size); LRU-bounded by entries and bytes."""
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 16 * 1024 * 1024, ttl_s: float = 21600.0) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_s = float(ttl_s)
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "regenerated": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        """A fresh copy of the cached value, or None."""
+        with self._lock:
+            ent = self._data.get(key)
+            if ent is None or ent[1] <= time.time():
+                if ent is not None:
+                    self._drop(key)
+                self._stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            raw = ent[0]
+        return json.loads(raw)
+
+    def lookup(self, key: str, regenerate: bool = False) -> Optional[Any]:
+        """get(), except that regenerate=True counts the bypass and returns None."""
+        if regenerate:
+            with self._lock:
+                self._stats["regenerated"] += 1
+            return None
+        return self.get(key)
+
+    def put(self, key: str, value: Any) -> None:
+        if not self.max_entries or value is None or self.ttl_s <= 0:
+            return
+        raw = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_canonical)
+        size = len(raw.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._drop(key)
+            self._data[key] = (raw, time.time() + self.ttl_s, size)
+            self._bytes += size
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._data)))
+                self._stats["evictions"] += 1
+
+    def _drop(self, key: str) -> None:
+        ent = self._data.pop(key, None)
+        if ent is not None:
+            self._bytes -= ent[2]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._data), "bytes": self._bytes, "max_entries": self.max_entries, "ttl_s": self.ttl_s, **self._stats}
+
+
+_CACHE: Optional[LLMCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = LLMCache(
+                    max_entries=int(os.getenv("LLM_CACHE_MAX", "512")),
+                    max_bytes=int(float(os.getenv("LLM_CACHE_MB", "16")) * 1024 * 1024),
+                    ttl_s=float(os.getenv("LLM_CACHE_TTL_S", "21600")),
+                )
+    return _CACHE
@@ -0,0 +1,105 @@
+"""Helpers for streaming LLM completions to the browser.
+
+- iter_sse_data(): data payloads of a Server-Sent Events byte/line stream
+  (OpenRouter chat completions with stream=true, Gemini streamGenerateContent?alt=sse).
+- openrouter_deltas() / gemini_deltas(): the text pieces carried by those events.
+- format_ai_text() is the chat Markdown clean-up. AiTextFormatter applies the
+  same clean-up incrementally, so that joining every feed() and the final
+  flush() gives exactly format_ai_text(full text). Whitespace runs are held back
+  until the next visible character shows how they should be rendered.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Iterable, Iterator, Union
+
+# Section emojis that get a blank line before them
+SECTION_MARKS = frozenset("🎯🕳️🔧👍👎⭐💡")
+_NEWLINES_RE = re.compile(r"[\n\r]+")
+_SECTION_RE = re.compile("(\n[" + "".join(sorted(SECTION_MARKS)) + "])")
+
+
+def format_ai_text(text: str) -> str:
+    """Collapse newline runs to one newline, blank line before section emojis, strip."""
+    text = _NEWLINES_RE.sub("\n", text or "")
+    text = _SECTION_RE.sub(r"\n\1", text)
+    return text.strip()
+
+
+class AiTextFormatter:
+    """Streaming equivalent of format_ai_text()."""
+
+    def __init__(self) -> None:
+        self._started = False
+        self._ws = ""  # whitespace seen but not yet emitted
+
+    def feed(self, chunk: str) -> str:
+        out = []
+        for ch in chunk or "":
+            if ch.isspace():
+                if self._started:
+                    self._ws += ch
+                continue
+            if self._ws:
+                ws = _NEWLINES_RE.sub("\n", self._ws)
+                if ws.endswith("\n") and ch in SECTION_MARKS:
+                    ws += "\n"
+                out.append(ws)
+                self._ws = ""
+            self._started = True
+            out.append(ch)
+        return "".join(out)
+
+    def flush(self) -> str:
+        """Trailing whitespace is dropped, as strip() would."""
+        self._ws = ""
+        return ""
+
+
+def iter_sse_data(lines: Iterable[Union[bytes, str]]) -> Iterator[str]:
+    """The data of each SSE event (multi-line data joined); comments skipped, ends at [DONE]."""
+    buf = []
+    for raw in lines:
+        line = (raw.decode("utf-8", "replace") if isinstance(raw, bytes) else raw).rstrip("\r")
+        if not line:
+            if buf:
+                data, buf = "\n".join(buf), []
+                if data == "[DONE]":
+                    return
+                yield data
+            continue
+        if line.startswith(":"):
+            continue  # keep-alive comment (e.g. ": OPENROUTER PROCESSING")
+        field, _, value = line.partition(":")
+        if field == "data":
+            buf.append(value[1:] if value.startswith(" ") else value)
+    if buf and "\n".join(buf) != "[DONE]":
+        yield "\n".join(buf)
+
+
+def openrouter_deltas(events: Iterable[str]) -> Iterator[str]:
+    """choices[0].delta.content of OpenRouter stream chunks; an in-stream error raises."""
+    for data in events:
+        obj = json.loads(data)
+        if obj.get("error"):
+            err = obj["error"]
+            raise RuntimeError(err.get("message") if isinstance(err, dict) else str(err))
+        choices = obj.get("choices") or []
+        text = ((choices[0] or {}).get("delta") or {}).get("content") if choices else None
+        if text:
+            yield text
+
+
+def gemini_deltas(events: Iterable[str]) -> Iterator[str]:
+    """Text parts of Gemini streamGenerateContent chunks; an in-stream error raises."""
+    for data in events:
+        obj = json.loads(data)
+        if obj.get("error"):
+            err = obj["error"]
+            raise RuntimeError(err.get("message") if isinstance(err, dict) else str(err))
+        cands = obj.get("candidates") or []
+        parts = (((cands[0] or {}).get("content") or {}).get("parts") or []) if cands else []
+        text = "".join(p.get("text") or "" for p in parts if isinstance(p, dict))
+        if text:
+            yield text
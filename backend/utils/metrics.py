@@ -0,0 +1,167 @@
+"""Prometheus-style latency histograms for the request pipeline.
+
+Instrumented code declares a histogram once at import and wraps each stage:
+
+    _STAGE = metrics.histogram("search_stage_seconds", "Time per /api/search stage", ("stage",))
+    with _STAGE.time(stage="dedupe"):
+        ...
+
+Everything is rendered in the Prometheus text exposition format by render()
+(served at /metrics). Metrics are off by default. When disabled, time()
+returns a shared no-op context manager and observe() returns at once, so
+the instrumentation costs one flag check.
+
+Knobs (env):
+  METRICS_ENABLED   1 to record histograms and expose /metrics
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds; spans stages from sub-millisecond ranking steps to slow scrapes and LLM calls
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+_ENABLED = os.getenv("METRICS_ENABLED", "0").lower() in {"1", "true", "yes", "on"}
+
+
+def enabled() -> bool:
+    return _ENABLED
+
+
+def set_enabled(flag: bool) -> None:
+    """Toggle recording at runtime (tests, or turning it on from a debugger)."""
+    global _ENABLED
+    _ENABLED = bool(flag)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("_hist", "_key", "_t0")
+
+    def __init__(self, hist: "Histogram", key: Tuple[str, ...]) -> None:
+        self._hist = hist
+        self._key = key
+        self._t0 = 0.0
+
+    def __enter__(self) -> "_Span":
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._hist._observe_key(self._key, time.perf_counter() - self._t0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed label set."""
+
+    def __init__(self, name: str, help: str = "", labelnames: Sequence[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def time(self, **labels: object):
+        """Context manager observing the elapsed seconds of its block."""
+        if not _ENABLED:
+            return _NOOP
+        return _Span(self, self._key(labels))
+
+    def observe(self, seconds: float, **labels: object) -> None:
+        if not _ENABLED:
+            return
+        self._observe_key(self._key(labels), seconds)
+
+    def _observe_key(self, key: Tuple[str, ...], seconds: float) -> None:
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[key] = series
+            counts, total = series
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            total[0] += seconds
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict[str, float]]:
+        """{label values: {"count", "sum"}} for diagnostics and tests."""
+        with self._lock:
+            return {k: {"count": sum(c), "sum": round(s[0], 6)} for k, (c, s) in self._series.items()}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, (list(c), s[0])) for k, (c, s) in self._series.items())
+        for key, (counts, total) in items:
+            base = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, key)]
+            running = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                running += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = ",".join(base + ['le="%s"' % le])
+                lines.append(f"{self.name}_bucket{{{labels}}} {running}")
+            suffix = "{" + ",".join(base) + "}" if base else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {running}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_REGISTRY: Dict[str, Histogram] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def histogram(name: str, help: str = "", labelnames: Sequence[str] = (), buckets: Optional[Iterable[float]] = None) -> Histogram:
+    """Get or create the process-wide histogram called name."""
+    with _REGISTRY_LOCK:
+        hist = _REGISTRY.get(name)
+        if hist is None:
+            hist = Histogram(name, help, labelnames, buckets or DEFAULT_BUCKETS)
+            _REGISTRY[name] = hist
+        return hist
+
+
+def render() -> str:
+    """All registered histograms in the Prometheus text format (version 0.0.4)."""
+    with _REGISTRY_LOCK:
+        hists = sorted(_REGISTRY.values(), key=lambda h: h.name)
+    return "\n".join(line for h in hists for line in h.render()) + "\n"
+
+
+def reset() -> None:
+    with _REGISTRY_LOCK:
+        for hist in _REGISTRY.values():
+            hist.clear()
@@ -0,0 +1,270 @@
+"""Background pre-warming of popular searches.
+
+Scraping is request-driven, so the first student to search "python
+internship" after the cache expired waits for the whole scrape. This module
+keeps the scrapes behind popular searches warm:
+
+- QueryPopularity ranks the (query, location) pairs seen on /api/search by an
+  exponentially decayed hit count. Steady demand outranks an old burst.
+- HostBudget holds one token bucket per host, metered in HTTP requests. A
+  scrape is only dispatched while its host has a token, and every request it
+  then makes (listing, detail pages, fallback URLs) is charged to that same
+  host as it goes out (see scrapers.engine.with_request_hook), so one
+  expensive scrape puts the host in debt and holds back the next. Company
+  scrapes are keyed on the ATS API host they fetch, not the careers page. Interactive searches do not draw
+  from it.
+- Prewarmer wakes up every interval and asks a caller-supplied plan which
+  scrapes the top pairs need. It dispatches the ones whose cached result is
+  missing or close to expiry, as long as the host still has budget.
+
+The scheduler runs as a daemon thread inside each API process (see main.py),
+so each of WEB_CONCURRENCY workers gets an equal share of PREWARM_HOST_RPM.
+The ranking is saved to the result cache, so a restart or a sibling worker
+sharing the SQLite file keeps pre-warming yesterday's popular searches.
+
+Knobs (env):
+  PREWARM_ENABLED          1 to run the scheduler (default 0)
+  PREWARM_INTERVAL_S       seconds between rounds (default 120)
+  PREWARM_TOP_N            popular pairs warmed per round (default 8)
+  PREWARM_HOST_RPM         pre-warm HTTP requests per minute per host, across all workers (default 6)
+  PREWARM_REFRESH_AT       refresh once a cached entry is this fraction of its TTL old (default 0.75)
+  PREWARM_HALF_LIFE_S      popularity half-life in seconds (default 21600)
+  PREWARM_SEED_QUERIES     comma-separated "query@location" pairs warmed even before any traffic
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+def _norm(s: Optional[str]) -> str:
+    return re.sub(r"\s+", " ", (s or "").strip().lower())
+
+
+class QueryPopularity:
+    """Decayed hit counts per (query, location), capped at max_entries."""
+
+    def __init__(self, half_life_s: float = 21600.0, max_entries: int = 500) -> None:
+        self.half_life_s = max(1.0, float(half_life_s))
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        # (query, location) -> (score, updated_at); scores are decayed lazily
+        self._scores: Dict[Tuple[str, str], Tuple[float, float]] = {}
+
+    def _decayed(self, score: float, updated_at: float, now: float) -> float:
+        return score * math.pow(0.5, max(0.0, now - updated_at) / self.half_life_s)
+
+    def record(self, query: str, location: str, weight: float = 1.0, now: Optional[float] = None) -> None:
+        key = (_norm(query), _norm(location))
+        if not key[0]:
+            return
+        now = time.time() if now is None else now
+        with self._lock:
+            score, at = self._scores.get(key, (0.0, now))
+            self._scores[key] = (self._decayed(score, at, now) + weight, now)
+            if len(self._scores) > self.max_entries:
+                # Drop the least popular quarter in one go instead of on every insert
+                ranked = sorted(self._scores.items(), key=lambda kv: self._decayed(kv[1][0], kv[1][1], now))
+                for k, _ in ranked[: max(1, len(ranked) // 4)]:
+                    del self._scores[k]
+
+    def top(self, n: int, now: Optional[float] = None) -> List[Tuple[str, str, float]]:
+        """Most popular (query, location, score) first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            items = [(q, loc, self._decayed(s, at, now)) for (q, loc), (s, at) in self._scores.items()]
+        items.sort(key=lambda x: x[2], reverse=True)
+        return items[: max(0, n)]
+
+    def snapshot(self, now: Optional[float] = None) -> List[List[Any]]:
+        """JSON-friendly [query, location, score] rows (decayed to now)."""
+        return [list(row) for row in self.top(self.max_entries, now)]
+
+    def load(self, rows: Iterable[Iterable[Any]], now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        for row in rows or []:
+            try:
+                q, loc, score = row
+                self.record(str(q), str(loc), weight=float(score), now=now)
+            except (TypeError, ValueError):
+                continue
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+
+class HostBudget:
+    """Token bucket per host: `per_minute` requests per minute, bursting up to `burst`.
+
+    charge() may take a bucket below zero; available() stays False until the
+    debt is paid back, so the long-run rate holds however many requests a
+    scrape turns out to make.
+    """
+
+    def __init__(self, per_minute: float = 6.0, burst: Optional[float] = None) -> None:
+        self.rate = max(0.0, float(per_minute)) / 60.0
+        self.burst = float(burst if burst is not None else max(1.0, per_minute))
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # host -> (tokens, updated_at)
+
+    def _refill(self, host: str, now: float) -> float:
+        tokens, at = self._buckets.get(host, (self.burst, now))
+        return min(self.burst, tokens + max(0.0, now - at) * self.rate)
+
+    def available(self, host: str, now: Optional[float] = None) -> bool:
+        """At least one request's worth of budget left for host."""
+        now = time.time() if now is None else now
+        with self._lock:
+            tokens = self._refill(host, now)
+            self._buckets[host] = (tokens, now)
+            return tokens >= 1.0
+
+    def charge(self, host: str, n: float = 1.0, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._buckets[host] = (self._refill(host, now) - n, now)
+
+
+class PrewarmTask(NamedTuple):
+    """One scrape to keep warm: `run()` starts it; `fresh()` says the cached copy is still good.
+
+    `host` is checked for budget before dispatch; run() is expected to charge
+    the budget for the requests the scrape actually makes.
+    """
+    source: str
+    host: str
+    key: str
+    fresh: Callable[[], bool]
+    run: Callable[[], Any]
+
+
+class Prewarmer:
+    """Periodically keeps the scrapes behind the most popular searches warm."""
+
+    def __init__(
+        self,
+        popularity: QueryPopularity,
+        plan: Callable[[str, str], List[PrewarmTask]],
+        budget: HostBudget,
+        interval_s: float = 120.0,
+        top_n: int = 8,
+        seeds: Iterable[Tuple[str, str]] = (),
+        save: Optional[Callable[[List[List[Any]]], None]] = None,
+    ) -> None:
+        self.popularity = popularity
+        self.plan = plan
+        self.budget = budget
+        self.interval_s = max(1.0, float(interval_s))
+        self.top_n = max(1, int(top_n))
+        self.seeds = [(_norm(q), _norm(loc)) for q, loc in seeds if _norm(q)]
+        self.save = save
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"rounds": 0, "dispatched": 0, "fresh": 0, "over_budget": 0, "errors": 0}
+        self._last_round: Dict[str, Any] = {}
+
+    def targets(self) -> List[Tuple[str, str]]:
+        pairs = [(q, loc) for q, loc, _ in self.popularity.top(self.top_n)]
+        for seed in self.seeds:
+            if len(pairs) >= self.top_n:
+                break
+            if seed not in pairs:
+                pairs.append(seed)
+        return pairs
+
+    def run_once(self) -> Dict[str, Any]:
+        """One pre-warm round; returns what it did (also kept for stats())."""
+        started = time.time()
+        dispatched: List[str] = []
+        fresh = over_budget = errors = 0
+        seen = set()
+        for query, location in self.targets():
+            try:
+                tasks = self.plan(query, location)
+            except Exception:
+                errors += 1
+                continue
+            for task in tasks:
+                if (task.source, task.key) in seen:
+                    continue
+                seen.add((task.source, task.key))
+                try:
+                    if task.fresh():
+                        fresh += 1
+                        continue
+                    if not self.budget.available(task.host):
+                        over_budget += 1
+                        continue
+                    task.run()
+                    dispatched.append(f"{task.source}:{task.key}")
+                except Exception:
+                    errors += 1
+        if self.save is not None:
+            try:
+                self.save(self.popularity.snapshot())
+            except Exception:
+                errors += 1
+        self._stats["rounds"] += 1
+        self._stats["dispatched"] += len(dispatched)
+        self._stats["fresh"] += fresh
+        self._stats["over_budget"] += over_budget
+        self._stats["errors"] += errors
+        self._last_round = {
+            "at": started,
+            "seconds": round(time.time() - started, 4),
+            "dispatched": dispatched,
+            "fresh": fresh,
+            "over_budget": over_budget,
+            "errors": errors,
+        }
+        return self._last_round
+
+    # --- background thread ---
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="prewarm", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                self._stats["errors"] += 1
+            self._stop.wait(self.interval_s)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running(),
+            "interval_s": self.interval_s,
+            "top_n": self.top_n,
+            "tracked": len(self.popularity),
+            "top": [[q, loc, round(s, 3)] for q, loc, s in self.popularity.top(self.top_n)],
+            **self._stats,
+            "last_round": self._last_round,
+        }
+
+
+def parse_seeds(raw: str, default_location: str = "India") -> List[Tuple[str, str]]:
+    """Parse PREWARM_SEED_QUERIES: "python internship@Bangalore, sql internship" -> [(query, location), ...]."""
+    out = []
+    for part in (raw or "").split(","):
+        if not part.strip():
+            continue
+        query, _, location = part.partition("@")
+        out.append((query.strip(), location.strip() or default_location))
+    return out
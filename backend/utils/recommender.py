@@ -3,33 +3,22 @@ from __future__ import annotations
 from typing import Dict, List, Optional, Iterable
 import re
 
-
-def _norm(s: Optional[str]) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+from utils.batch_scorer import TermIndex, numpy_available
 
 
-def _lower_set(xs: Iterable[str] | None) -> set[str]:
-    return {str(x).strip().lower() for x in (xs or []) if str(x).strip()}
+# Below this many jobs the per-job scan is as fast as the TermIndex batch path
+# or faster, and the batch path only pays off with NumPy (benchmarks/bench_scoring.py:
+# x0.9 at 100 jobs, about x1.4 at 1k and 10k).
+_BATCH_MIN_JOBS = 1000
 
 
-def _skills_score(resume_skills: set[str], text: str) -> float:
-    if not resume_skills:
-        return 0.0
-    tl = text.lower()
-    hits = {s for s in resume_skills if s in tl}
-    if not hits:
-        return 0.0
-    coverage = len(hits) / max(1, len(resume_skills))
-    density = len(hits) / max(1, len(set(tl.split())))
-    # emphasize coverage, add small density signal
-    return min(1.0, 0.8 * coverage + 0.2 * min(0.5, density * 10))
+def _norm(s: Optional[str]) -> str:
+    # Same as re.sub(r"\s+", " ", s.strip()): both use str.isspace() whitespace
+    return " ".join((s or "").split())
 
 
-def _role_score(resume_roles: set[str], text: str) -> float:
-    if not resume_roles:
-        return 0.0
-    tl = text.lower()
-    return 1.0 if any(r in tl for r in resume_roles) else 0.0
+def _lower_set(xs: Iterable[str] | None) -> set[str]:
+    return {str(x).strip().lower() for x in (xs or []) if str(x).strip()}
 
 
 def _location_score(resume_loc: Optional[str], job_loc: Optional[str]) -> float:
@@ -62,14 +51,82 @@ def _exp_keywords(experiences: Iterable[Dict] | None) -> set[str]:
     return out
 
 
-def _experience_score(exp_tokens: set[str], text: str) -> float:
-    if not exp_tokens:
-        return 0.0
-    tl = text.lower()
-    hits = {t for t in exp_tokens if t in tl}
-    if not hits:
-        return 0.0
-    return min(1.0, len(hits) / 20.0)  # cap influence
+def _resume_terms(resume: Dict) -> tuple:
+    return (
+        _lower_set(resume.get("skills", [])),
+        _lower_set(resume.get("roles", [])),
+        _norm(resume.get("location")) or None,
+        _exp_keywords(resume.get("experience")),
+        set(resume.get("preferred_tags", []) or []),
+    )
+
+
+def _job_text(job: Dict) -> str:
+    return f"{_norm(job.get('title'))} {_norm(job.get('description'))}".lower()
+
+
+def _top_k(jobs: List[Dict], scores: List[float], k: int) -> List[Dict]:
+    order = sorted(range(len(jobs)), key=scores.__getitem__, reverse=True)
+    out: List[Dict] = []
+    for i in order[: max(1, k)]:
+        enriched = dict(jobs[i])
+        enriched["rec_score"] = round(scores[i] * 100, 2)
+        out.append(enriched)
+    return out
+
+
+def rank_per_job(resume: Dict, internships: List[Dict], k: int = 5) -> List[Dict]:
+    """rank_internships one job at a time (`term in text` per term per job)."""
+    jobs = list(internships or [])
+    skills, roles, loc, exp_tokens, preferred_tags = _resume_terms(resume)
+    scores: List[float] = []
+    for job in jobs:
+        text = _job_text(job)
+        s_skills = 0.0
+        hits = {s for s in skills if s in text}
+        if hits:
+            coverage = len(hits) / max(1, len(skills))
+            density = len(hits) / max(1, len(set(text.split())))
+            s_skills = min(1.0, 0.8 * coverage + 0.2 * min(0.5, density * 10))
+        s_roles = 1.0 if any(r in text for r in roles) else 0.0
+        s_loc = _location_score(loc, _norm(job.get("location")))
+        s_tags = _tag_score(job.get("tags"), preferred_tags)
+        s_exp = min(1.0, len({t for t in exp_tokens if t in text}) / 20.0)
+        scores.append(0.42 * s_skills + 0.22 * s_roles + 0.10 * s_loc + 0.08 * s_tags + 0.18 * s_exp)
+    return _top_k(jobs, scores, k)
+
+
+def _rank_batch(resume: Dict, jobs: List[Dict], k: int = 5) -> List[Dict]:
+    """rank_per_job for all jobs at once over a TermIndex (one substring pass per resume term)."""
+    skills, roles, loc, exp_tokens, preferred_tags = _resume_terms(resume)
+    texts = [_job_text(job) for job in jobs]
+    index = TermIndex(texts)
+    xp = index.ops
+
+    # Skills: coverage plus a small density signal, only where something hit
+    skill_hits = index.count(skills)
+    if skills:
+        words = xp.asarray([max(1, len(set(t.split()))) for t in texts])
+        coverage = skill_hits / max(1, len(skills))
+        density = skill_hits / words
+        blended = xp.minimum(1.0, 0.8 * coverage + 0.2 * xp.minimum(0.5, density * 10))
+        s_skills = xp.where(xp.asarray(skill_hits, dtype=bool), blended, 0.0)
+    else:
+        s_skills = xp.zeros(len(jobs))
+    s_roles = index.any(roles)
+    s_loc = xp.asarray([_location_score(loc, _norm(job.get("location"))) for job in jobs])
+    s_tags = xp.asarray([_tag_score(job.get("tags"), preferred_tags) for job in jobs])
+    s_exp = xp.minimum(1.0, index.count(exp_tokens) / 20.0)
+
+    # Weighted blend (tunable)
+    scores = index.to_list(
+        0.42 * s_skills +
+        0.22 * s_roles +
+        0.10 * s_loc +
+        0.08 * s_tags +
+        0.18 * s_exp
+    )
+    return _top_k(jobs, scores, k)
 
 
 def rank_internships(resume: Dict, internships: List[Dict], k: int = 5) -> List[Dict]:
@@ -86,38 +143,14 @@ def rank_internships(resume: Dict, internships: List[Dict], k: int = 5) -> List[
 
     Internship shape (flexible):
       { title, description, location?, tags?[] }
+
+    Lists of _BATCH_MIN_JOBS or more are scored over a TermIndex when NumPy is
+    installed; smaller ones (the usual case) one job at a time. Both give the
+    same ranking.
     """
-    skills = _lower_set(resume.get("skills", []))
-    roles = _lower_set(resume.get("roles", []))
-    loc = _norm(resume.get("location")) or None
-    exp_tokens = _exp_keywords(resume.get("experience"))
-    preferred_tags = set(resume.get("preferred_tags", []) or [])
-
-    out: List[tuple[float, Dict]] = []
-    for job in internships or []:
-        title = _norm(job.get("title"))
-        desc = _norm(job.get("description"))
-        job_loc = _norm(job.get("location"))
-        text = f"{title} {desc}"
-        # Subscores
-        s_skills = _skills_score(skills, text)
-        s_roles = _role_score(roles, text)
-        s_loc = _location_score(loc, job_loc)
-        s_tags = _tag_score(job.get("tags"), preferred_tags)
-        s_exp = _experience_score(exp_tokens, text)
-
-        # Weighted blend (tunable)
-        score = (
-            0.42 * s_skills +
-            0.22 * s_roles +
-            0.10 * s_loc +
-            0.08 * s_tags +
-            0.18 * s_exp
-        )
-
-        enriched = dict(job)
-        enriched["rec_score"] = round(score * 100, 2)
-        out.append((score, enriched))
-
-    out.sort(key=lambda x: x[0], reverse=True)
-    return [j for _, j in out[: max(1, k)]]
+    jobs = list(internships or [])
+    if not jobs:
+        return []
+    if len(jobs) >= _BATCH_MIN_JOBS and numpy_available():
+        return _rank_batch(resume, jobs, k)
+    return rank_per_job(resume, jobs, k)
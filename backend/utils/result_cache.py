@@ -0,0 +1,336 @@
+"""Shared result cache for scraper output (memory LRU in front of SQLite).
+
+Hits are served from an in-process LRU bounded by an approximate byte budget.
+When RESULT_CACHE_PATH names a SQLite file, misses fall through to it so
+restarts and sibling uvicorn workers on the same host share warm entries;
+without it the cache is memory-only, so processes and test runs never see each
+other's entries. Every entry belongs to a namespace (usually
+the scraper source) and each namespace has its own TTL.
+
+Knobs (env):
+  RESULT_CACHE_PATH       SQLite file shared across workers (default unset: memory-only)
+  RESULT_CACHE_MEM_MB     in-memory budget in MB (default 32)
+  RESULT_CACHE_MAX_ROWS   max rows kept on disk before LRU eviction (default 5000)
+  RESULT_CACHE_TTL        default TTL seconds (default 600)
+  RESULT_CACHE_TTL_<NS>   per-namespace TTL, e.g. RESULT_CACHE_TTL_INTERNSHALA=900
+  RESULT_CACHE_DISABLE    1 to bypass the cache entirely
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+# Per-source defaults; listings churn slowly, company boards even slower.
+_DEFAULT_TTLS: Dict[str, float] = {
+    "internshala": 900.0,
+    "linkedin": 900.0,
+    "company": 3600.0,
+    "internshala_detail": 86400.0,
+}
+
+
+def make_key(*parts: Any) -> str:
+    """Build a normalized cache key: case-folded, whitespace-collapsed, '|' joined."""
+    out = []
+    for p in parts:
+        s = "" if p is None else str(p)
+        out.append(re.sub(r"\s+", " ", s.strip().lower()))
+    return "|".join(out)
+
+
+class ResultCache:
+    """Thread-safe TTL cache with an LRU memory layer and an optional SQLite store."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_mem_bytes: int = 32 * 1024 * 1024,
+        max_disk_rows: int = 5000,
+        default_ttl: float = 600.0,
+        ttls: Optional[Dict[str, float]] = None,
+        enabled: bool = True,
+    ) -> None:
+        self.path = path
+        self.max_mem_bytes = max(0, int(max_mem_bytes))
+        self.max_disk_rows = max(1, int(max_disk_rows))
+        self.default_ttl = float(default_ttl)
+        self.ttls: Dict[str, float] = dict(ttls or {})
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # (ns, key) -> (blob, stored_at, expires_at)
+        self._mem: "OrderedDict[Tuple[str, str], Tuple[str, float, float]]" = OrderedDict()
+        self._mem_bytes = 0
+        self._local = threading.local()
+        self._writes_since_trim = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._disk_errors = 0
+        if self.path:
+            try:
+                self._init_db()
+            except Exception:
+                # Unwritable location: degrade to memory-only rather than break scraping
+                self.path = None
+
+    # --- configuration ---
+    def ttl_for(self, namespace: str) -> float:
+        return float(self.ttls.get(namespace, self.default_ttl))
+
+    # --- public API ---
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return a fresh value (decoded copy) or None on miss/expiry."""
+        entry = self.get_with_age(namespace, key)
+        return entry[0] if entry is not None else None
+
+    def get_with_age(self, namespace: str, key: str) -> Optional[Tuple[Any, float]]:
+        """Like get() but also return how many seconds ago the value was stored."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        mk = (namespace, key)
+        with self._lock:
+            ent = self._mem.get(mk)
+            if ent is not None:
+                if ent[2] > now:
+                    self._mem.move_to_end(mk)
+                    self._bump(namespace, "hits")
+                    return json.loads(ent[0]), max(0.0, now - ent[1])
+                self._drop_mem(mk)
+        row = self._disk_get(namespace, key)
+        if row is not None and row[2] > now:
+            with self._lock:
+                self._mem_put(mk, row)
+                self._bump(namespace, "hits")
+                self._bump(namespace, "disk_hits")
+            return json.loads(row[0]), max(0.0, now - row[1])
+        with self._lock:
+            self._bump(namespace, "misses")
+        return None
+
+    def age(self, namespace: str, key: str) -> Optional[float]:
+        """Seconds since a live entry was stored, None if missing/expired; no decode, no stats."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            ent = self._mem.get((namespace, key))
+        if ent is None or ent[2] <= now:
+            ent = self._disk_get(namespace, key)
+        if ent is None or ent[2] <= now:
+            return None
+        return max(0.0, now - ent[1])
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        ttl_s = self.ttl_for(namespace) if ttl is None else float(ttl)
+        if ttl_s <= 0:
+            return
+        try:
+            blob = json.dumps(value, ensure_ascii=False, default=_json_default)
+        except Exception:
+            return
+        now = time.time()
+        row = (blob, now, now + ttl_s)
+        with self._lock:
+            self._mem_put((namespace, key), row)
+            self._bump(namespace, "sets")
+        self._disk_set(namespace, key, row)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._mem_bytes = 0
+        conn = self._conn()
+        if conn is not None:
+            try:
+                conn.execute("DELETE FROM entries")
+            except Exception:
+                self._disk_error()
+        with self._lock:
+            self._stats.clear()
+            self._disk_errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            per_ns = {ns: dict(c) for ns, c in self._stats.items()}
+            totals: Dict[str, int] = {}
+            for c in per_ns.values():
+                for k, v in c.items():
+                    totals[k] = totals.get(k, 0) + v
+            return {
+                "enabled": self.enabled,
+                "backend": "sqlite" if self.path else "memory",
+                "path": self.path,
+                "mem_entries": len(self._mem),
+                "mem_bytes": self._mem_bytes,
+                "mem_budget_bytes": self.max_mem_bytes,
+                "disk_errors": self._disk_errors,
+                "totals": totals,
+                "namespaces": per_ns,
+            }
+
+    def _disk_error(self) -> None:
+        with self._lock:
+            self._disk_errors += 1
+
+    # --- memory layer (caller holds self._lock) ---
+    def _bump(self, namespace: str, field: str, n: int = 1) -> None:
+        c = self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "sets": 0, "evictions": 0, "disk_hits": 0})
+        c[field] = c.get(field, 0) + n
+
+    def _drop_mem(self, mk: Tuple[str, str]) -> None:
+        ent = self._mem.pop(mk, None)
+        if ent is not None:
+            self._mem_bytes -= len(ent[0])
+
+    def _mem_put(self, mk: Tuple[str, str], row: Tuple[str, float, float]) -> None:
+        size = len(row[0])
+        if size > self.max_mem_bytes:
+            return
+        self._drop_mem(mk)
+        self._mem[mk] = row
+        self._mem_bytes += size
+        while self._mem_bytes > self.max_mem_bytes and self._mem:
+            old_key, old = self._mem.popitem(last=False)
+            self._mem_bytes -= len(old[0])
+            self._bump(old_key[0], "evictions")
+
+    # --- SQLite layer ---
+    def _init_db(self) -> None:
+        d = os.path.dirname(self.path or "")
+        if d:
+            os.makedirs(d, exist_ok=True)
+        conn = self._conn()
+        if conn is None:
+            raise RuntimeError("sqlite unavailable")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " ns TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL,"
+            " PRIMARY KEY (ns, key))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at)")
+
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        if not self.path:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=2.0, isolation_level=None, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            except Exception:
+                pass
+            self._local.conn = conn
+        return conn
+
+    def _disk_get(self, namespace: str, key: str) -> Optional[Tuple[str, float, float]]:
+        conn = self._conn()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT value, stored_at, expires_at FROM entries WHERE ns=? AND key=?",
+                (namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE entries SET accessed_at=? WHERE ns=? AND key=?", (time.time(), namespace, key))
+            return row[0], float(row[1]), float(row[2])
+        except Exception:
+            self._disk_error()
+            return None
+
+    def _disk_set(self, namespace: str, key: str, row: Tuple[str, float, float]) -> None:
+        conn = self._conn()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (ns, key, value, stored_at, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, row[0], row[1], row[2], row[1]),
+            )
+        except Exception:
+            self._disk_error()
+            return
+        self._writes_since_trim += 1
+        if self._writes_since_trim >= 50:
+            self._writes_since_trim = 0
+            self._disk_trim(conn)
+
+    def _disk_trim(self, conn: sqlite3.Connection) -> None:
+        """Purge expired rows, then evict least-recently-used rows above the row cap."""
+        try:
+            now = time.time()
+            cur = conn.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+            expired = max(0, cur.rowcount or 0)
+            (count,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            over = int(count) - self.max_disk_rows
+            evicted = 0
+            if over > 0:
+                cur = conn.execute(
+                    "DELETE FROM entries WHERE rowid IN (SELECT rowid FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                    (over,),
+                )
+                evicted = max(0, cur.rowcount or 0)
+            if expired or evicted:
+                with self._lock:
+                    self._bump("_disk", "evictions", expired + evicted)
+        except Exception:
+            self._disk_error()
+
+
+def _json_default(o: Any) -> Any:
+    # Profiles carry sets; persist them as sorted lists
+    if isinstance(o, (set, frozenset)):
+        return sorted(o)
+    return str(o)
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "0").lower() in {"1", "true", "yes", "on"}
+
+
+def _cache_from_env() -> ResultCache:
+    raw_path = os.getenv("RESULT_CACHE_PATH", "").strip()
+    path: Optional[str] = None
+    if raw_path and raw_path.lower() not in {"off", "none", "memory", ":memory:"}:
+        path = raw_path
+    ttls = dict(_DEFAULT_TTLS)
+    for k, v in os.environ.items():
+        if k.startswith("RESULT_CACHE_TTL_"):
+            try:
+                ttls[k[len("RESULT_CACHE_TTL_"):].lower()] = float(v)
+            except ValueError:
+                continue
+    return ResultCache(
+        path=path,
+        max_mem_bytes=int(float(os.getenv("RESULT_CACHE_MEM_MB", "32")) * 1024 * 1024),
+        max_disk_rows=int(os.getenv("RESULT_CACHE_MAX_ROWS", "5000")),
+        default_ttl=float(os.getenv("RESULT_CACHE_TTL", "600")),
+        ttls=ttls,
+        enabled=not _env_flag("RESULT_CACHE_DISABLE"),
+    )
+
+
+_CACHE: Optional[ResultCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache() -> ResultCache:
+    """Process-wide cache instance, built lazily from env."""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = _cache_from_env()
+    return _CACHE
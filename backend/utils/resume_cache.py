@@ -0,0 +1,93 @@
+"""Content-addressed cache of parsed resumes.
+
+Students re-upload the same file many times. Keying the parse on the SHA-256
+of the uploaded bytes makes a re-upload skip extraction and profiling
+entirely. Generated artefacts (cover letters, questions, analysis) are cached
+by their full inputs in utils/llm_cache.py instead.
+
+The cache is an in-process LRU bounded by entry count and text size. Resumes
+are personal data, so unlike scrape results they are never written to the
+shared SQLite result cache.
+
+Knobs (env):
+  RESUME_CACHE_MAX   parsed resumes kept (default 256; 0 disables)
+  RESUME_CACHE_MB    approximate text budget in MB (default 32)
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def resume_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class ResumeCache:
+    """hash -> {"text", "skills", "roles", "location", "name", "email", "phone", "parsed_at"}."""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def _size(entry: Dict[str, Any]) -> int:
+        return len(entry.get("text") or "") + 512
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """The parsed record (a shallow copy with fresh lists) or None."""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(digest)
+            self._stats["hits"] += 1
+            return {k: (list(v) if isinstance(v, list) else v) for k, v in entry.items()}
+
+    def put(self, digest: str, record: Dict[str, Any]) -> None:
+        if not self.max_entries:
+            return
+        entry = {k: (sorted(v) if isinstance(v, (set, frozenset)) else v) for k, v in record.items()}
+        entry.setdefault("parsed_at", time.time())
+        size = self._size(entry)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(digest, None)
+            if old is not None:
+                self._bytes -= self._size(old)
+            self._entries[digest] = entry
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, ev = self._entries.popitem(last=False)
+                self._bytes -= self._size(ev)
+                self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_entries": self.max_entries, **self._stats}
+
+
+_CACHE: Optional[ResumeCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_resume_cache() -> ResumeCache:
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = ResumeCache(
+                    max_entries=int(os.getenv("RESUME_CACHE_MAX", "256")),
+                    max_bytes=int(float(os.getenv("RESUME_CACHE_MB", "32")) * 1024 * 1024),
+                )
+    return _CACHE
@@ -0,0 +1,263 @@
+"""Resume text extraction off the event loop, in a bounded process pool.
+
+PyMuPDF page.get_text(), python-docx parsing and the full-text token scan
+are CPU-bound and used to run inside the async upload handler. One large PDF
+stalled every other request on that worker. ResumeExtractor runs
+extract_document() in RESUME_WORKERS worker processes, each parsing one
+document at a time, with guards:
+
+- size: uploads over RESUME_MAX_BYTES are rejected before any parsing
+- pages: only the first RESUME_MAX_PAGES PDF pages are read
+- text: extracted text is capped at RESUME_MAX_CHARS before any regex runs
+- time: a document that takes longer than RESUME_TIMEOUT_S is abandoned, and
+  the process parsing it is killed and replaced; documents being parsed in
+  the other processes are not affected
+- queue: at most RESUME_MAX_INFLIGHT documents are parsed or waiting at once;
+  further uploads are told to retry instead of piling up
+
+With RESUME_WORKERS=0 (or where processes cannot be spawned) the same guards
+apply around worker threads instead; a timed-out thread is abandoned, not killed.
+
+Knobs (env):
+  RESUME_WORKERS        extraction processes (default 2; 0 = thread)
+  RESUME_TIMEOUT_S      per-document deadline in seconds (default 20)
+  RESUME_MAX_BYTES      upload size limit (default 10 MB)
+  RESUME_MAX_PAGES      PDF pages read (default 20)
+  RESUME_MAX_CHARS      extracted characters kept (default 200000)
+  RESUME_MAX_INFLIGHT   documents parsed or queued at once (default 2 x workers, min 2)
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import io
+import os
+import queue
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Common tech tokens harvested on top of the buzzword vocabulary
+TECH_WHITELIST = frozenset({
+    "python", "java", "javascript", "typescript", "react", "node", "django", "fastapi", "sql", "mysql", "postgresql",
+    "mongodb", "docker", "kubernetes", "aws", "azure", "gcp", "pandas", "numpy", "scikit-learn", "tensorflow",
+    "pytorch", "html", "css", "tailwind", "git", "linux", "excel", "powerbi", "power", "bi", "mlflow", "keras",
+    "flask", "redis", "next.js", "next", "jira", "c++", "c", "go",
+})
+_TOKEN_RE = re.compile(r"\b([A-Za-z][A-Za-z0-9+#\.]{1,20})\b")
+_WS_RE = re.compile(r"\s+")
+
+
+def document_kind(filename: str) -> str:
+    name = (filename or "").lower()
+    return next((ext for ext in ("pdf", "docx", "txt", "md") if name.endswith("." + ext)), "other")
+
+
+def _pdf_text(content: bytes, max_pages: int) -> str:
+    import fitz  # PyMuPDF; imported in the worker so the API process does not need it loaded
+
+    parts: List[str] = []
+    with fitz.open(stream=content, filetype="pdf") as doc:
+        for i, page in enumerate(doc):
+            if i >= max_pages:
+                break
+            parts.append(page.get_text())
+    return "".join(parts)
+
+
+def _docx_text(content: bytes) -> str:
+    import docx
+
+    document = docx.Document(io.BytesIO(content))
+    return "\n".join(p.text for p in document.paragraphs)
+
+
+def extract_document(content: bytes, filename: str, max_pages: int = 20, max_chars: int = 200_000) -> Dict[str, Any]:
+    """Text plus whitelisted tech tokens of one resume. Runs inside the worker.
+
+    Returns {"text", "tech", "truncated"} or {"error"} with the message the
+    upload endpoint has always shown for that failure.
+    """
+    kind = document_kind(filename)
+    try:
+        if kind == "pdf":
+            text = _pdf_text(content, max_pages)
+        elif kind == "docx":
+            text = _docx_text(content)
+        else:
+            text = content.decode("utf-8", errors="ignore")
+    except Exception as e:
+        label = {"pdf": "Failed to parse PDF", "docx": "Failed to parse DOCX"}.get(kind, "Failed to read text file")
+        return {"error": f"{label}: {e}"}
+    truncated = len(text) > max_chars
+    text = _WS_RE.sub(" ", text[:max_chars]).strip()
+    tech: List[str] = []
+    seen = set()
+    for tok in _TOKEN_RE.findall(text.lower()):
+        if tok in TECH_WHITELIST and tok not in seen:
+            seen.add(tok)
+            tech.append(tok)
+    return {"text": text, "tech": tech, "truncated": truncated}
+
+
+class ResumeExtractor:
+    """Runs extract_document() in single-process slots with size, page and time limits."""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        timeout_s: float = 20.0,
+        max_bytes: int = 10 * 1024 * 1024,
+        max_pages: int = 20,
+        max_chars: int = 200_000,
+        max_inflight: Optional[int] = None,
+        fn: Callable[..., Dict[str, Any]] = extract_document,
+    ) -> None:
+        self.workers = max(0, int(workers))
+        self.timeout_s = float(timeout_s)
+        self.max_bytes = int(max_bytes)
+        self.max_pages = int(max_pages)
+        self.max_chars = int(max_chars)
+        self.max_inflight = max(1, int(max_inflight if max_inflight is not None else max(2, 2 * self.workers)))
+        self.fn = fn
+        self._lock = threading.Lock()
+        # Process mode: idle one-process executors, so a timeout kills exactly one worker.
+        # Waiting for a free slot happens on _dispatch threads, never on the event loop.
+        self._slots: "Optional[queue.Queue[concurrent.futures.ProcessPoolExecutor]]" = None
+        self._dispatch: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._threads: Optional[concurrent.futures.ThreadPoolExecutor] = None  # thread mode
+        self._inflight = 0
+        self._stats = {"documents": 0, "timeouts": 0, "too_large": 0, "rejected_busy": 0, "errors": 0, "worker_restarts": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._slots is not None or self._threads is not None:
+                return
+            if self.workers:
+                try:
+                    slots: "queue.Queue[concurrent.futures.ProcessPoolExecutor]" = queue.Queue()
+                    for _ in range(self.workers):
+                        slots.put(concurrent.futures.ProcessPoolExecutor(max_workers=1))
+                    self._slots = slots
+                    self._dispatch = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_inflight, thread_name_prefix="resume")
+                    return
+                except (OSError, NotImplementedError, ImportError):
+                    self.workers = 0  # no process support here; fall back to threads
+            self._threads = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_inflight, thread_name_prefix="resume")
+
+    @staticmethod
+    def _kill(slot: concurrent.futures.ProcessPoolExecutor) -> None:
+        """Stop a slot's process (a timed-out parse keeps running otherwise)."""
+        # ProcessPoolExecutor has no public kill; its worker process is reachable via _processes
+        for proc in list((getattr(slot, "_processes", None) or {}).values()):
+            try:
+                proc.terminate()
+            except Exception:
+                pass
+        slot.shutdown(wait=False, cancel_futures=True)
+
+    def _run_in_slot(self, deadline: float, content: bytes, filename: str) -> Dict[str, Any]:
+        """Blocking: take a free process, parse, give it back (or a fresh one if it had to be killed)."""
+        slots = self._slots
+        assert slots is not None
+        try:
+            slot = slots.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            raise concurrent.futures.TimeoutError() from None
+        try:
+            fut = slot.submit(self.fn, content, filename, self.max_pages, self.max_chars)
+            return fut.result(timeout=max(0.0, deadline - time.monotonic()))
+        except (concurrent.futures.TimeoutError, concurrent.futures.process.BrokenProcessPool):
+            self._kill(slot)
+            slot = concurrent.futures.ProcessPoolExecutor(max_workers=1)
+            self._count("worker_restarts")
+            raise
+        finally:
+            slots.put(slot)
+
+    async def extract(self, content: bytes, filename: str) -> Dict[str, Any]:
+        """{"text", "tech", "truncated"} or {"error"}; never blocks the event loop."""
+        if len(content) > self.max_bytes:
+            self._count("too_large")
+            return {"error": f"File too large. Please upload a resume under {self.max_bytes // (1024 * 1024) or 1} MB."}
+        with self._lock:
+            if self._inflight >= self.max_inflight:
+                self._stats["rejected_busy"] += 1
+                return {"error": "Resume parser is busy. Please try again in a few seconds."}
+            self._inflight += 1
+            self._stats["documents"] += 1
+        self._start()
+        loop = asyncio.get_running_loop()
+        try:
+            try:
+                if self._slots is not None:
+                    deadline = time.monotonic() + self.timeout_s
+                    out = await loop.run_in_executor(self._dispatch, self._run_in_slot, deadline, content, filename)
+                else:
+                    fut = loop.run_in_executor(self._threads, self.fn, content, filename, self.max_pages, self.max_chars)
+                    out = await asyncio.wait_for(fut, self.timeout_s)
+            except (asyncio.TimeoutError, concurrent.futures.TimeoutError):
+                self._count("timeouts")
+                return {"error": "Resume took too long to parse. Try a shorter PDF or a DOCX/TXT file."}
+            except concurrent.futures.process.BrokenProcessPool:
+                self._count("errors")
+                return {"error": "Failed to parse resume. Please try another file."}
+            if "error" in out:
+                self._count("errors")
+            return out
+        finally:
+            with self._lock:
+                self._inflight -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            slots, self._slots = self._slots, None
+            dispatch, self._dispatch = self._dispatch, None
+            threads, self._threads = self._threads, None
+        while slots is not None and not slots.empty():
+            slots.get_nowait().shutdown(wait=False, cancel_futures=True)
+        for pool in (dispatch, threads):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._stats)
+            inflight = self._inflight
+        return {
+            "workers": self.workers,
+            "mode": "process" if self.workers else "thread",
+            "inflight": inflight,
+            "max_inflight": self.max_inflight,
+            "timeout_s": self.timeout_s,
+            "max_pages": self.max_pages,
+            "max_bytes": self.max_bytes,
+            **counters,
+        }
+
+
+_EXTRACTOR: Optional[ResumeExtractor] = None
+_EXTRACTOR_LOCK = threading.Lock()
+
+
+def get_extractor() -> ResumeExtractor:
+    """Process-wide extractor, configured from env; the pool starts on first upload."""
+    global _EXTRACTOR
+    if _EXTRACTOR is None:
+        with _EXTRACTOR_LOCK:
+            if _EXTRACTOR is None:
+                inflight = os.getenv("RESUME_MAX_INFLIGHT", "").strip()
+                _EXTRACTOR = ResumeExtractor(
+                    workers=int(os.getenv("RESUME_WORKERS", "2")),
+                    timeout_s=float(os.getenv("RESUME_TIMEOUT_S", "20")),
+                    max_bytes=int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024))),
+                    max_pages=int(os.getenv("RESUME_MAX_PAGES", "20")),
+                    max_chars=int(os.getenv("RESUME_MAX_CHARS", "200000")),
+                    max_inflight=int(inflight) if inflight.isdigit() else None,
+                )
+    return _EXTRACTOR
@@ -0,0 +1,337 @@
+"""Session store for per-user resume context.
+
+Sessions used to live in an unbounded dict in main.py. Anyone could grow it
+by sending new X-Session-Id values, and it was invisible to sibling uvicorn
+workers. SessionStore keeps the same get/set contract with these changes:
+
+- Compact entries: profile sets become sorted lists, and the record is JSON
+  that is zlib-compressed once it is over a few hundred bytes. get() returns
+  the profile with skills/roles as sets again.
+- Bounded memory backend: LRU + TTL, capped by entry count and by a byte
+  budget over the compressed blobs. Memory stays flat however many ids are
+  thrown at it.
+- Shared backends: "sqlite" (one file, shared by every worker on the host)
+  or "redis" (needs the optional redis package; any Redis-protocol server,
+  e.g. a local redis-server or a stand-in like KeyDB, will do). Every worker
+  then serves the same session.
+
+Knobs (env):
+  SESSION_BACKEND     memory | sqlite | redis (default memory)
+  SESSION_TTL_S       idle seconds before a session expires (default 259200 = 3 days)
+  SESSION_MAX         sessions kept (default 10000)
+  SESSION_MEM_MB      memory backend budget in MB (default 64)
+  SESSION_DB_PATH     sqlite file (default <tmp>/findmystipend_sessions.sqlite3)
+  SESSION_REDIS_URL   redis URL (default redis://localhost:6379/0)
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+try:  # Optional shared backend
+    import redis  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    redis = None  # type: ignore
+
+_COMPRESS_MIN = 512
+_PROFILE_SETS = ("skills", "roles")
+
+
+def _json_default(o: Any) -> Any:
+    if isinstance(o, (set, frozenset)):
+        return sorted(o)
+    return str(o)
+
+
+def encode(entry: Dict[str, Any]) -> bytes:
+    """Compact blob: JSON (sets as sorted lists), zlib'd when worth it; first byte flags compression."""
+    raw = json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+    if len(raw) >= _COMPRESS_MIN:
+        return b"z" + zlib.compress(raw, 6)
+    return b"j" + raw
+
+
+def decode(blob: bytes) -> Dict[str, Any]:
+    raw = zlib.decompress(blob[1:]) if blob[:1] == b"z" else blob[1:]
+    entry = json.loads(raw.decode("utf-8"))
+    profile = entry.get("resume_profile")
+    if isinstance(profile, dict):
+        for k in _PROFILE_SETS:
+            profile[k] = set(profile.get(k) or [])
+    return entry
+
+
+class MemoryBackend:
+    """sid -> (blob, expires_at), LRU-ordered; bounded by count and bytes."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, sid: str, now: float) -> Optional[bytes]:
+        with self._lock:
+            ent = self._data.get(sid)
+            if ent is None:
+                return None
+            if ent[1] <= now:
+                self._drop(sid)
+                return None
+            self._data.move_to_end(sid)
+            return ent[0]
+
+    def set(self, sid: str, blob: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._drop(sid)
+            self._data[sid] = (blob, expires_at)
+            self._bytes += len(blob)
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                old_sid, _ = next(iter(self._data.items()))
+                self._drop(old_sid)
+                self.evictions += 1
+
+    def touch(self, sid: str, expires_at: float) -> None:
+        with self._lock:
+            ent = self._data.get(sid)
+            if ent is not None:
+                self._data[sid] = (ent[0], expires_at)
+
+    def delete(self, sid: str) -> None:
+        with self._lock:
+            self._drop(sid)
+
+    def _drop(self, sid: str) -> None:
+        ent = self._data.pop(sid, None)
+        if ent is not None:
+            self._bytes -= len(ent[0])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"sessions": len(self._data), "bytes": self._bytes, "max_bytes": self.max_bytes, "evictions": self.evictions}
+
+
+class SqliteBackend:
+    """One row per session in a SQLite file shared by all workers on the host."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, max_entries: int) -> None:
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self._local = threading.local()
+        self._writes = 0
+        self.evictions = 0
+        self.errors = 0
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " sid TEXT PRIMARY KEY, blob BLOB NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn().execute("CREATE INDEX IF NOT EXISTS sessions_accessed ON sessions(accessed_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=2.0, isolation_level=None, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            except Exception:
+                pass
+            self._local.conn = conn
+        return conn
+
+    def get(self, sid: str, now: float) -> Optional[bytes]:
+        try:
+            row = self._conn().execute("SELECT blob, expires_at FROM sessions WHERE sid=?", (sid,)).fetchone()
+        except Exception:
+            self.errors += 1
+            return None
+        if row is None or float(row[1]) <= now:
+            return None
+        return bytes(row[0])
+
+    def set(self, sid: str, blob: bytes, expires_at: float) -> None:
+        now = time.time()
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (sid, blob, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (sid, sqlite3.Binary(blob), expires_at, now),
+            )
+        except Exception:
+            self.errors += 1
+            return
+        self._writes += 1
+        if self._writes % 50 == 0:
+            self._trim(conn, now)
+
+    def touch(self, sid: str, expires_at: float) -> None:
+        try:
+            self._conn().execute("UPDATE sessions SET expires_at=?, accessed_at=? WHERE sid=?", (expires_at, time.time(), sid))
+        except Exception:
+            self.errors += 1
+
+    def delete(self, sid: str) -> None:
+        try:
+            self._conn().execute("DELETE FROM sessions WHERE sid=?", (sid,))
+        except Exception:
+            self.errors += 1
+
+    def _trim(self, conn: sqlite3.Connection, now: float) -> None:
+        try:
+            cur = conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+            removed = max(0, cur.rowcount or 0)
+            (count,) = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()
+            over = int(count) - self.max_entries
+            if over > 0:
+                cur = conn.execute(
+                    "DELETE FROM sessions WHERE rowid IN (SELECT rowid FROM sessions ORDER BY accessed_at ASC LIMIT ?)",
+                    (over,),
+                )
+                removed += max(0, cur.rowcount or 0)
+            self.evictions += removed
+        except Exception:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            (count,) = self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()
+        except Exception:
+            count = None
+        return {"sessions": count, "path": self.path, "evictions": self.evictions, "errors": self.errors}
+
+
+class RedisBackend:
+    """Sessions as Redis strings with per-key expiry (Redis itself does the LRU under maxmemory)."""
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "fms:session:") -> None:
+        if redis is None:
+            raise RuntimeError("SESSION_BACKEND=redis needs the redis package (pip install redis)")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.errors = 0
+
+    def get(self, sid: str, now: float) -> Optional[bytes]:
+        try:
+            return self.client.get(self.prefix + sid)
+        except Exception:
+            self.errors += 1
+            return None
+
+    def set(self, sid: str, blob: bytes, expires_at: float) -> None:
+        try:
+            self.client.set(self.prefix + sid, blob, px=max(1, int((expires_at - time.time()) * 1000)))
+        except Exception:
+            self.errors += 1
+
+    def touch(self, sid: str, expires_at: float) -> None:
+        try:
+            self.client.pexpire(self.prefix + sid, max(1, int((expires_at - time.time()) * 1000)))
+        except Exception:
+            self.errors += 1
+
+    def delete(self, sid: str) -> None:
+        try:
+            self.client.delete(self.prefix + sid)
+        except Exception:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {"errors": self.errors}
+
+
+class SessionStore:
+    """get/set of session dicts over a pluggable backend with sliding TTL."""
+
+    def __init__(self, backend: Any, ttl_s: float = 259200.0, max_id_len: int = 128) -> None:
+        self.backend = backend
+        self.ttl_s = float(ttl_s)
+        self.max_id_len = max_id_len
+        self._stats = {"gets": 0, "hits": 0, "sets": 0, "rejected_ids": 0}
+
+    def _valid(self, sid: Optional[str]) -> bool:
+        if not sid or len(sid) > self.max_id_len:
+            if sid:
+                self._stats["rejected_ids"] += 1
+            return False
+        return True
+
+    def get(self, sid: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The session dict (profile skills/roles as sets), or None when missing/expired."""
+        if not self._valid(sid):
+            return None
+        self._stats["gets"] += 1
+        now = time.time()
+        blob = self.backend.get(sid, now)
+        if blob is None:
+            return None
+        try:
+            entry = decode(blob)
+        except Exception:
+            self.backend.delete(sid)
+            return None
+        self._stats["hits"] += 1
+        self.backend.touch(sid, now + self.ttl_s)
+        return entry
+
+    def set(self, sid: Optional[str], entry: Dict[str, Any]) -> None:
+        if not self._valid(sid):
+            return
+        self._stats["sets"] += 1
+        self.backend.set(sid, encode(entry), time.time() + self.ttl_s)
+
+    def delete(self, sid: Optional[str]) -> None:
+        if self._valid(sid):
+            self.backend.delete(sid)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend.name, "ttl_s": self.ttl_s, **self._stats, **self.backend.stats()}
+
+
+def _store_from_env() -> SessionStore:
+    kind = os.getenv("SESSION_BACKEND", "memory").strip().lower()
+    max_entries = int(os.getenv("SESSION_MAX", "10000"))
+    backend: Any = None
+    try:
+        if kind == "sqlite":
+            path = os.getenv("SESSION_DB_PATH", "").strip() or os.path.join(tempfile.gettempdir(), "findmystipend_sessions.sqlite3")
+            backend = SqliteBackend(path, max_entries)
+        elif kind == "redis":
+            backend = RedisBackend(os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0"))
+    except Exception:
+        # Shared backend unavailable: keep serving from memory rather than failing uploads
+        backend = None
+    if backend is None:
+        backend = MemoryBackend(max_entries, int(float(os.getenv("SESSION_MEM_MB", "64")) * 1024 * 1024))
+    return SessionStore(backend, ttl_s=float(os.getenv("SESSION_TTL_S", "259200")))
+
+
+_STORE: Optional[SessionStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Process-wide store, built lazily from env."""
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = _store_from_env()
+    return _STORE
@@ -0,0 +1,113 @@
+"""Single-flight call coalescing.
+
+Concurrent submits with the same key share one in-flight Future instead of
+running the same work N times (e.g. many students searching "internship" in
+"India" at once). Once the flight finishes the key is released, so the next
+submit starts fresh; result caching is the caller's job.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, Hashable
+
+
+class _Flight:
+    __slots__ = ("key", "future", "waiters", "active", "started")
+
+    def __init__(self, key: Hashable, future: Future) -> None:
+        self.key = key
+        self.future = future
+        self.waiters = 1  # total callers served, including the one that started it
+        self.active = 1  # callers still interested (see release())
+        self.started = time.time()
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls onto one Future.
+
+    `executor` is anything with submit(fn, *args) -> concurrent.futures.Future.
+    """
+
+    def __init__(self, executor: Any, name: str = "flights", history: int = 50) -> None:
+        self._executor = executor
+        self.name = name
+        # Re-entrant: cancelling under the lock runs _finish() synchronously
+        self._lock = threading.RLock()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._by_future: Dict[int, _Flight] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self._flights = 0
+        self._joined = 0
+        self._cancelled = 0
+        self._max_waiters = 0
+
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Return the in-flight Future for key, starting fn(*args) if none is running."""
+        with self._lock:
+            flight = self._inflight.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                flight.active += 1
+                self._joined += 1
+                return flight.future
+            fut = self._executor.submit(fn, *args, **kwargs)
+            flight = _Flight(key, fut)
+            self._inflight[key] = flight
+            self._by_future[id(fut)] = flight
+            self._flights += 1
+        fut.add_done_callback(lambda f, fl=flight: self._finish(fl))
+        return fut
+
+    def release(self, future: Future) -> None:
+        """Signal that one caller stopped waiting (e.g. its time budget expired).
+
+        When nobody is left waiting on a flight it is cancelled so abandoned work
+        does not occupy the executor. Thread pools only cancel flights that have
+        not started; coroutine executors (the scrape engine) cancel running work.
+        """
+        with self._lock:
+            flight = self._by_future.get(id(future))
+            if flight is None:
+                return
+            flight.active = max(0, flight.active - 1)
+            if flight.active == 0 and future.cancel():
+                self._cancelled += 1
+
+    def _finish(self, flight: _Flight) -> None:
+        with self._lock:
+            if self._inflight.get(flight.key) is flight:
+                del self._inflight[flight.key]
+            self._by_future.pop(id(flight.future), None)
+            self._max_waiters = max(self._max_waiters, flight.waiters)
+            self._recent.append({
+                "key": str(flight.key)[:120],
+                "waiters": flight.waiters,
+                "ms": round((time.time() - flight.started) * 1000, 1),
+                "ok": not flight.future.cancelled() and flight.future.exception() is None,
+            })
+
+    def inflight(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "flights": self._flights,
+                "joined": self._joined,
+                "cancelled": self._cancelled,
+                "inflight": len(self._inflight),
+                "max_waiters": self._max_waiters,
+                "recent": list(self._recent),
+            }
+
+
+def completed(value: Any) -> Future:
+    """A Future already resolved to value (lets cache hits mix with flights)."""
+    fut: Future = Future()
+    fut.set_result(value)
+    return fut
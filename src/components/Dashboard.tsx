@@ -3,7 +3,7 @@ import { API_BASE } from "@/lib/apiBase";
 import { motion, AnimatePresence } from "framer-motion";
 import ChatWidget from "./ChatWidget";
 import { auth } from "@/lib/firebase";
-import { searchInternships, JobResult } from "@/services/jobApi";
+import { searchInternships, searchInternshipsStream, JobResult } from "@/services/jobApi";
 import { fetchGovFeeds } from "@/services/govApi";
 import { analyzeResumeAgainstJobs, toAnalyzeJobInputs, AnalyzerResponse } from "@/services/analyzer";
 import { fetchHRLinks } from "@/services/hrLinks";
@@ -185,27 +185,48 @@ export default function Dashboard({ profile }: DashboardProps) {
     exit: { opacity: 0, y: -8, transition: { duration: 0.15 } },
   } as const;
 
+  // Client-side de-duplication by cleaned URL and (title, company)
+  function dedupeJobs(list: JobResult[]): JobResult[] {
+    const seen = new Set<string>();
+    const norm = (s: string) => s.toLowerCase().trim().replace(/\s+/g, " ");
+    const cleanUrl = (u?: string) => (u || "").toLowerCase().split("?")[0];
+    const deduped: JobResult[] = [];
+    for (const j of list) {
+      const keyUrl = cleanUrl(j.url);
+      const keyTitle = norm(j.title || "");
+      const keyCompany = norm(j.company || "");
+      const k = keyUrl ? `u:${keyUrl}` : `tc:${keyTitle}|${keyCompany}`;
+      if (seen.has(k)) continue;
+      seen.add(k);
+      deduped.push(j);
+    }
+    return deduped;
+  }
+
+  // Incremented per search so a slower, superseded stream cannot overwrite newer results
+  const searchSeqRef = useRef(0);
+
   async function handleSearch() {
+    const seq = ++searchSeqRef.current;
     setLoading(true);
     try {
-      let jobs = govOnly
-        ? await fetchGovFeeds({ state: stateFilter || undefined, only_verified: true, limit: 80 })
-        : await searchInternships({ skills, interests, location });
-      // Client-side de-duplication by cleaned URL and (title, company)
-      const seen = new Set<string>();
-      const norm = (s: string) => s.toLowerCase().trim().replace(/\s+/g, " ");
-      const cleanUrl = (u?: string) => (u || "").toLowerCase().split("?")[0];
-      const deduped: JobResult[] = [];
-      for (const j of jobs) {
-        const keyUrl = cleanUrl(j.url);
-        const keyTitle = norm(j.title || "");
-        const keyCompany = norm(j.company || "");
-        const k = keyUrl ? `u:${keyUrl}` : `tc:${keyTitle}|${keyCompany}`;
-        if (seen.has(k)) continue;
-        seen.add(k);
-        deduped.push(j);
+      let jobs: JobResult[];
+      if (govOnly) {
+        jobs = await fetchGovFeeds({ state: stateFilter || undefined, only_verified: true, limit: 80 });
+      } else {
+        // Stream results in as each source answers; the skeleton gives way to the first frame
+        setResults([]);
+        try {
+          jobs = await searchInternshipsStream({ skills, interests, location }, (partial) => {
+            if (seq === searchSeqRef.current) setResults(dedupeJobs(partial));
+          });
+        } catch (e) {
+          console.warn("Streaming search failed, falling back", e);
+          jobs = await searchInternships({ skills, interests, location });
+        }
       }
-      jobs = deduped;
+      if (seq !== searchSeqRef.current) return;
+      jobs = dedupeJobs(jobs);
       setResults(jobs);
       // Kick off analyzer in background if we have a resume in session
       setAnalyzing(true);
@@ -267,7 +288,7 @@ export default function Dashboard({ profile }: DashboardProps) {
     } catch (err) {
       console.error("Search failed", err);
     } finally {
-      setLoading(false);
+      if (seq === searchSeqRef.current) setLoading(false);
     }
   }
 
@@ -598,7 +619,7 @@ export default function Dashboard({ profile }: DashboardProps) {
               </div>
             )}
 
-            {loading && (
+            {loading && results.length === 0 && (
               <div className="grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-4">
                 {Array.from({ length: 6 }).map((_, i) => (
                   <div key={i} className="rounded-2xl border border-card-border bg-white/5 p-5">
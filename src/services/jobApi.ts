@@ -37,20 +37,16 @@ function getClientSessionId(): string | null {
   }
 }
 
-export async function searchInternships(params: JobSearchParams): Promise<JobResult[]> {
-  const sid = getClientSessionId();
-  const res = await fetch(`${API_BASE}/api/search`, {
-    method: "POST",
-    headers: { "Content-Type": "application/json", ...(sid ? { "X-Session-Id": sid } : {}) },
-    body: JSON.stringify({
+function searchBody(params: JobSearchParams): string {
+  return JSON.stringify({
   // Use a soft query; backend will fallback to resume keywords if needed
   query: [...params.skills, ...params.interests].filter(Boolean).slice(0, 6).join(" ") || "",
       filters: { location: params.location || "India", experience_level: "internship" },
-    }),
-  });
-  if (!res.ok) throw new Error(await res.text());
-  const data = await res.json();
-  return (data || []).map((x: any, idx: number) => ({
+    });
+}
+
+function toJobResult(x: any, idx: number): JobResult {
+  return {
     id: x.apply_url || String(idx),
     title: x.title,
     company: x.company,
@@ -64,5 +60,70 @@ export async function searchInternships(params: JobSearchParams): Promise<JobRes
     required_skills: x.tags || [],
   is_new: x.is_new,
   score: typeof x.score === 'number' ? x.score : undefined,
-  }));
+  };
+}
+
+export async function searchInternships(params: JobSearchParams): Promise<JobResult[]> {
+  const sid = getClientSessionId();
+  const res = await fetch(`${API_BASE}/api/search`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", ...(sid ? { "X-Session-Id": sid } : {}) },
+    body: searchBody(params),
+  });
+  if (!res.ok) throw new Error(await res.text());
+  const data = await res.json();
+  return (data || []).map(toJobResult);
+}
+
+/**
+ * Streaming variant of searchInternships (NDJSON from /api/search/stream).
+ * onUpdate receives the accumulated results as each source answers; the
+ * promise resolves with the final re-ranked list.
+ */
+export async function searchInternshipsStream(
+  params: JobSearchParams,
+  onUpdate: (jobs: JobResult[], final: boolean) => void,
+): Promise<JobResult[]> {
+  const sid = getClientSessionId();
+  const res = await fetch(`${API_BASE}/api/search/stream`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", Accept: "application/x-ndjson", ...(sid ? { "X-Session-Id": sid } : {}) },
+    body: searchBody(params),
+  });
+  if (!res.ok || !res.body) throw new Error(await res.text());
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buf = "";
+  let partial: JobResult[] = [];
+  let final: JobResult[] | null = null;
+  const handle = (line: string) => {
+    if (!line.trim()) return;
+    let frame: any;
+    try {
+      frame = JSON.parse(line);
+    } catch {
+      // Malformed or truncated frame: skip it, keep reading the stream
+      return;
+    }
+    if (frame.event === "results") {
+      partial = partial.concat((frame.jobs || []).map((x: any, i: number) => toJobResult(x, partial.length + i)));
+      partial.sort((a, b) => (b.score ?? 0) - (a.score ?? 0));
+      onUpdate(partial, false);
+    } else if (frame.event === "final") {
+      final = (frame.jobs || []).map(toJobResult);
+      onUpdate(final, true);
+    }
+  };
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buf += decoder.decode(value, { stream: true });
+    let nl: number;
+    while ((nl = buf.indexOf("\n")) >= 0) {
+      handle(buf.slice(0, nl));
+      buf = buf.slice(nl + 1);
+    }
+  }
+  handle(buf);
+  return final ?? partial;
 }